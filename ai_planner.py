@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+import threading
+import time
+
+import ghost_ai
+import pathfinding
+from maze import Maze
+
+class GhostSnapshot:
+    """Read-only copy of the ghost state the planner needs, in tile units. key is the game's
+       ghost object; the worker only uses it as a dictionary key and never touches it."""
+    __slots__ = ("key", "KIND", "position", "direction", "speed", "state")
+
+    def __init__(self, key, kind, position, direction, speed, state):
+        self.key = key
+        self.KIND = kind
+        self.position = position
+        self.direction = direction
+        self.speed = speed
+        self.state = state
+
+class PacManSnapshot:
+    __slots__ = ("position", "direction")
+
+    def __init__(self, position, direction):
+        self.position = position
+        self.direction = direction
+
+class WorldSnapshot:
+    """Everything one planning pass reads: a tick number, PacMan and the ghosts.
+       Built on the main thread and never modified afterwards."""
+    __slots__ = ("tick", "pacman", "ghosts", "power_pellet_active")
+
+    def __init__(self, tick, pacman, ghosts, power_pellet_active):
+        self.tick = tick
+        self.pacman = pacman
+        self.ghosts = ghosts
+        self.power_pellet_active = power_pellet_active
+
+class GhostProxy:
+    """The worker's stand-in for one ghost. It is refreshed from each snapshot and keeps the
+       attributes ghost_ai stores on a ghost between calls (target, current_tile, ai_mode)."""
+    def __init__(self, kind):
+        self.KIND = kind
+
+class Decision:
+    """
+    A new target, speed and direction for one ghost, valid while the ghost is still on the
+    tile it was decided on. position is where the ghost must be placed to take the new
+    direction (its tile center, or the far side of a tunnel), or None to leave it in place.
+    target is None until the ghost has been planned once. The main loop applies each
+    decision at most once and sets applied.
+    """
+    __slots__ = ("tick", "tile", "target", "speed", "direction", "position", "applied")
+
+    def __init__(self, tick, tile, target, speed, direction, position):
+        self.tick = tick
+        self.tile = tile
+        self.target = target
+        self.speed = speed
+        self.direction = direction
+        self.position = position
+        self.applied = False
+
+class AIPlanner:
+    """
+    Runs ghost decisions (strategies and pathfinding) on a background thread.
+
+    Each tick the main loop calls apply() to give the ghosts the newest finished
+    decisions (taken with swap()), then submit() to hand the planner a snapshot
+    of the current positions. None of these calls wait for the planner: submit() only
+    replaces the pending snapshot, and swap() keeps the current decisions if new ones
+    are not ready or are being published at that moment.
+
+    The worker runs ghost_ai.update_ghosts_on_tile_entry() on each snapshot, so ghosts
+    are only re-planned on junction and tunnel tiles or on a mode flip, and follow their
+    corridor otherwise; a decision is produced only for ghosts whose target, speed,
+    direction or position changed. A failed planning pass is reported and skipped; the
+    worker carries on with the next snapshot. Decisions are double buffered: the worker copies the
+    front buffer's unapplied decisions into the back buffer, adds the new ones and
+    publishes it by swapping the two under a short lock, so a decision is not lost when
+    the main loop skips a publication. The worker owns its copy of the maze walls, its
+    path cache and its flow field, so it shares no mutable state with the game.
+
+    Between decisions apply() keeps ghosts on the maze itself, so a slow planner can
+    delay a turn but never lets a ghost walk through a wall: a ghost heading into a
+    wall follows its corridor (ghost_ai.follow_corridor) and a ghost stepping off a
+    tunnel edge wraps to the partner tile.
+
+    Positions are in tile units when tile_size is None. Otherwise they are pixel
+    positions of sprite centers on a maze drawn at the origin with tiles of tile_size.
+    """
+    def __init__(self, maze, tile_size=None):
+        self.maze = Maze.from_tiles(maze.rows, maze.cols, bytes(maze.tiles))
+        self.tile_size = tile_size
+        self.path_cache = pathfinding.PathCache(self.maze)
+        self.flow_field = pathfinding.FlowField(self.maze)
+        self.proxies = {}  # ghost -> GhostProxy, used by the worker only
+        self.front = {}  # ghost -> Decision, read by the main loop
+        self.front_tick = -1
+        self._current = {}  # the front buffer as of the last swap()
+        self._back = {}
+        self._back_tick = -1
+        self._publish_lock = threading.Lock()
+        self._pending = None
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+        self._tick = 0
+        self.plans_completed = 0
+        self.plans_failed = 0
+
+    def to_tiles(self, position):
+        if self.tile_size is None:
+            return (position[0], position[1])
+        half = self.tile_size / 2
+        return ((position[0] - half) / self.tile_size, (position[1] - half) / self.tile_size)
+
+    def from_tiles(self, position):
+        if self.tile_size is None:
+            return position
+        half = self.tile_size / 2
+        return (position[0] * self.tile_size + half, position[1] * self.tile_size + half)
+
+    def start(self):
+        """Start the worker thread."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._work, name="ai-planner", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop the worker thread and wait up to timeout seconds for it to finish."""
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, ghosts, pacman, power_pellet_active=False):
+        """Hand the planner a snapshot of the current game state. Does not wait for the
+           planner; a snapshot the worker has not started on yet is replaced by the newer one."""
+        self._tick += 1
+        snapshot = WorldSnapshot(
+            self._tick,
+            PacManSnapshot(self.to_tiles(pacman.position), tuple(pacman.direction)),
+            tuple(GhostSnapshot(ghost, ghost.KIND, self.to_tiles(ghost.position), tuple(ghost.direction),
+                                ghost.speed, getattr(ghost, "state", None))
+                  for ghost in ghosts),
+            power_pellet_active)
+        with self._pending_lock:
+            self._pending = snapshot
+        self._wake.set()
+        return snapshot.tick
+
+    def take_pending(self):
+        """Return the pending snapshot, or None, and clear it in one step."""
+        with self._pending_lock:
+            snapshot, self._pending = self._pending, None
+        return snapshot
+
+    def plan(self, snapshot):
+        """Run tile-entry decisions for a snapshot into the back buffer and publish it."""
+        proxies = {}
+        before = []
+        for ghost in snapshot.ghosts:
+            proxy = self.proxies.get(ghost.key)
+            if proxy is None:
+                proxy = GhostProxy(ghost.KIND)
+            proxy.position = ghost.position
+            proxy.direction = ghost.direction
+            proxy.speed = ghost.speed
+            proxy.state = ghost.state
+            proxies[ghost.key] = proxy
+            before.append((ghost.position, ghost.direction, getattr(proxy, "target", None), ghost.speed))
+        # Ghosts missing from the snapshot were removed from the game.
+        self.proxies = proxies
+        ghost_ai.update_ghosts_on_tile_entry(list(proxies.values()), snapshot.pacman, snapshot.power_pellet_active,
+                                             self.maze, self.path_cache, self.flow_field)
+        back = {key: decision for key, decision in self.front.items()
+                if key in proxies and not decision.applied}
+        for (key, proxy), state in zip(proxies.items(), before):
+            after = (proxy.position, tuple(proxy.direction), getattr(proxy, "target", None), proxy.speed)
+            if after != state:
+                position = state[0]
+                back[key] = Decision(snapshot.tick, ghost_ai.position_to_tile(position), after[2], proxy.speed,
+                                     after[1], proxy.position if proxy.position != position else None)
+        self._back = back
+        self._back_tick = snapshot.tick
+        with self._publish_lock:
+            self._back, self.front = self.front, self._back
+            self._back_tick, self.front_tick = self.front_tick, self._back_tick
+        self.plans_completed += 1
+
+    def _work(self):
+        while self._running:
+            self._wake.wait()
+            self._wake.clear()
+            snapshot = self.take_pending()
+            if snapshot is not None and self._running:
+                try:
+                    self.plan(snapshot)
+                except Exception as e:
+                    self.plans_failed += 1
+                    print("Warning: AI planning failed for tick", snapshot.tick, ":", e)
+
+    def swap(self):
+        """Return the newest published decisions, or the previous ones if the worker is
+           publishing right now. Never blocks."""
+        if self._publish_lock.acquire(blocking=False):
+            try:
+                self._current = self.front
+            finally:
+                self._publish_lock.release()
+        return self._current
+
+    def keep_on_maze(self, ghost):
+        """
+        Correct a ghost that the planner has not caught up with: a ghost heading into a
+        wall from the tile it is on turns with the corridor-follow rule, and a ghost
+        that has stepped off a tunnel edge is moved to the partner tile. Returns True
+        if the ghost was changed.
+        """
+        direction = tuple(ghost.direction)
+        if direction == (0, 0):
+            return False
+        maze = self.maze
+        position = self.to_tiles(ghost.position)
+        tile = ghost_ai.position_to_tile(position)
+        if not pathfinding.is_walkable(maze, tile):
+            edge = (min(max(tile[0], 0), maze.rows - 1), min(max(tile[1], 0), maze.cols - 1))
+            partner = maze.tunnel_partner(*edge) if edge != tile else None
+            if partner is None:
+                return False
+            ghost.position = self.from_tiles((float(partner[1]), float(partner[0])))
+            if hasattr(ghost, "save_position"):
+                ghost.save_position()
+            return True
+        mask = maze.exit_mask(*tile)
+        if mask & ghost_ai.EXIT_BY_DIRECTION.get(direction, 0):
+            return False
+        proxy = GhostProxy(ghost.KIND)
+        proxy.position = position
+        proxy.direction = direction
+        ghost_ai.follow_corridor(proxy, tile, mask)
+        ghost.position = self.from_tiles(proxy.position)
+        ghost.direction = proxy.direction
+        return True
+
+    def apply(self, ghosts, decisions=None):
+        """
+        Give each ghost its decision, once, then keep every ghost on the maze with
+        keep_on_maze(). Decisions planned from a tile the ghost has since left are stale
+        and not applied; such a ghost follows its corridor until a fresh decision arrives.
+        Returns the number of decisions applied.
+        """
+        if decisions is None:
+            decisions = self.swap()
+        applied = 0
+        for ghost in ghosts:
+            decision = decisions.get(ghost)
+            if decision is None or decision.applied:
+                self.keep_on_maze(ghost)
+                continue
+            decision.applied = True
+            if ghost_ai.position_to_tile(self.to_tiles(ghost.position)) != decision.tile:
+                self.keep_on_maze(ghost)
+                continue
+            if decision.target is not None:
+                ghost.target = self.from_tiles(decision.target)
+            ghost.speed = decision.speed
+            if decision.position is not None:
+                ghost.position = self.from_tiles(decision.position)
+                if ghost_ai.position_to_tile(decision.position) != decision.tile and hasattr(ghost, "save_position"):
+                    # Crossed a tunnel: do not interpolate across the maze.
+                    ghost.save_position()
+            ghost.direction = decision.direction
+            self.keep_on_maze(ghost)
+            applied += 1
+        return applied
+
+def main():
+    import game_objects
+
+    level = Maze()
+
+    # Planning a snapshot matches tile-entry decisions made on the ghosts directly.
+    planner = AIPlanner(level)
+    pacman = game_objects.PacMan(position=(8, 7), direction=(1, 0))
+    ghosts = [game_objects.Blinky(position=(1, 3)), game_objects.Clyde(position=(2, 1))]
+    planner.submit(ghosts, pacman)
+    snapshot = planner.take_pending()
+    assert snapshot is not None and planner.take_pending() is None, "Taking the pending snapshot should clear it."
+    planner.plan(snapshot)
+    decisions = planner.swap()
+    assert len(decisions) == 2, "Every new ghost should get a decision."
+    ghost_ai.initialize_ai(level=level)
+    references = [game_objects.Blinky(position=(1, 3)), game_objects.Clyde(position=(2, 1))]
+    ghost_ai.update_ghosts_on_tile_entry(references, pacman)
+    ghost_ai.initialize_ai()
+    assert planner.apply(ghosts, decisions) == 2, "Fresh decisions should be applied."
+    for ghost, reference in zip(ghosts, references):
+        assert ghost.target == reference.target and tuple(ghost.direction) == tuple(reference.direction), \
+            "Planner decision should match direct tile-entry decisions."
+        assert tuple(ghost.position) == tuple(reference.position), "Planner should snap ghosts like direct decisions."
+    assert planner.apply(ghosts, decisions) == 0, "A decision should only be applied once."
+
+    # Ghosts still on the tile they were decided on need no new decision.
+    planner.submit(ghosts, pacman)
+    planner.plan(planner.take_pending())
+    assert planner.apply(ghosts) == 0, "Ghosts that have not entered a new tile should get no decision."
+
+    # Decisions for a tile the ghost has left are dropped.
+    newcomer = game_objects.Pinky(position=(3, 5))
+    planner.submit(ghosts + [newcomer], pacman)
+    planner.plan(planner.take_pending())
+    newcomer.position = (6, 5)
+    assert planner.apply([newcomer]) == 0, "Decisions for a tile the ghost left should not be applied."
+    assert planner.front[newcomer].applied, "A stale decision should be dropped."
+
+    # Removed ghosts are forgotten by the worker.
+    planner.submit(ghosts, pacman)
+    planner.plan(planner.take_pending())
+    assert newcomer not in planner.proxies and newcomer not in planner.front, "Removed ghosts should be forgotten."
+
+    # The worker thread plans in the background; the main loop never waits for it.
+    planner.start()
+    try:
+        for _ in range(200):
+            started = time.perf_counter()
+            planner.apply(ghosts)
+            planner.submit(ghosts, pacman)
+            assert time.perf_counter() - started < 0.05, "The main loop should never block on the planner."
+            for ghost in ghosts:
+                ghost.speed = 0.1
+                ghost.move()
+            time.sleep(0.001)
+        deadline = time.perf_counter() + 2.0
+        while planner.front_tick < planner._tick and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        assert planner.front_tick == planner._tick, "The newest snapshot should be planned and published."
+        assert planner.plans_completed >= 1, "The worker should have published decisions."
+        for ghost in ghosts:
+            row, col = ghost_ai.position_to_tile(ghost.position)
+            assert not level.is_wall(row, col), "Planned ghosts should stay off the walls."
+    finally:
+        planner.stop()
+    assert planner._thread is None, "stop() should end the worker thread."
+
+    # A slow planner delays turns but never lets a ghost walk through a wall.
+    slow = AIPlanner(level)
+    plan = slow.plan
+
+    def slow_plan(snapshot):
+        time.sleep(0.05)
+        plan(snapshot)
+
+    slow.plan = slow_plan
+    runners = [game_objects.Blinky(position=(1, 3)), game_objects.Pinky(position=(3, 5)),
+               game_objects.Inky(position=(8, 5)), game_objects.Clyde(position=(2, 1))]
+    for ghost in runners:
+        ghost.direction = (1, 0)
+    slow.start()
+    try:
+        for _ in range(300):
+            slow.apply(runners)
+            slow.submit(runners, pacman)
+            for ghost in runners:
+                ghost.speed = 0.1
+                ghost.move()
+                row, col = ghost_ai.position_to_tile(ghost.position)
+                inside = 0 <= row < level.rows and 0 <= col < level.cols
+                assert not (inside and level.is_wall(row, col)), "A slow planner should not let ghosts into walls."
+            time.sleep(0.001)
+    finally:
+        slow.stop()
+    assert slow.plans_completed >= 1, "The slow planner should still publish decisions."
+
+    # A failed planning pass is reported and the worker keeps running.
+    flaky = AIPlanner(level)
+    plan = flaky.plan
+
+    def failing_plan(snapshot):
+        if flaky.plans_failed == 0:
+            raise IndexError("planning failed")
+        plan(snapshot)
+
+    flaky.plan = failing_plan
+    flaky.start()
+    try:
+        for expected in ("plans_failed", "plans_completed"):
+            flaky.submit(ghosts, pacman)
+            deadline = time.perf_counter() + 2.0
+            while getattr(flaky, expected) == 0 and time.perf_counter() < deadline:
+                time.sleep(0.001)
+            assert getattr(flaky, expected) == 1, f"Expected {expected} to count the planning pass."
+        assert flaky._thread.is_alive(), "The worker should survive a failed planning pass."
+    finally:
+        flaky.stop()
+
+    # Pixel positions are converted to and from tile units.
+    pixels = AIPlanner(level, tile_size=20)
+    assert pixels.to_tiles((30, 50)) == (1.0, 2.0), "Pixel to tile conversion mismatch."
+    assert pixels.from_tiles((1.0, 2.0)) == (30.0, 50.0), "Tile to pixel conversion mismatch."
+
+    print("All AI planner tests passed.")
+
+if __name__ == "__main__":
+    main()
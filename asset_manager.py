@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+from collections import OrderedDict
+
+import pygame
+
+try:
+    import config
+except SyntaxError:
+    class DummyConfig:
+        IMAGE_PLAYER_PATH = "assets/player.png"
+        IMAGE_GHOST_PATH = "assets/ghost.png"
+        IMAGE_WALL_PATH = "assets/wall.png"
+        SPRITE_WIDTH = 32
+        SPRITE_HEIGHT = 32
+    config = DummyConfig
+
+# Rotation in degrees (counterclockwise) for each facing direction of the player sprite,
+# which is drawn facing right.
+FACING_ANGLES = {
+    (1, 0): 0,
+    (0, -1): 90,
+    (-1, 0): 180,
+    (0, 1): 270,
+}
+
+# Color multiplied into ghost sprites while they are vulnerable.
+VULNERABLE_TINT = (60, 60, 255)
+
+class AssetManager:
+    """
+    Loads each image once and caches ready-to-blit variants of it.
+    Base images are converted to the display pixel format as soon as a display exists.
+    Scaled, rotated and tinted variants are kept in an LRU cache of at most max_variants
+    surfaces, so each variant is built once instead of being transformed every frame.
+    """
+    def __init__(self, max_variants=128):
+        self.max_variants = max_variants
+        self.images = {}
+        self.variants = OrderedDict()
+        self._converted = set()
+
+    def load_image(self, path):
+        """Return the base image for a path, loading it on first use."""
+        image = self.images.get(path)
+        if image is None:
+            image = pygame.image.load(path)
+            self.images[path] = image
+        if path not in self._converted and pygame.display.get_surface() is not None:
+            # Blitting converted surfaces avoids a pixel format conversion on every blit.
+            image = image.convert_alpha()
+            self.images[path] = image
+            self._converted.add(path)
+            self._drop_variants(path)
+        return image
+
+    def _drop_variants(self, path):
+        for key in [key for key in self.variants if key[0] == path]:
+            del self.variants[key]
+
+    def get_sprite(self, path, size=None, angle=0, tint=None):
+        """
+        Return the image at path scaled to size (width, height), rotated counterclockwise
+        by angle degrees and multiplied by the RGB tint, building and caching it if needed.
+        """
+        base = self.load_image(path)
+        key = (path, size, angle, tint)
+        sprite = self.variants.get(key)
+        if sprite is not None:
+            self.variants.move_to_end(key)
+            return sprite
+        sprite = base
+        if size is not None and sprite.get_size() != size:
+            sprite = pygame.transform.smoothscale(sprite, size)
+        if angle:
+            sprite = pygame.transform.rotate(sprite, angle)
+        if tint is not None:
+            sprite = sprite.copy()
+            sprite.fill(tint + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+        self.variants[key] = sprite
+        if len(self.variants) > self.max_variants:
+            self.variants.popitem(last=False)
+        return sprite
+
+    def player_sprite(self, direction):
+        """Return the player sprite facing the given (dx, dy) direction."""
+        angle = FACING_ANGLES.get((direction[0], direction[1]), 0)
+        return self.get_sprite(config.IMAGE_PLAYER_PATH, (config.SPRITE_WIDTH, config.SPRITE_HEIGHT), angle)
+
+    def ghost_sprite(self, vulnerable=False):
+        """Return the ghost sprite, tinted while vulnerable."""
+        tint = VULNERABLE_TINT if vulnerable else None
+        return self.get_sprite(config.IMAGE_GHOST_PATH, (config.SPRITE_WIDTH, config.SPRITE_HEIGHT), tint=tint)
+
+    def wall_sprite(self, size):
+        """Return the wall image scaled to one tile of the given size."""
+        return self.get_sprite(config.IMAGE_WALL_PATH, (size, size))
+
+def main():
+    pygame.init()
+    manager = AssetManager(max_variants=4)
+
+    # Images are loaded once.
+    first = manager.load_image(config.IMAGE_PLAYER_PATH)
+    assert manager.load_image(config.IMAGE_PLAYER_PATH) is first, "Base images should be loaded once."
+
+    # Variants are pre-scaled and cached.
+    sprite = manager.player_sprite((1, 0))
+    assert sprite.get_size() == (config.SPRITE_WIDTH, config.SPRITE_HEIGHT), "Player sprite should be pre-scaled."
+    assert manager.player_sprite((1, 0)) is sprite, "Player sprite variants should be cached."
+    facing_up = manager.player_sprite((0, -1))
+    assert facing_up is not sprite, "Each facing direction should be its own variant."
+    assert facing_up.get_size() == sprite.get_size(), "Quarter turns should keep the sprite size."
+
+    # Vulnerable ghosts are tinted towards blue.
+    normal = manager.ghost_sprite()
+    frightened = manager.ghost_sprite(vulnerable=True)
+    assert frightened is not normal, "Vulnerable ghosts should use a tinted variant."
+    width, height = normal.get_size()
+    center = (width // 2, height // 2)
+    if normal.get_at(center).a:
+        assert frightened.get_at(center).r <= normal.get_at(center).r, "Tint should not brighten red."
+
+    # The variant cache is bounded.
+    for angle in range(0, 360, 45):
+        manager.get_sprite(config.IMAGE_WALL_PATH, (16, 16), angle)
+    assert len(manager.variants) == manager.max_variants, "Variant cache should stay within its limit."
+
+    # Once a display exists, images are converted to its pixel format.
+    screen = pygame.display.set_mode((64, 64))
+    converted = manager.player_sprite((1, 0))
+    assert config.IMAGE_PLAYER_PATH in manager._converted, "Image should be converted once a display exists."
+    assert converted is manager.player_sprite((1, 0)), "Converted variants should be cached."
+    screen.blit(converted, (0, 0))
+
+    print("All asset manager tests passed.")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
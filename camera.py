@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+from collections import OrderedDict
+
+import pygame
+
+try:
+    from config import SCREEN_WIDTH, SCREEN_HEIGHT
+except Exception:
+    SCREEN_WIDTH = 800
+    SCREEN_HEIGHT = 600
+
+from maze import TILE_SIZE
+
+class Camera:
+    """A screen-sized view onto the maze's pixel space, kept inside the maze bounds."""
+    def __init__(self, world_width, world_height, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.width = width
+        self.height = height
+        self.x = 0
+        self.y = 0
+
+    @classmethod
+    def for_maze(cls, maze, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        """Create a camera whose world is the maze's pixel area."""
+        return cls(maze.cols * TILE_SIZE, maze.rows * TILE_SIZE, width, height)
+
+    def follow(self, target_x, target_y):
+        """Center the view on a world position, clamped so it never shows outside the maze.
+           If the maze is smaller than the view along an axis, it is centered on that axis."""
+        if self.world_width <= self.width:
+            self.x = (self.world_width - self.width) // 2
+        else:
+            self.x = min(max(int(target_x) - self.width // 2, 0), self.world_width - self.width)
+        if self.world_height <= self.height:
+            self.y = (self.world_height - self.height) // 2
+        else:
+            self.y = min(max(int(target_y) - self.height // 2, 0), self.world_height - self.height)
+
+    @property
+    def rect(self):
+        """The visible area in world pixels."""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def world_to_screen(self, x, y):
+        """Convert a world pixel position to a screen position."""
+        return (x - self.x, y - self.y)
+
+class ChunkedMazeRenderer:
+    """
+    Draws only the parts of a maze that are inside the camera view.
+
+    The maze is split into square chunks of chunk_tiles tiles. Each visible chunk is
+    pre-rendered once into its own surface and kept in an LRU cache of at most
+    max_chunks surfaces, so drawing a frame costs one blit per visible chunk no matter
+    how large the maze is. Eaten pellets are patched into cached chunks as they change;
+    this consumes the maze's dirty-tile list, so use the renderer instead of Maze.draw.
+    """
+    def __init__(self, maze, chunk_tiles=16, max_chunks=64):
+        self.maze = maze
+        self.chunk_tiles = chunk_tiles
+        self.chunk_pixels = chunk_tiles * TILE_SIZE
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # (chunk row, chunk col) -> Surface
+        self.chunks_drawn = 0
+
+    def _render_chunk(self, chunk_row, chunk_col):
+        maze = self.maze
+        first_row = chunk_row * self.chunk_tiles
+        first_col = chunk_col * self.chunk_tiles
+        last_row = min(first_row + self.chunk_tiles, maze.rows)
+        last_col = min(first_col + self.chunk_tiles, maze.cols)
+        surface = pygame.Surface(((last_col - first_col) * TILE_SIZE, (last_row - first_row) * TILE_SIZE))
+        for row in range(first_row, last_row):
+            for col in range(first_col, last_col):
+                maze.draw_tile(surface, maze.tile_at(row, col),
+                               (col - first_col) * TILE_SIZE, (row - first_row) * TILE_SIZE)
+        return surface
+
+    def get_chunk(self, chunk_row, chunk_col):
+        """Return the surface for a chunk, rendering it and evicting the least recently used one if needed."""
+        key = (chunk_row, chunk_col)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self.chunks.move_to_end(key)
+            return surface
+        surface = self._render_chunk(chunk_row, chunk_col)
+        self.chunks[key] = surface
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def _apply_dirty_tiles(self):
+        maze = self.maze
+        for index in maze.pop_dirty_tiles():
+            row, col = divmod(index, maze.cols)
+            surface = self.chunks.get((row // self.chunk_tiles, col // self.chunk_tiles))
+            # Chunks that are not cached will be rendered from the current tiles anyway.
+            if surface is not None:
+                maze.draw_tile(surface, maze.tiles[index],
+                               (col % self.chunk_tiles) * TILE_SIZE, (row % self.chunk_tiles) * TILE_SIZE)
+
+    def invalidate(self):
+        """Drop every cached chunk, e.g. after the maze layout is replaced."""
+        self.chunks.clear()
+
+    def draw(self, surface, camera):
+        """Blit the chunks overlapping the camera view onto the surface."""
+        self._apply_dirty_tiles()
+        view = camera.rect
+        chunk_pixels = self.chunk_pixels
+        first_chunk_row = max(view.top // chunk_pixels, 0)
+        first_chunk_col = max(view.left // chunk_pixels, 0)
+        last_chunk_row = min((view.bottom - 1) // chunk_pixels, (self.maze.rows - 1) // self.chunk_tiles)
+        last_chunk_col = min((view.right - 1) // chunk_pixels, (self.maze.cols - 1) // self.chunk_tiles)
+        drawn = 0
+        for chunk_row in range(first_chunk_row, last_chunk_row + 1):
+            for chunk_col in range(first_chunk_col, last_chunk_col + 1):
+                chunk = self.get_chunk(chunk_row, chunk_col)
+                surface.blit(chunk, camera.world_to_screen(chunk_col * chunk_pixels, chunk_row * chunk_pixels))
+                drawn += 1
+        self.chunks_drawn = drawn
+
+def main():
+    import maze as maze_module
+    import maze_generator
+
+    # Test camera following and clamping.
+    camera = Camera(2000, 1500, 800, 600)
+    camera.follow(1000, 750)
+    assert (camera.x, camera.y) == (600, 450), "Camera should center on the target."
+    camera.follow(10, 10)
+    assert (camera.x, camera.y) == (0, 0), "Camera should clamp at the top-left corner."
+    camera.follow(5000, 5000)
+    assert (camera.x, camera.y) == (1200, 900), "Camera should clamp at the bottom-right corner."
+    small = Camera(400, 300, 800, 600)
+    small.follow(0, 0)
+    assert (small.x, small.y) == (-200, -150), "A small world should be centered in the view."
+    assert camera.world_to_screen(1300, 1000) == (100, 100), "world_to_screen conversion mismatch."
+
+    # Test that only visible chunks are drawn for a maze much larger than the screen.
+    big = maze_generator.generate_maze(200, 200, seed=5)
+    camera = Camera.for_maze(big, 800, 600)
+    renderer = ChunkedMazeRenderer(big, chunk_tiles=16, max_chunks=20)
+    screen = pygame.Surface((800, 600))
+    camera.follow(2000, 2000)
+    renderer.draw(screen, camera)
+    chunk_pixels = 16 * TILE_SIZE
+    max_visible = (800 // chunk_pixels + 2) * (600 // chunk_pixels + 2)
+    assert 0 < renderer.chunks_drawn <= max_visible, "Renderer should draw only the visible chunks."
+
+    # The drawn pixels match the tiles under the camera.
+    for row, col in ((100, 100), (95, 90), (105, 110)):
+        x, y = camera.world_to_screen(col * TILE_SIZE, row * TILE_SIZE)
+        tile_type = big.tile_at(row, col) & maze_module.TILE_TYPE_MASK
+        expected = big.WALL_COLOR if tile_type == maze_module.TILE_WALL else big.BACKGROUND_COLOR
+        if tile_type in (maze_module.TILE_WALL, maze_module.TILE_EMPTY):
+            assert tuple(screen.get_at((x, y)))[:3] == expected, f"Tile ({row}, {col}) drawn incorrectly."
+
+    # Eaten pellets are patched into cached chunks.
+    row, col = min(big.pellets_in_region(95, 95, 105, 105))
+    big.consume_pellet(row, col)
+    renderer.draw(screen, camera)
+    x, y = camera.world_to_screen(col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2)
+    assert tuple(screen.get_at((x, y)))[:3] == big.BACKGROUND_COLOR, "Eaten pellet should be erased from its chunk."
+
+    # The chunk cache stays bounded while the camera moves across the maze.
+    for step in range(0, 4000, 200):
+        camera.follow(step, step)
+        renderer.draw(screen, camera)
+        assert len(renderer.chunks) <= renderer.max_chunks, "Chunk cache exceeded its limit."
+
+    print("All camera tests passed.")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,10 @@
 #!/usr/bin/env python3
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 def is_grid_aligned(entity, cell_size, tolerance):
     """
@@ -91,12 +97,20 @@ def resolve_bonus_item_collision(pacman, bonus, config):
         return True
     return False
 
+def is_wall_cell(maze, row, col):
+    """
+    Return True if the maze cell is a wall.
+    Uses maze.is_wall when the maze provides it; otherwise a get_cell value of 1 is a wall.
+    """
+    if hasattr(maze, "is_wall"):
+        return maze.is_wall(row, col)
+    return maze.get_cell(row, col) == 1
+
 def detect_wall_collision(entity, maze, config):
     """
     Detect collision between an entity and a maze wall.
-    Uses the entity's center position to determine the current grid cell.
-    Assumes maze has a method get_cell(row, col) that returns a cell value,
-    where a value of 1 represents a wall.
+    Uses the entity's center position to determine the current grid cell,
+    and is_wall_cell to decide whether that cell is a wall.
     """
     if not (hasattr(entity, "x") and hasattr(entity, "y") and hasattr(entity, "width") and hasattr(entity, "height")):
         raise AttributeError("Entity is missing one of the required attributes: x, y, width, height.")
@@ -104,20 +118,526 @@ def detect_wall_collision(entity, maze, config):
     center_y = entity.y + entity.height / 2
     col = int(center_x // config.CELL_SIZE)
     row = int(center_y // config.CELL_SIZE)
-    if maze.get_cell(row, col) == 1:
+    if is_wall_cell(maze, row, col):
         return True
     return False
 
+def _axis_overlap_times(min1, max1, min2, max2, velocity):
+    """Return the (entry, exit) times during which two moving intervals overlap, or None."""
+    if velocity == 0:
+        if max1 <= min2 or max2 <= min1:
+            return None
+        return float("-inf"), float("inf")
+    entry = (min2 - max1) / velocity
+    exit = (max2 - min1) / velocity
+    if entry > exit:
+        entry, exit = exit, entry
+    return entry, exit
+
+def swept_aabb(entity1, dx1, dy1, entity2, dx2=0, dy2=0):
+    """
+    Continuous bounding box test over one simulation step.
+    entity1 moves by (dx1, dy1) and entity2 by (dx2, dy2) during the step, starting from
+    their current positions. Returns the fraction of the step (0 to 1) at which the boxes
+    first overlap, or None if they do not overlap at any point of the step. Touching edges
+    do not count, as in check_bounding_box_collision.
+    """
+    left1, top1, right1, bottom1 = get_bounding_box(entity1)
+    left2, top2, right2, bottom2 = get_bounding_box(entity2)
+    x_times = _axis_overlap_times(left1, right1, left2, right2, dx1 - dx2)
+    if x_times is None:
+        return None
+    y_times = _axis_overlap_times(top1, bottom1, top2, bottom2, dy1 - dy2)
+    if y_times is None:
+        return None
+    entry = max(x_times[0], y_times[0])
+    exit = min(x_times[1], y_times[1])
+    if entry >= exit or entry >= 1 or exit <= 0:
+        return None
+    return max(entry, 0.0)
+
+def detect_swept_collision(entity1, dx1, dy1, entity2, dx2, dy2):
+    """
+    Return True if two entities overlap at any time while moving by their displacements.
+    Unlike detect_collision there is no grid alignment gate, since fast entities may never
+    be aligned at the sampled positions.
+    """
+    return swept_aabb(entity1, dx1, dy1, entity2, dx2, dy2) is not None
+
+def tile_ray_wall_hit(entity, dx, dy, maze, config):
+    """
+    Walk the tiles crossed by the entity's center while it moves by (dx, dy).
+    Returns (t, row, col) for the first wall tile entered, where t is the fraction of the
+    step at which the center enters it, or None if the path stays clear of walls.
+    """
+    left, top, right, bottom = get_bounding_box(entity)
+    cell_size = config.CELL_SIZE
+    x = (left + right) / 2
+    y = (top + bottom) / 2
+    col = int(x // cell_size)
+    row = int(y // cell_size)
+    if is_wall_cell(maze, row, col):
+        return 0.0, row, col
+    infinity = float("inf")
+    if dx > 0:
+        step_col, next_x, delta_x = 1, ((col + 1) * cell_size - x) / dx, cell_size / dx
+    elif dx < 0:
+        step_col, next_x, delta_x = -1, (col * cell_size - x) / dx, -cell_size / dx
+    else:
+        step_col, next_x, delta_x = 0, infinity, infinity
+    if dy > 0:
+        step_row, next_y, delta_y = 1, ((row + 1) * cell_size - y) / dy, cell_size / dy
+    elif dy < 0:
+        step_row, next_y, delta_y = -1, (row * cell_size - y) / dy, -cell_size / dy
+    else:
+        step_row, next_y, delta_y = 0, infinity, infinity
+    while True:
+        if next_x < next_y:
+            if next_x > 1:
+                return None
+            t = next_x
+            col += step_col
+            next_x += delta_x
+        else:
+            if next_y > 1:
+                return None
+            t = next_y
+            row += step_row
+            next_y += delta_y
+        if is_wall_cell(maze, row, col):
+            return t, row, col
+
+class SpatialHash:
+    """
+    Uniform grid broad phase.
+    Entities are inserted into every cell of cell_size pixels their bounding box touches,
+    once per tick. Only entities sharing a cell can overlap, so queries return a short
+    list of candidates for the narrow-phase check_bounding_box_collision.
+    """
+    def __init__(self, cell_size):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive.")
+        self.cell_size = cell_size
+        self.cells = {}
+        self.tags = {}
+
+    def clear(self):
+        """Remove all entities, ready for the next tick."""
+        self.cells.clear()
+        self.tags.clear()
+
+    def _cell_range(self, left, top, right, bottom):
+        size = self.cell_size
+        return int(left // size), int(top // size), int(right // size), int(bottom // size)
+
+    def insert(self, entity, tag=None):
+        """Add an entity to every cell its bounding box overlaps. tag is returned by tag_of()."""
+        self.insert_box(entity, *get_bounding_box(entity), tag=tag)
+
+    def insert_box(self, item, left, top, right, bottom, tag=None):
+        """Add any item to every cell the box (left, top, right, bottom) overlaps."""
+        first_x, first_y, last_x, last_y = self._cell_range(left, top, right, bottom)
+        cells = self.cells
+        for cell_y in range(first_y, last_y + 1):
+            for cell_x in range(first_x, last_x + 1):
+                key = (cell_x, cell_y)
+                bucket = cells.get(key)
+                if bucket is None:
+                    cells[key] = [item]
+                else:
+                    bucket.append(item)
+        self.tags[id(item)] = tag
+
+    def insert_many(self, entities, tag=None):
+        """Insert every entity in an iterable with the same tag."""
+        for entity in entities:
+            self.insert(entity, tag)
+
+    def tag_of(self, entity):
+        """Return the tag an entity was inserted with."""
+        return self.tags.get(id(entity))
+
+    def query(self, entity):
+        """Return the inserted entities that share a cell with the entity, excluding itself."""
+        return self.query_box(*get_bounding_box(entity), exclude=entity)
+
+    def query_box(self, left, top, right, bottom, exclude=None):
+        """Return the inserted items that share a cell with the box, each once, excluding exclude."""
+        first_x, first_y, last_x, last_y = self._cell_range(left, top, right, bottom)
+        cells = self.cells
+        seen = {id(exclude)}
+        candidates = []
+        for cell_y in range(first_y, last_y + 1):
+            for cell_x in range(first_x, last_x + 1):
+                for other in cells.get((cell_x, cell_y), ()):
+                    if id(other) not in seen:
+                        seen.add(id(other))
+                        candidates.append(other)
+        return candidates
+
+    def candidate_pairs(self):
+        """Return each unordered pair of inserted entities that share at least one cell, once."""
+        seen = set()
+        pairs = []
+        for bucket in self.cells.values():
+            for i in range(len(bucket)):
+                first = bucket[i]
+                for second in bucket[i + 1:]:
+                    key = (id(first), id(second)) if id(first) < id(second) else (id(second), id(first))
+                    if key not in seen:
+                        seen.add(key)
+                        pairs.append((first, second))
+        return pairs
+
+def find_collisions(entities, config, spatial_hash=None):
+    """
+    Return every pair of colliding entities, e.g. ghost against ghost.
+    Uses the spatial hash for the broad phase and detect_collision for the narrow phase.
+    """
+    if spatial_hash is None:
+        spatial_hash = SpatialHash(config.CELL_SIZE)
+    spatial_hash.clear()
+    spatial_hash.insert_many(entities)
+    return [(first, second) for first, second in spatial_hash.candidate_pairs()
+            if detect_collision(first, second, config)]
+
+def resolve_collisions(pacman, config, spatial_hash, pellets=(), ghosts=(), bonus_items=()):
+    """
+    Resolve pacman against all pellets, ghosts and bonus items for one tick.
+    Everything is inserted into the spatial hash once; only the candidates sharing a cell
+    with pacman are passed to the per-pair resolvers.
+    Returns a list of (kind, entity, result) for each candidate, where kind is
+    "pellet", "ghost" or "bonus_item" and result is what the resolver returned.
+    """
+    spatial_hash.clear()
+    spatial_hash.insert_many(pellets, "pellet")
+    spatial_hash.insert_many(ghosts, "ghost")
+    spatial_hash.insert_many(bonus_items, "bonus_item")
+    results = []
+    for entity in spatial_hash.query(pacman):
+        kind = spatial_hash.tag_of(entity)
+        if kind == "pellet":
+            result = resolve_pellet_collision(pacman, entity, config)
+        elif kind == "ghost":
+            result = resolve_ghost_collision(pacman, entity, config)
+        else:
+            result = resolve_bonus_item_collision(pacman, entity, config)
+        results.append((kind, entity, result))
+    return results
+
+class TileItemIndex:
+    """
+    Pickup items (pellets, bonus items) keyed by the tile their center is on.
+    Tiles are cell_size pixels square, the same grid detect_wall_collision uses.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.tiles = {}
+
+    def tile_of(self, entity):
+        """Return the (row, col) of the tile under the entity's center."""
+        left, top, right, bottom = get_bounding_box(entity)
+        return int((top + bottom) / 2 // self.cell_size), int((left + right) / 2 // self.cell_size)
+
+    def add(self, item):
+        """Index an item under the tile it is on."""
+        self.tiles.setdefault(self.tile_of(item), []).append(item)
+
+    def add_many(self, items):
+        """Index every item in an iterable."""
+        for item in items:
+            self.add(item)
+
+    def items_at(self, row, col):
+        """Return the items on a tile."""
+        return self.tiles.get((row, col), [])
+
+    def pop_tile(self, row, col):
+        """Remove and return the items on a tile."""
+        return self.tiles.pop((row, col), [])
+
+    def __len__(self):
+        return sum(len(items) for items in self.tiles.values())
+
+def resolve_tile_pickup(pacman, config, item_index=None, maze=None):
+    """
+    Pick up whatever is on pacman's tile, in time independent of the number of items.
+    pacman's center is mapped to its tile once; a pellet in the maze cell is consumed for
+    config.PELLET_VALUE points, and active items in the item index on that tile are marked
+    inactive and add their value, the same scoring as resolve_pellet_collision and
+    resolve_bonus_item_collision.
+    Returns the number of things picked up.
+    """
+    cell_size = config.CELL_SIZE
+    left, top, right, bottom = get_bounding_box(pacman)
+    row = int((top + bottom) / 2 // cell_size)
+    col = int((left + right) / 2 // cell_size)
+    picked = 0
+    if maze is not None and maze.consume_pellet(row, col):
+        pacman.score += config.PELLET_VALUE
+        picked += 1
+    if item_index is not None:
+        for item in item_index.pop_tile(row, col):
+            if item.active:
+                item.active = False
+                pacman.score += item.value
+                picked += 1
+    return picked
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for batch collision checks.")
+
+def batch_grid_aligned(xs, ys, cell_size, tolerance):
+    """
+    Vectorized is_grid_aligned for arrays of x and y positions.
+    Returns a boolean array.
+    """
+    _require_numpy()
+    rem_x = np.mod(xs, cell_size)
+    rem_y = np.mod(ys, cell_size)
+    aligned_x = (rem_x <= tolerance) | (cell_size - rem_x <= tolerance)
+    aligned_y = (rem_y <= tolerance) | (cell_size - rem_y <= tolerance)
+    return aligned_x & aligned_y
+
+def batch_bounding_box_collision(entity, xs, ys, widths, heights):
+    """
+    Vectorized check_bounding_box_collision of one entity against arrays of boxes.
+    Returns a boolean array.
+    """
+    _require_numpy()
+    left, top, right, bottom = get_bounding_box(entity)
+    return ~((xs + widths <= left) | (right <= xs) | (ys + heights <= top) | (bottom <= ys))
+
+def batch_resolve_collisions(pacman, xs, ys, widths, heights, active, vulnerable, values, config):
+    """
+    Resolve pacman against a whole array of entities in one pass.
+    Entity i is hit when active[i] is set, it is grid aligned and its box overlaps pacman,
+    with the same rules as detect_collision.
+      - Hits on vulnerable entities (pellets, bonus items, frightened ghosts) are eaten:
+        active is cleared and their values are added to pacman's score.
+      - Every hit on a non-vulnerable entity (a normal ghost) costs pacman one life.
+    active is updated in place. Returns (eaten indices, harmful indices).
+    """
+    _require_numpy()
+    if not is_grid_aligned(pacman, config.CELL_SIZE, config.GRID_TOLERANCE):
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    hits = (active
+            & batch_grid_aligned(xs, ys, config.CELL_SIZE, config.GRID_TOLERANCE)
+            & batch_bounding_box_collision(pacman, xs, ys, widths, heights))
+    eaten = np.flatnonzero(hits & vulnerable)
+    harmful = np.flatnonzero(hits & ~vulnerable)
+    if eaten.size:
+        active[eaten] = False
+        pacman.score += values[eaten].sum().item()
+    if harmful.size:
+        pacman.lives -= int(harmful.size)
+    return eaten, harmful
+
+class CollisionBody:
+    """Geometry record for a registered entity; kind is a free-form tag such as "ghost"."""
+    __slots__ = ("entity", "kind", "x", "y", "width", "height")
+
+    def __init__(self, entity, kind, x, y, width, height):
+        self.entity = entity
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+class CollisionWorld:
+    """
+    Collision kernel with entities validated once at registration.
+    register() checks an entity's attributes a single time and copies its geometry into a
+    CollisionBody. Each tick, sync() copies the current positions and rebuilds a SpatialHash
+    of the bodies; after that, queries work on the bodies only, with no hasattr checks.
+    Widths and heights are assumed not to change after registration.
+    """
+    def __init__(self, config, maze):
+        self.cell_size = config.CELL_SIZE
+        self.tolerance = config.GRID_TOLERANCE
+        self.maze = maze
+        if hasattr(maze, "is_wall"):
+            self._is_wall = maze.is_wall
+        else:
+            self._is_wall = lambda row, col: maze.get_cell(row, col) == 1
+        self.bodies = []
+        self.grid = SpatialHash(self.cell_size)
+
+    def register(self, entity, kind=None):
+        """Validate an entity and return its new CollisionBody."""
+        left, top, right, bottom = get_bounding_box(entity)
+        body = CollisionBody(entity, kind, left, top, right - left, bottom - top)
+        self.bodies.append(body)
+        return body
+
+    def unregister(self, body):
+        """Stop tracking a body."""
+        self.bodies.remove(body)
+
+    def sync(self):
+        """Copy the current entity positions into the bodies and rebuild the grid buckets."""
+        grid = self.grid
+        grid.clear()
+        insert_box = grid.insert_box
+        for body in self.bodies:
+            entity = body.entity
+            x = body.x = entity.x
+            y = body.y = entity.y
+            insert_box(body, x, y, x + body.width, y + body.height)
+
+    def is_aligned(self, body):
+        """is_grid_aligned for a body."""
+        size = self.cell_size
+        tolerance = self.tolerance
+        rem_x = body.x % size
+        rem_y = body.y % size
+        return ((rem_x <= tolerance or size - rem_x <= tolerance)
+                and (rem_y <= tolerance or size - rem_y <= tolerance))
+
+    def overlaps(self, first, second):
+        """check_bounding_box_collision for two bodies."""
+        return not (first.x + first.width <= second.x or second.x + second.width <= first.x
+                    or first.y + first.height <= second.y or second.y + second.height <= first.y)
+
+    def detect(self, first, second):
+        """detect_collision for two bodies: both grid aligned and overlapping."""
+        return self.is_aligned(first) and self.is_aligned(second) and self.overlaps(first, second)
+
+    def wall_collision(self, body):
+        """detect_wall_collision for a body."""
+        size = self.cell_size
+        return self._is_wall(int((body.y + body.height / 2) // size), int((body.x + body.width / 2) // size))
+
+    def collisions(self, body, kind=None):
+        """Return the bodies (optionally only those of one kind) colliding with body as of the last sync()."""
+        if not self.is_aligned(body):
+            return []
+        candidates = self.grid.query_box(body.x, body.y, body.x + body.width, body.y + body.height, exclude=body)
+        return [other for other in candidates
+                if (kind is None or other.kind == kind) and self.is_aligned(other) and self.overlaps(body, other)]
+
+    def collect_events(self, pacman_body, events):
+        """
+        Record every hit on pacman as of the last sync() into events without changing any entity.
+        Pellets and bonus items count only while active; vulnerable ghosts are eaten and other
+        ghosts cost a life. Apply the buffer with apply_collision_events().
+        """
+        for other in self.collisions(pacman_body):
+            entity = other.entity
+            if other.kind == "ghost":
+                if entity.vulnerable:
+                    events.record(EVENT_GHOST_EATEN, pacman_body, other, entity.value)
+                else:
+                    events.record(EVENT_LIFE_LOST, pacman_body, other, 0)
+            elif other.kind == "pellet":
+                if entity.active:
+                    events.record(EVENT_PELLET_EATEN, pacman_body, other, entity.value)
+            elif other.kind == "bonus_item":
+                if entity.active:
+                    events.record(EVENT_BONUS_EATEN, pacman_body, other, entity.value)
+        return events
+
+# Collision event types stored in CollisionEvents.
+EVENT_PELLET_EATEN = 1
+EVENT_BONUS_EATEN = 2
+EVENT_GHOST_EATEN = 3
+EVENT_LIFE_LOST = 4
+EVENT_NAMES = {
+    EVENT_PELLET_EATEN: "pellet_eaten",
+    EVENT_BONUS_EATEN: "bonus_eaten",
+    EVENT_GHOST_EATEN: "ghost_eaten",
+    EVENT_LIFE_LOST: "life_lost",
+}
+
+class CollisionEvents:
+    """
+    Preallocated journal of the collisions found in one tick.
+    Each event is (type, first body, second body, score delta), kept in parallel buffers
+    that are reused from tick to tick; clear() only resets the count. Audio, UI and stats
+    can read the same journal that apply_collision_events() applies.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.types = array("b", bytes(capacity))
+        self.firsts = [None] * capacity
+        self.seconds = [None] * capacity
+        self.score_deltas = array("i", bytes(4 * capacity))
+        self.count = 0
+
+    def clear(self):
+        """Forget the events of the previous tick."""
+        self.count = 0
+
+    def record(self, event_type, first, second, score_delta):
+        """Append an event, doubling the buffers if they are full."""
+        index = self.count
+        if index == self.capacity:
+            self.types.extend(bytes(self.capacity))
+            self.firsts.extend([None] * self.capacity)
+            self.seconds.extend([None] * self.capacity)
+            self.score_deltas.extend(array("i", bytes(4 * self.capacity)))
+            self.capacity *= 2
+        self.types[index] = event_type
+        self.firsts[index] = first
+        self.seconds[index] = second
+        self.score_deltas[index] = score_delta
+        self.count = index + 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.types[index], self.firsts[index], self.seconds[index], self.score_deltas[index]
+
+    def count_of(self, event_type):
+        """Return how many events of a type were recorded this tick."""
+        types = self.types
+        return sum(1 for index in range(self.count) if types[index] == event_type)
+
+def apply_collision_events(events, pacman):
+    """
+    Apply a tick's collision journal in one step: add the total score delta and subtract
+    the lives lost on pacman, deactivate eaten pellets and bonus items and mark eaten
+    ghosts as consumed. Returns (score delta, lives lost).
+    """
+    score_delta = 0
+    lives_lost = 0
+    types = events.types
+    seconds = events.seconds
+    deltas = events.score_deltas
+    for index in range(events.count):
+        event_type = types[index]
+        score_delta += deltas[index]
+        if event_type == EVENT_LIFE_LOST:
+            lives_lost += 1
+        elif event_type == EVENT_GHOST_EATEN:
+            seconds[index].entity.consumed = True
+        else:
+            seconds[index].entity.active = False
+    pacman.score += score_delta
+    pacman.lives -= lives_lost
+    return score_delta, lives_lost
+
+# Collision world for the current gameplay session, created by initialize_collision.
+world = None
+
 def initialize_collision(config, maze):
     """
     Initialize collision detection system.
-    Validates that the configuration and maze have the required attributes.
+    Validates that the configuration and maze have the required attributes and
+    creates the module-level CollisionWorld that entities are registered with.
     Returns True if initialization is successful.
     """
+    global world
     if not hasattr(config, "CELL_SIZE") or not hasattr(config, "GRID_TOLERANCE"):
         raise AttributeError("Config is missing required attributes: CELL_SIZE and GRID_TOLERANCE.")
     if not hasattr(maze, "get_cell") or not callable(maze.get_cell):
         raise AttributeError("Maze must have a callable get_cell method.")
+    world = CollisionWorld(config, maze)
     return True
 
 def main():
@@ -247,6 +767,191 @@ def main():
     pacman = DummyPacMan(20, 20)
     assert detect_wall_collision(pacman, maze, config) is False, "Wall collision incorrectly detected for an entity in a non-wall cell."
 
+    # Test 8: Spatial hash candidates
+    grid = SpatialHash(config.CELL_SIZE)
+    near = DummyGhost(45, 45)
+    far = DummyGhost(400, 400)
+    straddling = DummyGhost(65, 35)
+    grid.insert_many([near, far, straddling], "ghost")
+    pacman = DummyPacMan(40, 40)
+    candidates = grid.query(pacman)
+    assert near in candidates and straddling in candidates, "Spatial hash should return nearby entities."
+    assert far not in candidates, "Spatial hash should not return distant entities."
+    assert grid.tag_of(near) == "ghost", "Spatial hash should keep the insertion tag."
+    assert len(grid.candidate_pairs()) == 1, "Only the two nearby ghosts should form a candidate pair."
+
+    # Test 9: Broad phase finds the same colliding pairs as checking every pair
+    import random
+    rng = random.Random(1)
+    ghosts = [DummyGhost(rng.randrange(0, 400, 20), rng.randrange(0, 400, 20)) for _ in range(60)]
+    brute_force = {frozenset((id(a), id(b)))
+                   for i, a in enumerate(ghosts) for b in ghosts[i + 1:]
+                   if detect_collision(a, b, config)}
+    found = {frozenset((id(a), id(b))) for a, b in find_collisions(ghosts, config)}
+    assert found == brute_force, "Broad phase collisions should match brute force."
+
+    # Test 10: Resolving pacman against many entities through the spatial hash
+    pacman = DummyPacMan(40, 40)
+    pellets = [DummyPellet(x, y) for x in range(0, 400, 20) for y in range(0, 400, 20)]
+    ghost = DummyGhost(300, 300)
+    bonus = DummyBonus(40, 40)
+    results = resolve_collisions(pacman, config, SpatialHash(config.CELL_SIZE),
+                                 pellets=pellets, ghosts=[ghost], bonus_items=[bonus])
+    eaten = [entity for kind, entity, result in results if kind == "pellet" and result]
+    assert eaten == [pellet for pellet in pellets if not pellet.active], "Resolved pellets mismatch."
+    assert len(eaten) == 1 and eaten[0].x == 40 and eaten[0].y == 40, "Only the overlapping pellet should be eaten."
+    assert ("bonus_item", bonus, True) in results, "Bonus item should be resolved."
+    assert all(entity is not ghost for _, entity, _ in results), "Distant ghost should not be a candidate."
+    assert pacman.score == 10 + bonus.value and pacman.lives == 3, "Score and lives after resolving mismatch."
+
+    # Test 11: Batch collision matches the per-entity resolvers
+    if np is not None:
+        rng = random.Random(2)
+        count = 300
+        positions = [(rng.randrange(80, 121, 2), rng.randrange(80, 121, 2)) for _ in range(count)]
+        kinds = [rng.choice(("pellet", "ghost", "frightened")) for _ in range(count)]
+        pacman = DummyPacMan(100, 100)
+        expected_score = 0
+        expected_lives = pacman.lives
+        expected_eaten = []
+        for i, ((x, y), kind) in enumerate(zip(positions, kinds)):
+            if kind == "pellet":
+                if resolve_pellet_collision(pacman, DummyPellet(x, y), config):
+                    expected_eaten.append(i)
+            else:
+                ghost = DummyGhost(x, y)
+                ghost.vulnerable = kind == "frightened"
+                if resolve_ghost_collision(pacman, ghost, config) == "ghost_eaten":
+                    expected_eaten.append(i)
+        expected_score, expected_lives = pacman.score, pacman.lives
+        assert expected_eaten and expected_lives < 3, "Test data should produce both eaten and harmful hits."
+
+        pacman = DummyPacMan(100, 100)
+        xs = np.array([x for x, _ in positions], dtype=float)
+        ys = np.array([y for _, y in positions], dtype=float)
+        sizes = np.full(count, 20.0)
+        active = np.ones(count, dtype=bool)
+        vulnerable = np.array([kind != "ghost" for kind in kinds])
+        values = np.array([10 if kind == "pellet" else 200 for kind in kinds])
+        eaten, harmful = batch_resolve_collisions(pacman, xs, ys, sizes, sizes, active, vulnerable, values, config)
+        assert list(eaten) == expected_eaten, "Batch eaten entities mismatch."
+        assert pacman.score == expected_score and pacman.lives == expected_lives, "Batch score/lives mismatch."
+        assert not active[eaten].any() and active.sum() == count - len(eaten), "Batch should clear active for eaten entities."
+        eaten, harmful = batch_resolve_collisions(pacman, xs, ys, sizes, sizes, active, vulnerable, values, config)
+        assert eaten.size == 0 and pacman.score == expected_score, "Inactive entities should not be eaten twice."
+        misaligned = DummyPacMan(103, 100)
+        eaten, harmful = batch_resolve_collisions(misaligned, xs, ys, sizes, sizes, np.ones(count, dtype=bool), vulnerable, values, config)
+        assert eaten.size == 0 and harmful.size == 0, "Misaligned pacman should not collide."
+
+    # Test 12: Tile-indexed pickups score the same as the per-object resolvers
+    class PickupConfig(DummyConfig):
+        PELLET_VALUE = 10
+
+    index = TileItemIndex(config.CELL_SIZE)
+    pellets = [DummyPellet(x, y) for x in range(0, 400, 20) for y in range(0, 400, 20)]
+    bonus = DummyBonus(40, 40)
+    index.add_many(pellets)
+    index.add(bonus)
+    assert len(index) == len(pellets) + 1, "Item index size mismatch."
+    assert bonus in index.items_at(2, 2), "Bonus item should be indexed under its tile."
+    pacman = DummyPacMan(42, 38)
+    assert resolve_tile_pickup(pacman, PickupConfig, index) == 2, "Pellet and bonus on the tile should be picked up."
+    assert pacman.score == 10 + bonus.value and not bonus.active, "Tile pickup scoring mismatch."
+    assert sum(1 for pellet in pellets if not pellet.active) == 1, "Only the pellet on pacman's tile should be eaten."
+    assert resolve_tile_pickup(pacman, PickupConfig, index) == 0, "Items should only be picked up once."
+
+    # Maze cells are consumed through the maze's own pellet index.
+    import maze as maze_module
+    level = maze_module.Maze()
+    pacman = DummyPacMan(2 * 20, 1 * 20)
+    assert resolve_tile_pickup(pacman, PickupConfig, maze=level) == 1, "Maze pellet should be picked up."
+    assert pacman.score == PickupConfig.PELLET_VALUE and not level.is_pellet(1, 2), "Maze pellet pickup mismatch."
+
+    # Test 13: Swept collision catches fast entities that pass through each other
+    fast = DummyPacMan(0, 0)
+    target = DummyGhost(50, 0)
+    fast.x += 100
+    assert not check_bounding_box_collision(fast, target), "Sampled positions should miss the tunneling case."
+    fast.x -= 100
+    assert swept_aabb(fast, 100, 0, target) == 0.3, "Swept test should find the time of impact."
+    assert detect_swept_collision(fast, 60, 0, target, -60, 0), "Head-on movers should collide."
+    assert swept_aabb(fast, 100, 0, DummyGhost(50, 20)) is None, "Boxes that only touch should not collide."
+    assert swept_aabb(fast, 20, 0, DummyGhost(50, 0)) is None, "Movers that stop short should not collide."
+    assert swept_aabb(DummyGhost(50, 0), 0, 0, DummyGhost(55, 5)) == 0.0, "Overlapping boxes collide at t=0."
+    assert swept_aabb(fast, 100, 100, DummyGhost(50, 50)) is not None, "Diagonal movers should collide."
+
+    # Test 14: Tile ray finds walls crossed within one step
+    # Uses the 3x3 dummy maze with walls around the center cell.
+    mover = DummyPacMan(20, 20)
+    hit = tile_ray_wall_hit(mover, 25, 0, maze, config)
+    assert hit == (0.4, 1, 2), "Tile ray should hit the wall to the right."
+    assert tile_ray_wall_hit(mover, 5, 0, maze, config) is None, "Short moves should stay inside the cell."
+    assert tile_ray_wall_hit(mover, 0, -60, maze, config)[1:] == (0, 1), "Tile ray should hit the first wall upwards."
+    assert tile_ray_wall_hit(DummyPacMan(0, 0), 0, 0, maze, config) == (0.0, 0, 0), "Starting in a wall hits at t=0."
+
+    # Test 15: Collision world answers the same as the per-call checks
+    assert isinstance(world, CollisionWorld), "initialize_collision should create the collision world."
+    try:
+        world.register(object())
+        assert False, "Registering an entity without geometry should fail."
+    except AttributeError:
+        pass
+    pacman = DummyPacMan(40, 40)
+    pacman_body = world.register(pacman, "pacman")
+    ghosts = [DummyGhost(x, y) for x in range(0, 100, 10) for y in range(0, 100, 10)]
+    ghost_bodies = [world.register(ghost, "ghost") for ghost in ghosts]
+    pellet_body = world.register(DummyPellet(40, 40), "pellet")
+    world.sync()
+    expected = [ghost for ghost in ghosts if detect_collision(pacman, ghost, config)]
+    found = [body.entity for body in world.collisions(pacman_body, "ghost")]
+    assert sorted(map(id, found)) == sorted(map(id, expected)) and expected, "World collisions mismatch."
+    assert world.collisions(pacman_body, "pellet") == [pellet_body], "World should filter collisions by kind."
+    for ghost, body in zip(ghosts, ghost_bodies):
+        assert world.is_aligned(body) == is_grid_aligned(ghost, config.CELL_SIZE, config.GRID_TOLERANCE), "Alignment mismatch."
+        assert world.overlaps(pacman_body, body) == check_bounding_box_collision(pacman, ghost), "Overlap mismatch."
+        assert world.wall_collision(body) == detect_wall_collision(ghost, maze, config), "Wall collision mismatch."
+    # Positions are picked up on the next sync.
+    pacman.x, pacman.y = 0, 0
+    world.sync()
+    assert (pacman_body.x, pacman_body.y) == (0, 0), "sync() should copy entity positions."
+    assert world.wall_collision(pacman_body), "Moved body should now be in a wall cell."
+    world.unregister(pellet_body)
+    world.sync()
+    assert world.collisions(pacman_body, "pellet") == [], "Unregistered bodies should not collide."
+
+    # Test 16: Event journal collects hits without side effects and applies them in one step
+    pacman = DummyPacMan(40, 40)
+    event_world = CollisionWorld(config, maze)
+    pacman_body = event_world.register(pacman, "pacman")
+    pellet = DummyPellet(40, 40)
+    bonus = DummyBonus(40, 40)
+    eaten_pellet = DummyPellet(40, 40)
+    eaten_pellet.active = False
+    normal_ghost = DummyGhost(40, 40)
+    frightened_ghost = DummyGhost(40, 40)
+    frightened_ghost.vulnerable = True
+    far_ghost = DummyGhost(200, 200)
+    event_world.register(pellet, "pellet")
+    event_world.register(bonus, "bonus_item")
+    event_world.register(eaten_pellet, "pellet")
+    for ghost in (normal_ghost, frightened_ghost, far_ghost):
+        event_world.register(ghost, "ghost")
+    event_world.sync()
+    events = CollisionEvents(capacity=2)
+    event_world.collect_events(pacman_body, events)
+    assert len(events) == 4, "Four hits should be journaled."
+    assert pellet.active and bonus.active and not frightened_ghost.consumed, "Collecting events should not mutate entities."
+    assert pacman.score == 0 and pacman.lives == 3, "Collecting events should not change pacman."
+    assert events.count_of(EVENT_LIFE_LOST) == 1 and events.count_of(EVENT_GHOST_EATEN) == 1, "Event types mismatch."
+    assert sorted(EVENT_NAMES[event_type] for event_type, _, _, _ in events) == ["bonus_eaten", "ghost_eaten", "life_lost", "pellet_eaten"], "Event names mismatch."
+    assert apply_collision_events(events, pacman) == (10 + bonus.value + frightened_ghost.value, 1), "Applied totals mismatch."
+    assert pacman.score == 10 + bonus.value + frightened_ghost.value and pacman.lives == 2, "Applying events score/lives mismatch."
+    assert not pellet.active and not bonus.active and frightened_ghost.consumed, "Applying events should update entities."
+    assert not normal_ghost.consumed, "Normal ghosts should not be consumed."
+    events.clear()
+    event_world.collect_events(pacman_body, events)
+    assert len(events) == 2, "Only ghost contacts should remain once the items are eaten."
+
     print("All collision tests passed successfully.")
 
 if __name__ == "__main__":
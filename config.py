@@ -7,6 +7,14 @@ from enum import Enum
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+# "full" redraws and flips the whole screen every frame; "dirty" (opt-in) redraws
+# and presents only the areas that changed since the last frame.
+RENDER_MODE = "full"
+# The simulation advances in fixed ticks at SIMULATION_HZ, independent of FPS;
+# PLAYER_SPEED and GHOST_SPEED are distances per tick. Frames longer than
+# MAX_FRAME_TIME seconds are clamped so a stall cannot queue up unbounded ticks.
+SIMULATION_HZ = 60
+MAX_FRAME_TIME = 0.25
 
 # Grid and sprite settings
 GRID_SIZE = 32
@@ -28,6 +36,10 @@ IMAGE_GHOST_PATH = "assets/ghost.png"
 IMAGE_WALL_PATH = "assets/wall.png"
 SOUND_EFFECT_PATH = "assets/sound_effect.wav"
 
+# Level file locations
+LEVELS_DIR = "assets/levels"
+LEVEL_CACHE_DIR = "assets/levels/.cache"
+
 # Audio asset file paths and volume settings
 AUDIO_PELLET_SOUND = "assets/sounds/pellet.wav"
 AUDIO_GHOST_ENCOUNTER_SOUND = "assets/sounds/ghost_encounter.wav"
@@ -38,9 +50,20 @@ SOUND_VOLUME = 0.7
 MUSIC_VOLUME = 0.5
 
 # Gameplay constants
-PLAYER_SPEED = 5.0  # pixels per frame
-GHOST_SPEED = 2.5   # pixels per frame
+PLAYER_SPEED = 5.0  # pixels per tick
+GHOST_SPEED = 2.5   # pixels per tick
 GHOST_BEHAVIOR_TIMING = 5.0  # seconds for behavior switch
+AI_BUDGET_MS = 2.0  # milliseconds of ghost re-planning allowed per frame
+PELLET_VALUE = 10  # points per maze pellet
+
+# Ghost AI settings (ghost_ai positions and distances are in tiles)
+BLINKY_SPEED = GHOST_SPEED
+PINKY_SPEED = GHOST_SPEED
+INKY_SPEED = GHOST_SPEED
+CLYDE_SPEED = GHOST_SPEED
+VULNERABLE_SPEED = GHOST_SPEED * 0.5
+CLYDE_BEHAVIOR_DISTANCE = 8
+CLYDE_SCATTER_POSITION = (0, 0)
 
 # HUD and UI settings
 SCORE_POS = (10, 10)
@@ -65,12 +88,18 @@ class GameState(Enum):
 # Assertions to ensure value ranges
 assert SCREEN_WIDTH > 0, "SCREEN_WIDTH must be positive."
 assert SCREEN_HEIGHT > 0, "SCREEN_HEIGHT must be positive."
+assert RENDER_MODE in ("full", "dirty"), "RENDER_MODE must be 'full' or 'dirty'."
+assert SIMULATION_HZ > 0, "SIMULATION_HZ must be positive."
+assert MAX_FRAME_TIME >= 1.0 / SIMULATION_HZ, "MAX_FRAME_TIME must allow at least one simulation tick."
 assert GRID_SIZE > 0, "GRID_SIZE must be positive."
 assert GRID_TOLERANCE >= 0, "GRID_TOLERANCE must be zero or positive."
 assert CELL_SIZE > 0, "CELL_SIZE must be positive."
 assert PLAYER_SPEED > 0, "PLAYER_SPEED must be positive."
 assert GHOST_SPEED > 0, "GHOST_SPEED must be positive."
 assert GHOST_BEHAVIOR_TIMING > 0, "GHOST_BEHAVIOR_TIMING must be positive."
+assert AI_BUDGET_MS > 0, "AI_BUDGET_MS must be positive."
+assert PELLET_VALUE >= 0, "PELLET_VALUE must be zero or positive."
+assert CLYDE_BEHAVIOR_DISTANCE > 0, "CLYDE_BEHAVIOR_DISTANCE must be positive."
 assert isinstance(SOUND_VOLUME, float) and 0.0 <= SOUND_VOLUME <= 1.0, "SOUND_VOLUME must be a float between 0 and 1."
 assert isinstance(MUSIC_VOLUME, float) and 0.0 <= MUSIC_VOLUME <= 1.0, "MUSIC_VOLUME must be a float between 0 and 1."
 
@@ -86,6 +115,11 @@ def main():
     assert SCREEN_WIDTH == 800, "Expected SCREEN_WIDTH to be 800."
     assert SCREEN_HEIGHT == 600, "Expected SCREEN_HEIGHT to be 600."
     assert FPS == 60, "Expected FPS to be 60."
+    print("RENDER_MODE =", RENDER_MODE)
+    assert RENDER_MODE in ("full", "dirty"), "Unexpected RENDER_MODE."
+    print("SIMULATION_HZ =", SIMULATION_HZ)
+    print("MAX_FRAME_TIME =", MAX_FRAME_TIME)
+    assert SIMULATION_HZ == 60, "Expected SIMULATION_HZ to be 60."
 
     # Test grid, cell, sprite dimensions and tolerance
     print("\nTesting grid, cell, sprite settings and grid tolerance:")
@@ -116,7 +150,9 @@ def main():
     print("IMAGE_GHOST_PATH =", IMAGE_GHOST_PATH)
     print("IMAGE_WALL_PATH =", IMAGE_WALL_PATH)
     print("SOUND_EFFECT_PATH =", SOUND_EFFECT_PATH)
-    for path in [IMAGE_PLAYER_PATH, IMAGE_GHOST_PATH, IMAGE_WALL_PATH, SOUND_EFFECT_PATH]:
+    print("LEVELS_DIR =", LEVELS_DIR)
+    print("LEVEL_CACHE_DIR =", LEVEL_CACHE_DIR)
+    for path in [IMAGE_PLAYER_PATH, IMAGE_GHOST_PATH, IMAGE_WALL_PATH, SOUND_EFFECT_PATH, LEVELS_DIR, LEVEL_CACHE_DIR]:
         assert isinstance(path, str) and path != "", "Asset paths should be non-empty strings."
 
     # Test audio asset file paths and volume settings
@@ -141,6 +177,8 @@ def main():
     assert PLAYER_SPEED > 0, "PLAYER_SPEED should be positive."
     assert GHOST_SPEED > 0, "GHOST_SPEED should be positive."
     assert GHOST_BEHAVIOR_TIMING > 0, "GHOST_BEHAVIOR_TIMING should be positive."
+    print("AI_BUDGET_MS =", AI_BUDGET_MS)
+    assert AI_BUDGET_MS > 0, "AI_BUDGET_MS should be positive."
 
     # Test HUD and UI settings
     print("\nTesting HUD and UI settings:")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+import pygame
+
+try:
+    from config import SPRITE_WIDTH, SPRITE_HEIGHT
+except Exception:
+    SPRITE_WIDTH = 32
+    SPRITE_HEIGHT = 32
+
+import game_objects
+
+class DirtyRectRenderer:
+    """
+    Redraws only the parts of the screen that changed since the last frame.
+
+    The static scene (the maze) lives in a background surface. Each frame, the background
+    is restored under the previous and current rect of every object that moved, the
+    objects are drawn, and render() returns those rects so the caller can present them
+    with pygame.display.update(rects) instead of flipping the whole screen.
+    """
+    def __init__(self, screen, sprite_size=(SPRITE_WIDTH, SPRITE_HEIGHT)):
+        self.screen = screen
+        self.sprite_size = sprite_size
+        self.background = None
+        self.previous = {}  # id(entity) -> Rect drawn last frame
+        self.full_redraw = True
+
+    def set_background(self, background):
+        """Use a new background surface; the next frame redraws the whole screen."""
+        self.background = background
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Force the next frame to redraw and present the whole screen."""
+        self.full_redraw = True
+
+    def entity_rect(self, entity, alpha=1.0):
+        """Screen rect covered by an object's sprite, centered on its (interpolated) position."""
+        if hasattr(entity, "interpolated_position"):
+            x, y = entity.interpolated_position(alpha)
+        else:
+            x, y = entity.position
+        rect = pygame.Rect((0, 0), self.sprite_size)
+        rect.center = (int(x), int(y))
+        return rect
+
+    @staticmethod
+    def _entries(objects):
+        # (key in objects, entity) pairs in the order draw_objects draws them.
+        entries = [("pacman", objects.get("pacman"))]
+        entries.extend(("ghosts", ghost) for ghost in objects.get("ghosts", []))
+        entries.append(("pellet", objects.get("pellet")))
+        entries.append(("bonus_item", objects.get("bonus_item")))
+        return [(key, entity) for key, entity in entries if entity]
+
+    def _entity_rects(self, entries, alpha):
+        return {id(entity): self.entity_rect(entity, alpha) for _, entity in entries}
+
+    def render(self, objects, changed_rects=(), alpha=1.0):
+        """
+        Draw one frame of objects (a dict as returned by game_objects.initialize_objects)
+        over the background, interpolated by alpha between their last two simulation states.
+        changed_rects are areas of the background that changed since the last frame,
+        e.g. eaten pellets. Returns the list of screen rects to present.
+        """
+        screen = self.screen
+        entries = self._entries(objects)
+        current = self._entity_rects(entries, alpha)
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            game_objects.draw_objects(screen, objects, alpha)
+            self.previous = current
+            self.full_redraw = False
+            return [screen.get_rect()]
+
+        dirty = [pygame.Rect(rect) for rect in changed_rects]
+        previous = self.previous
+        for key, rect in current.items():
+            old = previous.get(key)
+            if old is None:
+                dirty.append(rect)
+            elif old != rect:
+                # Small moves overlap the old rect; presenting their union is one rect instead of two.
+                dirty.extend([old.union(rect)] if old.colliderect(rect) else [old, rect])
+        for key, old in previous.items():
+            if key not in current:
+                dirty.append(old)
+        self.previous = current
+        if not dirty:
+            return []
+
+        background = self.background
+        screen.blits([(background, rect, rect) for rect in dirty], doreturn=False)
+        # Redraw, clipped to each restored area, only the objects overlapping it: sprites
+        # elsewhere are left untouched instead of being blended onto themselves again.
+        rects = [current[id(entity)] for _, entity in entries]
+        for rect in dirty:
+            hits = rect.collidelistall(rects)
+            if not hits:
+                continue
+            overlapping = {"ghosts": []}
+            for index in hits:
+                key, entity = entries[index]
+                if key == "ghosts":
+                    overlapping["ghosts"].append(entity)
+                else:
+                    overlapping[key] = entity
+            screen.set_clip(rect)
+            game_objects.draw_objects(screen, overlapping, alpha)
+        screen.set_clip(None)
+        return dirty
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((320, 240))
+    background = pygame.Surface(screen.get_size())
+    background.fill((0, 0, 80))
+    renderer = DirtyRectRenderer(screen)
+    renderer.set_background(background)
+    objects = game_objects.initialize_objects()
+    for index, ghost in enumerate(objects["ghosts"]):
+        ghost.position = (60 + index * 50, 150)
+    objects["pacman"].position = (40, 40)
+    objects["pellet"].position = (200, 40)
+    objects["bonus_item"].position = (280, 200)
+
+    # The first frame presents the whole screen.
+    assert renderer.render(objects) == [screen.get_rect()], "First frame should redraw the whole screen."
+
+    # Nothing moved: nothing to present.
+    assert renderer.render(objects) == [], "A static scene should produce no dirty rects."
+
+    # One object moved a little: one merged rect around its old and new position.
+    pacman = objects["pacman"]
+    pacman.position = (44, 40)
+    dirty = renderer.render(objects)
+    assert len(dirty) == 1, "A small move should produce one merged dirty rect."
+    assert dirty[0].contains(renderer.entity_rect(pacman)), "Dirty rect should cover the new sprite."
+    assert dirty[0].collidepoint(40 - SPRITE_WIDTH // 2, 40), "Dirty rect should cover the old sprite."
+    assert tuple(screen.get_at((40 - SPRITE_WIDTH // 2, 40)))[:3] == (0, 0, 80), "Background should be restored behind a moved sprite."
+
+    # A jump produces separate rects; changed background areas are presented too.
+    pacman.position = (160, 100)
+    background.fill((255, 255, 255), pygame.Rect(0, 220, 10, 10))
+    dirty = renderer.render(objects, [pygame.Rect(0, 220, 10, 10)])
+    assert len(dirty) == 3, "A jump should produce the changed area plus the old and new sprite rects."
+    assert tuple(screen.get_at((5, 225)))[:3] == (255, 255, 255), "Changed background should be copied to the screen."
+    covered = sum(rect.width * rect.height for rect in dirty)
+    assert covered * 10 < screen.get_width() * screen.get_height(), "Dirty rects should cover a small part of the screen."
+
+    # Removed objects leave their rect dirty.
+    removed = objects.pop("bonus_item")
+    dirty = renderer.render(objects)
+    assert dirty == [renderer.entity_rect(removed)], "Removed object should be erased."
+
+    # Sprites away from the dirty areas are not redrawn: translucent pixels of an unmoved
+    # sprite stay the same however many frames are rendered.
+    import texture_atlas
+    translucent = texture_atlas.TextureAtlas()
+    for name in [("player", direction) for direction in ((1, 0), (-1, 0), (0, 1), (0, -1))] + [("ghost", False), ("ghost", True), "pellet", "bonus"]:
+        image = pygame.Surface((SPRITE_WIDTH, SPRITE_HEIGHT), pygame.SRCALPHA)
+        image.fill((255, 255, 255, 96))
+        translucent.add(name, image)
+    translucent.pack()
+    game_objects.atlas = translucent
+    try:
+        renderer.invalidate()
+        renderer.render(objects)
+        ghost = objects["ghosts"][0]
+        probe = ghost.position
+        before = screen.get_at(probe)
+        for step in range(1, 6):
+            pacman.position = (160 + step * 2, 100)
+            assert renderer.render(objects), "A moving object should produce dirty rects."
+            assert screen.get_at(probe) == before, "An unmoved sprite should not be drawn over itself again."
+    finally:
+        game_objects.atlas = None
+
+    renderer.invalidate()
+    assert renderer.render(objects) == [screen.get_rect()], "Invalidated renderer should redraw the whole screen."
+    pygame.display.update(dirty)
+
+    print("All dirty renderer tests passed.")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
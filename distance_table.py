@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import deque
+
+from maze import Maze, FLAG_BLOCKED, FLAG_TUNNEL, TUNNEL_WRAP_COST
+
+# Distance table file layout (all integers little-endian):
+#   header   magic, version, walkable tile count, maze rows, maze cols, maze digest
+#   tiles    uint32 flat index of each walkable tile, in dense order
+#   table    uint16 distances, count * count entries, row-major by start tile
+TABLE_MAGIC = b"PMZD"
+TABLE_VERSION = 1
+TABLE_SUFFIX = ".dist"
+HEADER = struct.Struct("<4sHHIII32s")
+UNREACHABLE = 0xFFFF
+
+def maze_digest(maze):
+    """Hash of the maze's walls and tunnels, which are all that distances depend on."""
+    mask = FLAG_BLOCKED | FLAG_TUNNEL
+    return hashlib.sha256(bytes(tile & mask for tile in maze.tiles)).digest()
+
+def estimate_size(maze):
+    """Return the size in bytes a distance table for this maze would take."""
+    count = sum(1 for tile in maze.tiles if not tile & FLAG_BLOCKED)
+    return count * count * 2
+
+def table_path_for(level_path):
+    """Return the distance table path stored next to a level file."""
+    return os.path.splitext(level_path)[0] + TABLE_SUFFIX
+
+class DistanceTable:
+    """Exact maze distances between every pair of walkable tiles.
+
+    Distances are in steps; walking through a tunnel wrap costs TUNNEL_WRAP_COST, the
+    same as in maze_graph and pathfinding. Lookups are O(1) once the table is built or loaded.
+    """
+    def __init__(self, rows, cols, tile_indices, distances, digest, build_seconds=0.0):
+        self.rows = rows
+        self.cols = cols
+        self.tile_indices = tile_indices  # dense id -> flat tile index
+        self.dense = {index: dense for dense, index in enumerate(tile_indices)}
+        self.count = len(tile_indices)
+        self.distances = distances
+        self.digest = digest
+        self.build_seconds = build_seconds
+
+    @classmethod
+    def build(cls, maze):
+        """Run a breadth-first search from every walkable tile and return the filled table."""
+        started = time.perf_counter()
+        cols = maze.cols
+        tile_indices = [index for index, tile in enumerate(maze.tiles) if not tile & FLAG_BLOCKED]
+        dense = {index: i for i, index in enumerate(tile_indices)}
+        count = len(tile_indices)
+        # Neighbor lists in dense ids; wrap-around steps are kept apart because they cost TUNNEL_WRAP_COST.
+        steps = []
+        wraps = []
+        for index in tile_indices:
+            row, col = divmod(index, cols)
+            partner = maze.tunnel_partner(row, col)
+            steps.append([dense[r * cols + c] for r, c in maze.open_neighbors(row, col) if (r, c) != partner])
+            wraps.append([dense[partner[0] * cols + partner[1]]] if partner is not None else [])
+        distances = array("H", [UNREACHABLE]) * (count * count)
+        for source in range(count):
+            base = source * count
+            distances[base + source] = 0
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                distance = distances[base + current]
+                for neighbor in wraps[current]:
+                    if distance + TUNNEL_WRAP_COST < distances[base + neighbor]:
+                        distances[base + neighbor] = distance + TUNNEL_WRAP_COST
+                        if TUNNEL_WRAP_COST:
+                            queue.append(neighbor)
+                        else:
+                            queue.appendleft(neighbor)
+                for neighbor in steps[current]:
+                    if distance + 1 < distances[base + neighbor]:
+                        distances[base + neighbor] = distance + 1
+                        queue.append(neighbor)
+        return cls(maze.rows, cols, tile_indices, distances, maze_digest(maze),
+                   time.perf_counter() - started)
+
+    @property
+    def nbytes(self):
+        """Size of the distance data in bytes."""
+        return len(self.distances) * self.distances.itemsize
+
+    def report(self):
+        """Return a one-line summary of the table's size and build time."""
+        return (f"Distance table: {self.count} walkable tiles, {self.nbytes / 1024:.1f} KiB, "
+                f"built in {self.build_seconds * 1000:.1f} ms")
+
+    def distance(self, start, goal):
+        """Return the maze distance between two (row, col) cells, or None if either
+           is not walkable or goal cannot be reached from start."""
+        start_id = self.dense.get(start[0] * self.cols + start[1])
+        goal_id = self.dense.get(goal[0] * self.cols + goal[1])
+        if start_id is None or goal_id is None:
+            return None
+        distance = self.distances[start_id * self.count + goal_id]
+        return None if distance == UNREACHABLE else distance
+
+    def matches(self, maze):
+        """Return True if this table was built for the walls and tunnels of maze."""
+        return (self.rows, self.cols) == (maze.rows, maze.cols) and self.digest == maze_digest(maze)
+
+    def save(self, path):
+        """Write the table to path, through a temporary file renamed into place."""
+        indices = array("I", self.tile_indices)
+        distances = array("H", self.distances)
+        if sys.byteorder != "little":
+            indices.byteswap()
+            distances.byteswap()
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(HEADER.pack(TABLE_MAGIC, TABLE_VERSION, 0, self.count, self.rows, self.cols, self.digest))
+            handle.write(indices.tobytes())
+            handle.write(distances.tobytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a table written by save(). Returns None if the file is missing or invalid."""
+        try:
+            with open(path, "rb") as handle:
+                data = handle.read()
+        except OSError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, version, _, count, rows, cols, digest = HEADER.unpack_from(data)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            return None
+        indices_end = HEADER.size + 4 * count
+        if len(data) != indices_end + 2 * count * count:
+            return None
+        indices = array("I")
+        indices.frombytes(data[HEADER.size:indices_end])
+        distances = array("H")
+        distances.frombytes(data[indices_end:])
+        if sys.byteorder != "little":
+            indices.byteswap()
+            distances.byteswap()
+        return cls(rows, cols, list(indices), distances, digest)
+
+def load_or_build(level_path, maze):
+    """Return the distance table stored next to a level, building and saving it
+       if it is missing or was built for a different layout."""
+    path = table_path_for(level_path)
+    table = DistanceTable.load(path)
+    if table is not None and table.matches(maze):
+        return table
+    table = DistanceTable.build(maze)
+    try:
+        table.save(path)
+    except OSError as e:
+        print("Warning: Could not save distance table:", e)
+    return table
+
+def main():
+    import tempfile
+
+    maze = Maze()
+    table = DistanceTable.build(maze)
+    print(table.report())
+    assert table.nbytes == estimate_size(maze), "Table size should match the estimate."
+
+    # Distances agree with the junction graph, including the tunnel wrap.
+    import maze_graph
+    graph = maze_graph.build_graph(maze)
+    for start_index in table.tile_indices:
+        start = divmod(start_index, maze.cols)
+        for goal_index in table.tile_indices:
+            goal = divmod(goal_index, maze.cols)
+            assert table.distance(start, goal) == graph.shortest_path(start, goal)[0], f"Distance mismatch {start} -> {goal}."
+    assert table.distance((1, 0), (1, 9)) == TUNNEL_WRAP_COST, "Tunnel wrap cost mismatch."
+    assert table.distance((1, 1), (3, 1)) == 2, "Corridor distance mismatch."
+    assert table.distance((0, 0), (1, 1)) is None, "Walls have no distance."
+
+    # Disconnected areas are unreachable.
+    split = Maze(["WWWWW", "W W W", "WWWWW"])
+    assert DistanceTable.build(split).distance((1, 1), (1, 3)) is None, "Disconnected tiles should be unreachable."
+
+    # Saving and loading round-trips; a changed layout forces a rebuild.
+    with tempfile.TemporaryDirectory() as directory:
+        level_path = os.path.join(directory, "level.txt")
+        first = load_or_build(level_path, maze)
+        assert os.path.exists(table_path_for(level_path)), "Distance table was not saved next to the level."
+        loaded = DistanceTable.load(table_path_for(level_path))
+        assert loaded is not None and loaded.matches(maze), "Loaded table should match the maze."
+        assert list(loaded.distances) == list(first.distances), "Loaded distances mismatch."
+        other = Maze(["WWWWWW", "T    T", "WWWWWW"])
+        assert not loaded.matches(other), "Table should not match a different layout."
+        rebuilt = load_or_build(level_path, other)
+        assert rebuilt.matches(other) and rebuilt.distance((1, 1), (1, 4)) == 2, "Table should be rebuilt for a new layout."
+
+    print("All distance table tests passed.")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import pygame
 import sys
+import time
 import config
 import maze
 import game_objects
@@ -10,6 +11,10 @@ import input_handler
 import audio
 import ui
 import state_manager
+import asset_manager
+import texture_atlas
+import dirty_renderer
+import ai_planner
 
 class Game:
     def __init__(self):
@@ -27,9 +32,32 @@ class Game:
         self.audio = audio
         self.ui = ui
         self.state_manager = state_manager
+        # Sprites are loaded and scaled once, then reused every frame.
+        self.game_objects.asset_manager = asset_manager.AssetManager()
+        # Pack every sprite and maze tile into one atlas so each frame is drawn in batched blits.
+        self.atlas = texture_atlas.build_sprite_atlas(self.game_objects.asset_manager, self.ui.Maze)
+        self.game_objects.atlas = self.atlas
+        self.ui.Maze.atlas = self.atlas
+        self.ui.UIManager.atlas = self.atlas
+
+        # Level and objects drawn each frame
+        self.level = self.ui.initialize_maze()
+        self.objects = self.game_objects.initialize_objects()
+        self.render_mode = config.RENDER_MODE
+        # Ghost planning runs on a background thread; each tick applies its latest
+        # decisions and hands it a fresh snapshot without waiting for it.
+        self.ai_planner = ai_planner.AIPlanner(self.level, self.maze.TILE_SIZE)
+        self.ai_planner.start()
+        self.renderer = dirty_renderer.DirtyRectRenderer(self.screen)
         
         # Setup clock for frame rate control
         self.clock = pygame.time.Clock()
+
+        # Fixed-timestep simulation: real time is accumulated and consumed in ticks of
+        # sim_step seconds; alpha is how far rendering is between the last two ticks.
+        self.sim_step = 1.0 / config.SIMULATION_HZ
+        self.accumulator = 0.0
+        self.alpha = 1.0
         
         # Game running flag
         self.running = True
@@ -42,21 +70,63 @@ class Game:
             if result and result.get("action") == "quit":
                 self.running = False
 
-    def update(self):
+    def update(self, delta_time=None):
+        # Advance the simulation by one tick of delta_time seconds (sim_step by default).
+        if delta_time is None:
+            delta_time = self.sim_step
+        ghosts = self.objects.get("ghosts", [])
+        self.ai_planner.apply(ghosts)
+        self.game_objects.update_objects(self.objects, self.level)
+        if self.objects.get("pacman"):
+            self.ai_planner.submit(ghosts, self.objects["pacman"])
         # Delegate game state updating to state_manager, if available.
         if hasattr(self.state_manager, "update") and callable(self.state_manager.update):
-            # Pass 0 as delta_time for testing purposes
-            self.state_manager.update(0)
+            self.state_manager.update(delta_time)
 
-    def render(self):
-        # Clear screen
-        self.screen.fill((0, 0, 0))
-        # Render maze, game objects and UI if their draw methods are available.
+    def advance(self, frame_time):
+        # Add a frame's real time to the accumulator and run as many whole simulation
+        # ticks as it holds. Returns the number of ticks run.
+        self.accumulator += min(frame_time, config.MAX_FRAME_TIME)
+        ticks = 0
+        while self.accumulator >= self.sim_step:
+            self.update(self.sim_step)
+            self.check_collisions()
+            self.accumulator -= self.sim_step
+            ticks += 1
+        self.alpha = self.accumulator / self.sim_step
+        return ticks
+
+    def draw_background(self, surface):
+        # Draw the static part of the scene: the level and any module draw hooks.
+        surface.fill((0, 0, 0))
+        self.level.draw(surface)
         for module in [self.maze, self.game_objects, self.ui]:
             if hasattr(module, "draw") and callable(module.draw):
-                module.draw(self.screen)
+                module.draw(surface)
+
+    def render(self):
+        if self.render_mode == "dirty":
+            self.render_dirty()
+            return
+        # Clear screen and render maze, game objects and UI.
+        self.draw_background(self.screen)
+        self.game_objects.draw_objects(self.screen, self.objects, self.alpha)
         pygame.display.flip()
 
+    def render_dirty(self):
+        # Restore the background only under moved objects and present just those areas.
+        if self.renderer.background is None:
+            background = pygame.Surface(self.screen.get_size())
+            self.draw_background(background)
+            self.renderer.set_background(background)
+            changed = []
+        else:
+            # Eaten pellets are patched into the background and presented with the objects.
+            changed = self.level.draw(self.renderer.background, full=False)
+        dirty_rects = self.renderer.render(self.objects, changed, self.alpha)
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+
     def check_collisions(self):
         # Delegate collision checking to collision module, if available.
         if hasattr(self.collision, "check_collisions") and callable(self.collision.check_collisions):
@@ -68,7 +138,9 @@ class Game:
             self.audio.play_background()
 
     def run(self):
-        # Main game loop
+        # Main game loop: the simulation ticks at config.SIMULATION_HZ whatever the
+        # frame rate, and each frame renders interpolated between the last two ticks.
+        previous_time = time.perf_counter()
         while self.running:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -77,11 +149,13 @@ class Game:
                     if event.key == pygame.K_ESCAPE:
                         self.running = False
             self.process_input()
-            self.update()
-            self.check_collisions()
+            now = time.perf_counter()
+            self.advance(now - previous_time)
+            previous_time = now
             self.play_audio()
             self.render()
             self.clock.tick(config.FPS)
+        self.ai_planner.stop()
         pygame.quit()
 
 def main():
@@ -113,6 +187,28 @@ def main():
         game_instance.render()
     except Exception as e:
         assert False, "render method failed: " + str(e)
+
+    # Test both render modes; an unchanged scene leaves nothing to present in dirty mode.
+    game_instance.render_mode = "full"
+    game_instance.render()
+    game_instance.render_mode = "dirty"
+    game_instance.render()
+    assert game_instance.renderer.render(game_instance.objects) == [], "Unchanged frame should have no dirty rects."
+    game_instance.render_mode = config.RENDER_MODE
+
+    # Test the fixed-timestep accumulator: ticks depend on elapsed time, not on frames.
+    game_instance.accumulator = 0.0
+    step = game_instance.sim_step
+    assert game_instance.advance(step * 0.5) == 0, "Half a tick of time should not run a tick."
+    assert abs(game_instance.alpha - 0.5) < 1e-9, "Alpha should be the leftover fraction of a tick."
+    assert game_instance.advance(step * 2.0) == 2, "Two and a half ticks of time should run two ticks."
+    assert game_instance.advance(10.0) == int(config.MAX_FRAME_TIME / step), "Long frames should be clamped."
+    game_instance.render()
+
+    # Every tick hands the background AI planner a snapshot.
+    submitted = game_instance.ai_planner._tick
+    game_instance.update()
+    assert game_instance.ai_planner._tick == submitted + 1, "Each update should submit a snapshot to the AI planner."
     
     # Test check_collisions method
     try:
@@ -1,5 +1,10 @@
 import pygame
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 try:
     import config
 except SyntaxError:
@@ -12,83 +17,266 @@ except SyntaxError:
 
 from maze import Maze
 
-class PacMan:
-    def __init__(self, position, direction, lives=3, score=0):
-        self.position = position  # tuple (x, y)
-        self.direction = direction  # tuple (dx, dy)
-        self.lives = lives
-        self.score = score
+# Ghost state names by the code stored in EntityStore.state. Any other state name is
+# given the next code the first time it is assigned.
+GHOST_STATES = ["normal", "vulnerable"]
+_GHOST_STATE_CODES = {state: code for code, state in enumerate(GHOST_STATES)}
+
+def ghost_state_code(state):
+    """Return the code stored for a ghost state name, adding new names on demand."""
+    code = _GHOST_STATE_CODES.get(state)
+    if code is None:
+        code = _GHOST_STATE_CODES[state] = len(GHOST_STATES)
+        GHOST_STATES.append(state)
+    return code
+
+# Ghost kind ids, used by ghost_ai to look up each ghost's strategy.
+GHOST_KIND_BLINKY = 0
+GHOST_KIND_PINKY = 1
+GHOST_KIND_INKY = 2
+GHOST_KIND_CLYDE = 3
+
+# AssetManager used to draw sprites; when None, objects are drawn as plain shapes.
+asset_manager = None
+
+# texture_atlas.TextureAtlas holding every object sprite; when set, draw_objects()
+# submits the whole frame as one Surface.blits() batch.
+atlas = None
+
+class EntityStore:
+    """
+    Struct-of-arrays storage for entity positions, directions, speeds and states.
+    Entities created with a store become views over one row of these arrays, and
+    move_all() moves every stored entity in a single vectorized update.
+    prev_x and prev_y hold the positions saved at the start of the last simulation tick.
+    Uses NumPy arrays when NumPy is installed and plain lists otherwise.
+    """
+    FIELDS = ("x", "y", "dx", "dy", "speed", "state", "prev_x", "prev_y")
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.count = 0
+        for field in self.FIELDS:
+            setattr(self, field, self._allocate(capacity))
+
+    @staticmethod
+    def _allocate(size):
+        if np is not None:
+            return np.zeros(size, dtype=np.float64)
+        return [0.0] * size
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        for field in self.FIELDS:
+            old = getattr(self, field)
+            new = self._allocate(capacity)
+            new[:self.count] = old[:self.count]
+            setattr(self, field, new)
+        self.capacity = capacity
+
+    def add(self, position, direction=(0, 0), speed=0.0, state=0):
+        """Append an entity row and return its index."""
+        if self.count == self.capacity:
+            self._grow()
+        row = self.count
+        self.x[row], self.y[row] = position
+        self.prev_x[row], self.prev_y[row] = position
+        self.dx[row], self.dy[row] = direction
+        self.speed[row] = speed
+        self.state[row] = state
+        self.count += 1
+        return row
+
+    def get_position(self, row):
+        """Return the (x, y) of a row."""
+        return (float(self.x[row]), float(self.y[row]))
+
+    def set_position(self, row, position):
+        """Set the (x, y) of a row."""
+        self.x[row], self.y[row] = position
+
+    def save_positions(self):
+        """Copy every current position into prev_x and prev_y before a simulation tick."""
+        count = self.count
+        self.prev_x[:count] = self.x[:count]
+        self.prev_y[:count] = self.y[:count]
+
+    def move_all(self):
+        """Advance every stored entity by direction * speed."""
+        count = self.count
+        if np is not None:
+            self.x[:count] += self.dx[:count] * self.speed[:count]
+            self.y[:count] += self.dy[:count] * self.speed[:count]
+            return
+        x, y, dx, dy, speed = self.x, self.y, self.dx, self.dy, self.speed
+        for row in range(count):
+            x[row] += dx[row] * speed[row]
+            y[row] += dy[row] * speed[row]
+
+class StoredEntity:
+    """
+    Base for game objects that can live in an EntityStore.
+    Without a store the entity keeps its own attributes; with one, position, direction
+    and speed read and write the entity's row of the store.
+    """
+    def _bind(self, store, position, direction, speed, state=0):
+        self.store = store
+        if store is None:
+            self._position = position
+            self._prev_position = position
+            self._direction = direction
+            self._speed = speed
+            self._state = state
+            self.row = None
+        else:
+            self.row = store.add(position, direction, speed, state)
+
+    @property
+    def position(self):
+        if self.store is None:
+            return self._position
+        return self.store.get_position(self.row)
+
+    @position.setter
+    def position(self, value):
+        if self.store is None:
+            self._position = value
+        else:
+            self.store.set_position(self.row, value)
+
+    @property
+    def prev_position(self):
+        # Position saved by the last save_position() call, i.e. at the start of the last tick.
+        if self.store is None:
+            return self._prev_position
+        return (float(self.store.prev_x[self.row]), float(self.store.prev_y[self.row]))
+
+    def save_position(self):
+        """Remember the current position as the start of the next simulation tick.
+           Calling it again after a teleport (e.g. a tunnel wrap) skips interpolating across the jump."""
+        if self.store is None:
+            self._prev_position = self._position
+        else:
+            self.store.prev_x[self.row] = self.store.x[self.row]
+            self.store.prev_y[self.row] = self.store.y[self.row]
+
+    def interpolated_position(self, alpha):
+        """Position between the last two simulation states; alpha 0 is the previous one, 1 the current one."""
+        previous = self.prev_position
+        current = self.position
+        return (previous[0] + (current[0] - previous[0]) * alpha,
+                previous[1] + (current[1] - previous[1]) * alpha)
+
+    @property
+    def direction(self):
+        if self.store is None:
+            return self._direction
+        return (float(self.store.dx[self.row]), float(self.store.dy[self.row]))
+
+    @direction.setter
+    def direction(self, value):
+        if self.store is None:
+            self._direction = value
+        else:
+            self.store.dx[self.row], self.store.dy[self.row] = value
+
+    @property
+    def speed(self):
+        if self.store is None:
+            return self._speed
+        return float(self.store.speed[self.row])
+
+    @speed.setter
+    def speed(self, value):
+        if self.store is None:
+            self._speed = value
+        else:
+            self.store.speed[self.row] = value
 
     def move(self):
-        new_x = self.position[0] + self.direction[0] * config.PLAYER_SPEED
-        new_y = self.position[1] + self.direction[1] * config.PLAYER_SPEED
-        self.position = (new_x, new_y)
+        if self.store is None:
+            new_x = self._position[0] + self._direction[0] * self._speed
+            new_y = self._position[1] + self._direction[1] * self._speed
+            self._position = (new_x, new_y)
+        else:
+            store = self.store
+            row = self.row
+            store.x[row] += store.dx[row] * store.speed[row]
+            store.y[row] += store.dy[row] * store.speed[row]
+
+class PacMan(StoredEntity):
+    def __init__(self, position, direction, lives=3, score=0, store=None):
+        # position is a tuple (x, y), direction a tuple (dx, dy)
+        self._bind(store, position, direction, config.PLAYER_SPEED)
+        self.lives = lives
+        self.score = score
 
     def update(self, maze):
         self.move()
 
-    def draw(self, surface=None):
-        # Draw PacMan as a yellow circle
-        if surface is not None:
-            pygame.draw.circle(surface, (255, 255, 0), (int(self.position[0]), int(self.position[1])), config.SPRITE_WIDTH // 2)
+    def draw(self, surface=None, alpha=1.0):
+        # Draw PacMan from the cached sprite facing his direction, or as a yellow circle
+        x, y = self.interpolated_position(alpha)
+        if surface is not None and asset_manager is not None:
+            sprite = asset_manager.player_sprite(self.direction)
+            surface.blit(sprite, sprite.get_rect(center=(int(x), int(y))))
+        elif surface is not None:
+            pygame.draw.circle(surface, (255, 255, 0), (int(x), int(y)), config.SPRITE_WIDTH // 2)
         return f"PacMan drawn at {self.position} with sprite width {config.SPRITE_WIDTH}"
 
-class Ghost:
-    def __init__(self, position, state="normal", speed=None):
-        self.position = position  # tuple (x, y)
-        self.state = state  # "normal" or "vulnerable"
-        self.speed = speed if speed is not None else config.GHOST_SPEED
+class Ghost(StoredEntity):
+    # Direction each ghost type moves in, as (dx, dy).
+    MOVE_DIRECTION = (1, 0)
+    # Kind id selecting the ghost's AI strategy; None for ghosts without one.
+    KIND = None
 
-    def move(self):
-        new_x = self.position[0] + self.speed
-        new_y = self.position[1]
-        self.position = (new_x, new_y)
+    def __init__(self, position, state="normal", speed=None, store=None):
+        speed = speed if speed is not None else config.GHOST_SPEED
+        self._bind(store, position, self.MOVE_DIRECTION, speed, ghost_state_code(state))
+
+    @property
+    def state(self):
+        # "normal", "vulnerable" or any other state name assigned to a ghost
+        if self.store is None:
+            return GHOST_STATES[self._state]
+        return GHOST_STATES[int(self.store.state[self.row])]
+
+    @state.setter
+    def state(self, value):
+        if self.store is None:
+            self._state = ghost_state_code(value)
+        else:
+            self.store.state[self.row] = ghost_state_code(value)
 
     def update(self, maze):
         self.move()
 
-    def draw(self, surface=None):
+    def draw(self, surface=None, alpha=1.0):
         # Draw Ghost as a circle: blue if vulnerable, otherwise red.
         color = (0, 0, 255) if self.state == "vulnerable" else (255, 0, 0)
-        if surface is not None:
-            pygame.draw.circle(surface, color, (int(self.position[0]), int(self.position[1])), config.SPRITE_WIDTH // 2)
+        x, y = self.interpolated_position(alpha)
+        if surface is not None and asset_manager is not None:
+            sprite = asset_manager.ghost_sprite(self.state == "vulnerable")
+            surface.blit(sprite, sprite.get_rect(center=(int(x), int(y))))
+        elif surface is not None:
+            pygame.draw.circle(surface, color, (int(x), int(y)), config.SPRITE_WIDTH // 2)
         return f"Ghost drawn at {self.position} with color {'blue' if self.state == 'vulnerable' else 'red'} and sprite width {config.SPRITE_WIDTH}"
 
 class Blinky(Ghost):
-    def __init__(self, position, state="normal", speed=None):
-        super().__init__(position, state, speed)
-
-    def move(self):
-        new_x = self.position[0] + self.speed
-        new_y = self.position[1]
-        self.position = (new_x, new_y)
+    MOVE_DIRECTION = (1, 0)
+    KIND = GHOST_KIND_BLINKY
 
 class Pinky(Ghost):
-    def __init__(self, position, state="normal", speed=None):
-        super().__init__(position, state, speed)
-
-    def move(self):
-        new_x = self.position[0]
-        new_y = self.position[1] + self.speed
-        self.position = (new_x, new_y)
+    MOVE_DIRECTION = (0, 1)
+    KIND = GHOST_KIND_PINKY
 
 class Inky(Ghost):
-    def __init__(self, position, state="normal", speed=None):
-        super().__init__(position, state, speed)
-
-    def move(self):
-        new_x = self.position[0] + self.speed
-        new_y = self.position[1] + self.speed
-        self.position = (new_x, new_y)
+    MOVE_DIRECTION = (1, 1)
+    KIND = GHOST_KIND_INKY
 
 class Clyde(Ghost):
-    def __init__(self, position, state="normal", speed=None):
-        super().__init__(position, state, speed)
-
-    def move(self):
-        new_x = self.position[0] - self.speed
-        new_y = self.position[1]
-        self.position = (new_x, new_y)
+    MOVE_DIRECTION = (-1, 0)
+    KIND = GHOST_KIND_CLYDE
 
 class Pellet:
     def __init__(self, position):
@@ -116,22 +304,53 @@ class BonusItem:
             pygame.draw.rect(surface, (0, 255, 0), rect)
         return f"BonusItem drawn at {self.position}. Collected: {self.collected}"
 
-def draw_objects(surface, objects):
-    # Draw all primary objects on the provided pygame surface
+def _centered(name, position):
+    # Atlas entry and top-left destination that center the sprite on position.
+    rect = atlas.rects[name]
+    return name, (int(position[0]) - rect.width // 2, int(position[1]) - rect.height // 2)
+
+def draw_objects(surface, objects, alpha=1.0):
+    # Draw all primary objects on the provided pygame surface. alpha interpolates moving
+    # objects between their previous and current simulation positions.
     pacman = objects.get("pacman")
     ghosts = objects.get("ghosts", [])
     pellet = objects.get("pellet")
     bonus_item = objects.get("bonus_item")
 
+    if atlas is not None:
+        items = []
+        if pacman:
+            direction = (pacman.direction[0], pacman.direction[1])
+            name = ("player", direction if ("player", direction) in atlas else (1, 0))
+            items.append(_centered(name, pacman.interpolated_position(alpha)))
+        for ghost in ghosts:
+            items.append(_centered(("ghost", ghost.state == "vulnerable"), ghost.interpolated_position(alpha)))
+        if pellet:
+            items.append(_centered("pellet", pellet.position))
+        if bonus_item:
+            items.append(_centered("bonus", bonus_item.position))
+        atlas.draw(surface, items)
+        return
+
     if pacman:
-        pacman.draw(surface)
+        pacman.draw(surface, alpha)
     for ghost in ghosts:
-        ghost.draw(surface)
+        ghost.draw(surface, alpha)
     if pellet:
         pellet.draw(surface)
     if bonus_item:
         bonus_item.draw(surface)
 
+def update_objects(objects, maze):
+    # Advance PacMan and the ghosts by one simulation tick, keeping their previous
+    # positions so rendering can interpolate between the two states.
+    movers = list(objects.get("ghosts", []))
+    if objects.get("pacman"):
+        movers.insert(0, objects["pacman"])
+    for entity in movers:
+        entity.save_position()
+        entity.update(maze)
+
 def initialize_objects():
     pacman = PacMan(position=(0, 0), direction=(1, 0), lives=3, score=0)
     ghosts = [
@@ -232,6 +451,69 @@ def main():
     # Wait briefly so we can see the window (for demonstration purposes only)
     pygame.time.wait(500)
     
+    # Test the struct-of-arrays entity store.
+    store = EntityStore(capacity=2)
+    stored_pacman = PacMan(position=(0, 0), direction=(1, 0), store=store)
+    stored_ghosts = [cls(position=(10 * i, 10 * i), store=store) for i, cls in enumerate((Blinky, Pinky, Inky, Clyde))]
+    assert store.count == 5 and store.capacity >= 5, "Entity store should grow to hold all entities."
+    assert stored_ghosts[1].position == (10, 10), "Stored entity position mismatch."
+    store.move_all()
+    assert stored_pacman.position == (config.PLAYER_SPEED, 0), "move_all() did not move PacMan."
+    for ghost, (dx, dy) in zip(stored_ghosts, ((1, 0), (0, 1), (1, 1), (-1, 0))):
+        start = ghost.position
+        ghost.move()
+        assert ghost.position == (start[0] + dx * config.GHOST_SPEED, start[1] + dy * config.GHOST_SPEED), "Stored ghost move mismatch."
+    stored_ghosts[0].speed = 4.0
+    stored_ghosts[0].direction = (0, -1)
+    stored_ghosts[0].position = (100, 100)
+    store.move_all()
+    assert stored_ghosts[0].position == (100, 96), "Views should write through to the store."
+    stored_ghosts[2].state = "vulnerable"
+    assert stored_ghosts[2].state == "vulnerable" and "blue" in stored_ghosts[2].draw(), "Stored ghost state mismatch."
+    assert stored_ghosts[3].state == "normal", "Other ghosts should keep their state."
+
+    # Ghosts accept state names beyond "normal" and "vulnerable", stored or not.
+    stored_ghosts[1].state = "eaten"
+    assert stored_ghosts[1].state == "eaten", "Stored ghost should accept a new state name."
+    loose = Ghost(position=(0, 0), state="scatter")
+    assert loose.state == "scatter", "Ghost should accept any state name."
+    assert ghost_state_code("eaten") == ghost_state_code("eaten"), "State codes should be stable."
+
+    # Test drawing with cached sprites.
+    global asset_manager
+    import asset_manager as asset_module
+    asset_manager = asset_module.AssetManager()
+    screen.fill((0, 0, 0))
+    draw_objects(screen, objects)
+    assert asset_manager.player_sprite(pacman.direction) is asset_manager.player_sprite(pacman.direction), "Sprites should be cached between frames."
+    assert "blue" in ghosts[0].draw(screen), "Sprite drawing should keep the ghost state."
+
+    # Test batched drawing from a texture atlas.
+    global atlas
+    import texture_atlas
+    atlas = texture_atlas.build_sprite_atlas(asset_module.AssetManager())
+    screen.fill((0, 0, 0))
+    bonus.position = (300, 300)
+    draw_objects(screen, objects)
+    assert tuple(screen.get_at((300, 300)))[:3] == (0, 255, 0), "Bonus item should be drawn from the atlas."
+    atlas = None
+
+    # Test render interpolation between the last two simulation states.
+    tick_objects = {"pacman": PacMan(position=(100, 100), direction=(1, 0)),
+                    "ghosts": [Pinky(position=(50, 50), store=store)]}
+    update_objects(tick_objects, maze)
+    ticked_pacman = tick_objects["pacman"]
+    ticked_ghost = tick_objects["ghosts"][0]
+    assert ticked_pacman.prev_position == (100, 100), "update_objects() should save the previous position."
+    assert ticked_pacman.interpolated_position(0.0) == (100, 100), "Alpha 0 should give the previous position."
+    assert ticked_pacman.interpolated_position(1.0) == ticked_pacman.position, "Alpha 1 should give the current position."
+    assert ticked_pacman.interpolated_position(0.5) == (100 + config.PLAYER_SPEED / 2, 100), "Alpha 0.5 should be halfway."
+    assert ticked_ghost.interpolated_position(0.5) == (50, 50 + config.GHOST_SPEED / 2), "Stored entities should interpolate too."
+    ticked_ghost.position = (500, 50)
+    ticked_ghost.save_position()
+    assert ticked_ghost.interpolated_position(0.5) == (500, 50), "save_position() after a teleport should skip interpolation."
+    asset_manager = None
+
     print("All tests passed successfully.")
     pygame.quit()
 
@@ -1,7 +1,52 @@
+import heapq
+import itertools
 import random
 import math
+import time
 import config
 import game_objects
+import pathfinding
+from maze import EXIT_STEPS, EXIT_COUNTS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional exact maze distances (see distance_table.py), set by initialize_ai.
+distance_table = None
+
+# Optional pathfinding.PathCache for the current level, set by initialize_ai. When set,
+# update_ghosts turns each ghost's target into a direction along the maze corridors.
+path_cache = None
+
+# Junction tiles of the current level, as (row, col), set by initialize_ai.
+junction_tiles = frozenset()
+
+# maze.Maze of the current level, set by initialize_ai; its exit masks drive
+# update_ghosts_on_tile_entry.
+current_maze = None
+
+# Exit bit for each (dx, dy) direction, in the (x, y) order ghosts move in.
+EXIT_BY_DIRECTION = {(d_col, d_row): bit for bit, (d_row, d_col) in EXIT_STEPS}
+
+# pathfinding.FlowField towards Pac-Man's tile, shared by every ghost chasing him.
+# update_ghosts recomputes it once per tick, and only when Pac-Man changes tile.
+flow_field = None
+
+def position_to_tile(position):
+    """Convert an (x, y) position in tile units to the (row, col) of the tile it is on."""
+    return (int(round(position[1])), int(round(position[0])))
+
+def maze_distance(position_a, position_b):
+    """Return the distance between two positions.
+       Uses the exact maze distance when a distance table is loaded and both positions
+       are on walkable tiles; otherwise falls back to the straight-line distance."""
+    if distance_table is not None:
+        distance = distance_table.distance(position_to_tile(position_a), position_to_tile(position_b))
+        if distance is not None:
+            return distance
+    return math.dist(position_a, position_b)
 
 def blinky_chase(ghost, pacman_position):
     """
@@ -34,7 +79,7 @@ def clyde_dual_behavior(ghost, pacman_position):
     """
     AI strategy for Clyde: if close to PacMan, scatter; otherwise, chase.
     """
-    distance = math.dist(ghost.position, pacman_position)
+    distance = maze_distance(ghost.position, pacman_position)
     if distance < config.CLYDE_BEHAVIOR_DISTANCE:
         ghost.target = config.CLYDE_SCATTER_POSITION
         ghost.speed = config.CLYDE_SPEED * 0.5  # slower speed when scattering
@@ -42,37 +87,329 @@ def clyde_dual_behavior(ghost, pacman_position):
         ghost.target = pacman_position
         ghost.speed = config.CLYDE_SPEED
 
+def next_step(tile, target, cache=None, field=None):
+    """Return the next tile from tile towards target. Targets on Pac-Man's tile are read
+       from the shared flow field; any other target, or a tile the field has no step
+       for, goes through the path cache. cache and field default to the module's
+       path_cache and flow_field."""
+    cache = cache if cache is not None else path_cache
+    field = field if field is not None else flow_field
+    if field is not None and target == field.goal:
+        step = field.next_tile(tile)
+        if step is not None:
+            return step
+    return cache.next_tile(tile, target)
+
+def steer_ghost(ghost, cache=None, field=None):
+    """
+    Point the ghost along the shortest maze path to its target.
+    When the ghost turns it is snapped onto the center of its tile, so it never
+    cuts a corner into a wall; a step through a tunnel moves it straight to the
+    partner tile. Ghosts that have reached their target stop.
+    """
+    tile = position_to_tile(ghost.position)
+    target = position_to_tile(ghost.target)
+    step = next_step(tile, target, cache, field)
+    if step is not None and abs(step[0] - tile[0]) + abs(step[1] - tile[1]) > 1:
+        ghost.position = (float(step[1]), float(step[0]))
+        if hasattr(ghost, "save_position"):
+            ghost.save_position()
+        tile = step
+        step = next_step(tile, target, cache, field)
+    if step is None or step == tile:
+        direction = (0, 0)
+    else:
+        direction = pathfinding.step_direction(tile, step)
+    if direction != tuple(ghost.direction):
+        ghost.position = (float(tile[1]), float(tile[0]))
+        ghost.direction = direction
+
+def frightened_flee(ghost, pacman_position):
+    """
+    Frightened mode: slow down and target the point mirrored away from PacMan.
+    """
+    ghost.speed = config.VULNERABLE_SPEED
+    dx = ghost.position[0] - pacman_position[0]
+    dy = ghost.position[1] - pacman_position[1]
+    ghost.target = (ghost.position[0] + dx, ghost.position[1] + dy)
+
+# Batched versions of the strategies above. Each takes an (N, 2) array of ghost positions
+# plus PacMan's position and direction, and returns (targets as an (N, 2) array, speeds
+# as an (N,) array) for N ghosts of one kind at once. They need NumPy.
+
+def blinky_chase_batch(positions, pacman_position, pacman_direction):
+    targets = np.broadcast_to(np.asarray(pacman_position, dtype=np.float64), positions.shape)
+    return targets, np.full(len(positions), config.BLINKY_SPEED)
+
+def pinky_ambush_batch(positions, pacman_position, pacman_direction):
+    target = np.asarray(pacman_position, dtype=np.float64) + 4 * np.asarray(pacman_direction, dtype=np.float64)
+    return np.broadcast_to(target, positions.shape), np.full(len(positions), config.PINKY_SPEED)
+
+def inky_unpredictable_batch(positions, pacman_position, pacman_direction):
+    # Offsets come from random in the same order inky_unpredictable draws them, so seeding
+    # random makes batched and per-ghost Inky pick the same targets.
+    randint = random.randint
+    offsets = np.array([(randint(-4, 4), randint(-4, 4)) for _ in range(len(positions))], dtype=np.float64)
+    return np.asarray(pacman_position, dtype=np.float64) + offsets, np.full(len(positions), config.INKY_SPEED)
+
+def clyde_dual_behavior_batch(positions, pacman_position, pacman_direction):
+    pacman = np.asarray(pacman_position, dtype=np.float64)
+    if distance_table is not None:
+        distances = np.array([maze_distance(position, pacman_position) for position in positions.tolist()])
+    else:
+        distances = np.hypot(positions[:, 0] - pacman[0], positions[:, 1] - pacman[1])
+    scatter = (distances < config.CLYDE_BEHAVIOR_DISTANCE)[:, None]
+    targets = np.where(scatter, np.asarray(config.CLYDE_SCATTER_POSITION, dtype=np.float64), pacman)
+    speeds = np.where(scatter[:, 0], config.CLYDE_SPEED * 0.5, config.CLYDE_SPEED)
+    return targets, speeds
+
+def frightened_flee_batch(positions, pacman_position, pacman_direction):
+    targets = 2 * positions - np.asarray(pacman_position, dtype=np.float64)
+    return targets, np.full(len(positions), config.VULNERABLE_SPEED)
+
+# Strategy registry: ghost kind id -> (per-ghost strategy(ghost, pacman), batched strategy).
+STRATEGIES = {}
+
+# Frightened mode applies to every kind, so it is kept apart from the registry.
+FRIGHTENED_STRATEGY = (lambda ghost, pacman: frightened_flee(ghost, pacman.position), frightened_flee_batch)
+
+# Groups of at least this many ghosts of one kind use the batched strategy when NumPy is available.
+BATCH_MIN_GHOSTS = 16
+
+def register_strategy(kind, strategy, batch_strategy=None):
+    """
+    Register the AI for a ghost kind id. strategy(ghost, pacman) sets one ghost's target
+    and speed; the optional batch_strategy(positions, pacman_position, pacman_direction)
+    returns targets and speeds for many ghosts of the kind at once.
+    """
+    STRATEGIES[kind] = (strategy, batch_strategy)
+
+register_strategy(game_objects.GHOST_KIND_BLINKY,
+                  lambda ghost, pacman: blinky_chase(ghost, pacman.position), blinky_chase_batch)
+register_strategy(game_objects.GHOST_KIND_PINKY,
+                  lambda ghost, pacman: pinky_ambush(ghost, pacman.position, pacman.direction), pinky_ambush_batch)
+register_strategy(game_objects.GHOST_KIND_INKY,
+                  lambda ghost, pacman: inky_unpredictable(ghost, pacman.position), inky_unpredictable_batch)
+register_strategy(game_objects.GHOST_KIND_CLYDE,
+                  lambda ghost, pacman: clyde_dual_behavior(ghost, pacman.position), clyde_dual_behavior_batch)
+
+def _apply_strategy(ghosts, pacman, strategy, batch_strategy):
+    if batch_strategy is not None and np is not None and len(ghosts) >= BATCH_MIN_GHOSTS:
+        positions = np.array([ghost.position for ghost in ghosts], dtype=np.float64)
+        targets, speeds = batch_strategy(positions, pacman.position, pacman.direction)
+        for ghost, target, speed in zip(ghosts, targets.tolist(), speeds.tolist()):
+            ghost.target = (target[0], target[1])
+            ghost.speed = speed
+    else:
+        for ghost in ghosts:
+            strategy(ghost, pacman)
+
 def update_ghosts(ghosts, pacman, power_pellet_active=False):
     """
     Update AI behavior for each ghost based on the current game state.
     
     If power_pellet_active is True, ghosts become vulnerable, their speed is adjusted,
     and they target positions away from PacMan.
-    Otherwise, each ghost uses its own strategy.
+    Otherwise, each ghost uses the strategy registered for its kind.
+    Large groups of one kind are updated together by the batched strategy.
+    With a path cache loaded, each ghost is then steered towards its target.
     """
+    if flow_field is not None:
+        flow_field.update(position_to_tile(pacman.position))
+    if power_pellet_active:
+        _apply_strategy(ghosts, pacman, *FRIGHTENED_STRATEGY)
+    else:
+        groups = {}
+        for ghost in ghosts:
+            groups.setdefault(ghost.KIND, []).append(ghost)
+        for kind, group in groups.items():
+            entry = STRATEGIES.get(kind)
+            if entry is not None:
+                _apply_strategy(group, pacman, *entry)
+    if path_cache is not None:
+        for ghost in ghosts:
+            steer_ghost(ghost)
+
+def plan_ghost(ghost, pacman, power_pellet_active=False, cache=None, field=None):
+    """Re-plan one ghost: set its target and speed with its strategy, then steer it.
+       cache and field replace the module's path_cache and flow_field, e.g. for a planner
+       that keeps its own."""
+    if power_pellet_active:
+        FRIGHTENED_STRATEGY[0](ghost, pacman)
+    else:
+        entry = STRATEGIES.get(ghost.KIND)
+        if entry is not None:
+            entry[0](ghost, pacman)
+    if cache is not None or path_cache is not None:
+        steer_ghost(ghost, cache, field)
+
+def entered_tile(ghost):
+    """Return the (row, col) tile the ghost has moved onto since the last call, or None
+       if it is still on the same tile."""
+    tile = position_to_tile(ghost.position)
+    if tile == getattr(ghost, "current_tile", None):
+        return None
+    ghost.current_tile = tile
+    return tile
+
+def follow_corridor(ghost, tile, mask):
+    """
+    Keep a ghost moving along a corridor or around a corner without consulting the AI.
+    Ghosts never reverse by choice, so on a tile with at most two exits the only way on
+    is the exit that is not behind the ghost; at a dead end it turns back.
+    """
+    direction = (int(ghost.direction[0]), int(ghost.direction[1]))
+    if mask & EXIT_BY_DIRECTION.get(direction, 0):
+        return
+    reverse = (-direction[0], -direction[1])
+    choices = [step for step, bit in EXIT_BY_DIRECTION.items() if mask & bit and step != reverse]
+    turn = choices[0] if choices else reverse
+    ghost.position = (float(tile[1]), float(tile[0]))
+    ghost.direction = turn
+
+def update_ghosts_on_tile_entry(ghosts, pacman, power_pellet_active=False, maze=None, cache=None, field=None):
+    """
+    Update ghosts from tile-entry events instead of every call.
+
+    A ghost only needs a decision when it moves onto a new tile where it has a choice:
+    a junction with three or more exits, or a tunnel. Those ghosts are re-planned like
+    in update_ghosts; ghosts entering corridor or corner tiles just follow the corridor,
+    and ghosts still on the same tile are skipped. Ghosts are also re-planned wherever
+    they are when their mode flips (power_pellet_active or their state changes), so they
+    can turn around on a frightened flip. Unlike update_ghosts, a ghost otherwise commits
+    to its corridor until the next junction, even if its target moves, as in the arcade
+    game. Stopped ghosts produce no events, so they are re-planned on every call until
+    they move again. maze, cache and field default to the module's current_maze, path_cache
+    and flow_field, set by initialize_ai(level=...). Returns the number of ghosts re-planned.
+    """
+    maze = maze if maze is not None else current_maze
+    field = field if field is not None else flow_field
+    if field is not None:
+        field.update(position_to_tile(pacman.position))
+    decisions = 0
     for ghost in ghosts:
-        if power_pellet_active:
-            ghost.speed = config.VULNERABLE_SPEED
-            dx = ghost.position[0] - pacman.position[0]
-            dy = ghost.position[1] - pacman.position[1]
-            ghost.target = (ghost.position[0] + dx, ghost.position[1] + dy)
+        mode = (power_pellet_active, getattr(ghost, "state", None))
+        flipped = getattr(ghost, "ai_mode", mode) != mode
+        ghost.ai_mode = mode
+        stopped = tuple(ghost.direction) == (0, 0)
+        tile = entered_tile(ghost)
+        if tile is None:
+            if not (stopped or flipped):
+                continue
+            tile = ghost.current_tile
+        if not pathfinding.is_walkable(maze, tile):
+            mask = 0
+        else:
+            mask = maze.exit_mask(*tile)
+        if (EXIT_COUNTS[mask] >= 3 or maze.is_tunnel(*tile) or not mask
+                or not hasattr(ghost, "target") or stopped or flipped):
+            plan_ghost(ghost, pacman, power_pellet_active, cache, field)
+            decisions += 1
         else:
-            ghost_type = ghost.__class__.__name__
-            if ghost_type == "Blinky":
-                blinky_chase(ghost, pacman.position)
-            elif ghost_type == "Pinky":
-                pinky_ambush(ghost, pacman.position, pacman.direction)
-            elif ghost_type == "Inky":
-                inky_unpredictable(ghost, pacman.position)
-            elif ghost_type == "Clyde":
-                clyde_dual_behavior(ghost, pacman.position)
-
-def initialize_ai():
+            follow_corridor(ghost, tile, mask)
+    return decisions
+
+class AIScheduler:
+    """
+    Spreads ghost re-planning over frames within a time budget.
+
+    Ghosts wait in a persistent priority queue. Every frame, run() pops and plans the
+    most urgent ghosts until budget_ms milliseconds are used up, then queues the planned
+    ghosts again; ghosts that miss the slice keep their previous target and direction.
+    A ghost's urgency is its distance to PacMan when it was queued, minus JUNCTION_URGENCY
+    tiles when it stood on a junction, where a decision matters most, plus the frame it
+    was queued on, so every frame spent waiting counts as one tile and no ghost is starved.
+    Urgency is only computed for the ghosts planned, so a frame's work grows with the
+    budget rather than with the number of ghosts. At least one ghost is planned per frame.
+    """
+    JUNCTION_URGENCY = 8
+
+    def __init__(self, budget_ms=config.AI_BUDGET_MS, clock=time.perf_counter):
+        self.budget_ms = budget_ms
+        self.clock = clock
+        self.frame = 0
+        self.queue = []  # heap of (urgency, sequence, ghost)
+        self.queued = {}  # ghost -> frame it was queued on
+        self._sequence = itertools.count()
+        self._tracked = None
+        self._tracked_count = 0
+        self.last_report = {"planned": 0, "deferred": 0, "elapsed_ms": 0.0}
+
+    def urgency(self, ghost, pacman):
+        """Queue key for a ghost queued this frame; lower keys are planned first."""
+        urgency = maze_distance(ghost.position, pacman.position) + self.frame
+        if position_to_tile(ghost.position) in junction_tiles:
+            urgency -= self.JUNCTION_URGENCY
+        return urgency
+
+    def _push(self, ghost, pacman):
+        self.queued[ghost] = self.frame
+        heapq.heappush(self.queue, (self.urgency(ghost, pacman), next(self._sequence), ghost))
+
+    def waiting(self, ghost):
+        """Return the number of frames a queued ghost has waited since it was queued."""
+        return self.frame - self.queued[ghost]
+
+    def sync(self, ghosts, pacman):
+        """
+        Queue ghosts that are not queued yet and drop queued ghosts missing from ghosts.
+        run() calls this whenever it is given another list or the list changed length;
+        call it directly after replacing ghosts in the same list in place.
+        """
+        for ghost in ghosts:
+            if ghost not in self.queued:
+                self._push(ghost, pacman)
+        present = set(ghosts)
+        removed = [ghost for ghost in self.queued if ghost not in present]
+        if removed:
+            for ghost in removed:
+                del self.queued[ghost]
+            self.queue = [entry for entry in self.queue if entry[2] in self.queued]
+            heapq.heapify(self.queue)
+        self._tracked = ghosts
+        self._tracked_count = len(ghosts)
+
+    def run(self, ghosts, pacman, power_pellet_active=False):
+        """Plan as many ghosts as fit in the budget and return the number planned."""
+        started = self.clock()
+        deadline = started + self.budget_ms / 1000.0
+        if ghosts is not self._tracked or len(ghosts) != self._tracked_count:
+            self.sync(ghosts, pacman)
+        if flow_field is not None:
+            flow_field.update(position_to_tile(pacman.position))
+        queue = self.queue
+        planned = []
+        while queue:
+            if planned and self.clock() >= deadline:
+                break
+            ghost = heapq.heappop(queue)[2]
+            plan_ghost(ghost, pacman, power_pellet_active)
+            planned.append(ghost)
+        self.frame += 1
+        for ghost in planned:
+            self._push(ghost, pacman)
+        self.last_report = {"planned": len(planned), "deferred": len(self.queued) - len(planned),
+                            "elapsed_ms": (self.clock() - started) * 1000.0}
+        return len(planned)
+
+    def report(self):
+        """Return a one-line summary of the last frame's AI work."""
+        report = self.last_report
+        return (f"AI: planned {report['planned']} ghosts, deferred {report['deferred']}, "
+                f"{report['elapsed_ms']:.2f} ms of {self.budget_ms:.2f} ms budget")
+
+def initialize_ai(table=None, level=None):
     """
     Initialize any AI-specific timers or settings.
+    table is an optional distance_table.DistanceTable for the current level.
+    level is an optional maze.Maze; with it, ghosts follow cached shortest paths.
     """
-    # For now, no initialization is needed.
-    pass
+    global distance_table, path_cache, flow_field, junction_tiles, current_maze
+    distance_table = table
+    current_maze = level
+    junction_tiles = frozenset(level.junctions()) if level is not None else frozenset()
+    path_cache = pathfinding.PathCache(level) if level is not None else None
+    flow_field = pathfinding.FlowField(level) if level is not None else None
 
 def main():
     # Create test instances for PacMan and ghosts using game_objects.initialize_objects
@@ -171,6 +508,206 @@ def main():
     except Exception as e:
         assert False, "initialize_ai function raised an exception: " + str(e)
 
+    # Test Clyde with an exact maze distance table.
+    import maze
+    import distance_table as distance_tables
+    level = maze.Maze()
+    initialize_ai(distance_tables.DistanceTable.build(level))
+    # Tiles (1, 4) and (5, 4) are 4 apart in a straight line but 10 steps apart through the maze.
+    clyde.position = (4, 1)
+    assert maze_distance(clyde.position, (4, 5)) == 10, "maze_distance should use the table."
+    assert maze_distance((1.2, 0.8), (2.1, 1.0)) == 1, "maze_distance should round positions to tiles."
+    clyde_dual_behavior(clyde, (4, 5))
+    assert clyde.target == (4, 5), "Clyde should chase when the maze distance is large."
+    # Positions on walls fall back to the straight-line distance.
+    assert maze_distance((0, 0), (3, 4)) == 5, "maze_distance should fall back for wall tiles."
+    initialize_ai()
+    assert distance_table is None, "initialize_ai without a table should clear it."
+
+    # Test ghosts following cached paths instead of walking through walls.
+    initialize_ai(level=level)
+    blinky.position = (1, 3)
+    blinky.direction = (1, 0)
+    pacman.position = (8, 7)
+    update_ghosts([blinky], pacman)
+    assert blinky.target == pacman.position, "Blinky should still target Pac-Man."
+    for _ in range(40):
+        update_ghosts([blinky], pacman)
+        # One tile per move keeps the ghost on tile centers for the wall check.
+        blinky.speed = 1
+        blinky.move()
+        row, col = position_to_tile(blinky.position)
+        assert not level.is_wall(row, col), "Ghost walked into a wall."
+        if (row, col) == (7, 8):
+            break
+    assert position_to_tile(blinky.position) == (7, 8), "Ghost should reach Pac-Man's tile along the maze."
+    assert path_cache.searches == 0, "Chasing Pac-Man should use the flow field, not per-ghost searches."
+    assert flow_field.searches == 1, "The flow field should be computed once while Pac-Man stays on his tile."
+    update_ghosts([blinky], pacman)
+    assert tuple(blinky.direction) == (0, 0), "Ghost on its target tile should stop."
+
+    # Many chasing ghosts share one flow field search per Pac-Man tile.
+    pack = [game_objects.Blinky(position=(1 + i % 8, 3)) for i in range(100)]
+    pacman.position = (5, 7)
+    update_ghosts(pack, pacman)
+    assert flow_field.searches == 2, "One search should serve every chasing ghost."
+    for ghost in pack:
+        assert tuple(ghost.direction) != (0, 0), "Every chasing ghost should get a move."
+    pacman.position = (5.2, 7.1)
+    update_ghosts(pack, pacman)
+    assert flow_field.searches == 2, "Moving within a tile should not recompute the field."
+    assert path_cache.searches == 0, "Chasing ghosts should not run their own searches."
+
+    # Pac-Man off the maze, e.g. mid-tunnel, is still chased through the field.
+    pacman.position = (-1, 1)
+    blinky.position = (3, 1)
+    blinky.direction = (0, 0)
+    update_ghosts([blinky], pacman)
+    assert tuple(blinky.direction) != (0, 0), "Ghosts should keep chasing Pac-Man off the maze."
+    assert tuple(blinky.direction) == pathfinding.PathCache(level).next_direction((1, 3), (1, -1)), \
+        "The flow field should snap Pac-Man's tile like the path cache."
+
+    # Targets away from Pac-Man still use the path cache.
+    pinky.position = (1, 3)
+    update_ghosts([pinky], pacman)
+    assert path_cache.searches == 1, "Ambush targets should use the path cache."
+    initialize_ai()
+
+    # Test the batched strategies against the per-ghost ones.
+    if np is not None:
+        pacman.position = (10, 10)
+        pacman.direction = (0, 1)
+        kinds = (game_objects.Blinky, game_objects.Pinky, game_objects.Inky, game_objects.Clyde)
+        crowd = [kinds[i % 4](position=(float(i % 23), float(i % 17))) for i in range(4 * BATCH_MIN_GHOSTS)]
+        update_ghosts(crowd, pacman)
+        for ghost in crowd:
+            single = type(ghost)(position=ghost.position)
+            STRATEGIES[ghost.KIND][0](single, pacman)
+            if ghost.KIND == game_objects.GHOST_KIND_INKY:
+                assert all(-4 <= t - p <= 4 for t, p in zip(ghost.target, pacman.position)), "Batched Inky target out of range."
+            else:
+                assert ghost.target == single.target, f"Batched target mismatch for {type(ghost).__name__}."
+            assert ghost.speed == single.speed, f"Batched speed mismatch for {type(ghost).__name__}."
+
+        # Seeding random makes batched Inky pick the same targets as per-ghost Inky.
+        inkies = [game_objects.Inky(position=(float(i), 1.0)) for i in range(BATCH_MIN_GHOSTS)]
+        random.seed(7)
+        for ghost in inkies:
+            inky_unpredictable(ghost, pacman.position)
+        expected = [ghost.target for ghost in inkies]
+        random.seed(7)
+        update_ghosts(inkies, pacman)
+        assert [tuple(ghost.target) for ghost in inkies] == [tuple(target) for target in expected], "Batched Inky should follow the random seed."
+        update_ghosts(crowd, pacman, power_pellet_active=True)
+        for ghost in crowd:
+            expected = (2 * ghost.position[0] - pacman.position[0], 2 * ghost.position[1] - pacman.position[1])
+            assert ghost.target == expected and ghost.speed == config.VULNERABLE_SPEED, "Batched frightened mode mismatch."
+
+    # Registering a new kind adds a strategy without touching the others.
+    register_strategy("test", lambda ghost, pacman: setattr(ghost, "target", (0, 0)))
+    stranger = game_objects.Ghost(position=(3, 3))
+    stranger.KIND = "test"
+    update_ghosts([stranger, blinky], pacman)
+    assert stranger.target == (0, 0) and blinky.target == pacman.position, "Registered strategy was not used."
+    del STRATEGIES["test"]
+
+    # Test the time-sliced scheduler with a fake clock that advances 1 ms per reading.
+    ticks = [0]
+    def fake_clock():
+        ticks[0] += 1
+        return ticks[0] / 1000.0
+    initialize_ai(level=level)
+    pacman.position = (5, 7)
+    swarm = [game_objects.Blinky(position=(1 + i % 8, 3)) for i in range(20)]
+    swarm.append(game_objects.Clyde(position=(6, 3)))  # (3, 6) is a junction
+    scheduler = AIScheduler(budget_ms=3.0, clock=fake_clock)
+    planned = scheduler.run(swarm, pacman)
+    assert 1 <= planned < len(swarm), "Scheduler should stop when the budget is used up."
+    assert scheduler.last_report["deferred"] == len(swarm) - planned, "Deferred count mismatch."
+    assert hasattr(swarm[-1], "target"), "Ghosts at a junction should be planned first."
+    print(scheduler.report())
+    # Deferred ghosts keep their previous decision and are eventually all planned.
+    for _ in range(len(swarm)):
+        scheduler.run(swarm, pacman)
+    assert all(hasattr(ghost, "target") for ghost in swarm), "Every ghost should get planned within a few frames."
+    generous = AIScheduler(budget_ms=1000.0, clock=fake_clock)
+    assert generous.run(swarm, pacman) == len(swarm) and generous.last_report["deferred"] == 0, "A large budget should plan every ghost."
+
+    # A frame only computes urgencies for the ghosts it plans, not for the whole swarm.
+    measured = maze_distance
+    calls = [0]
+    def counting_distance(position_a, position_b):
+        calls[0] += 1
+        return measured(position_a, position_b)
+    globals()["maze_distance"] = counting_distance
+    try:
+        crowd = [game_objects.Blinky(position=(1 + i % 8, 3)) for i in range(200)]
+        scheduler = AIScheduler(budget_ms=3.0, clock=fake_clock)
+        scheduler.run(crowd, pacman)
+        calls[0] = 0
+        planned = scheduler.run(crowd, pacman)
+        assert calls[0] <= planned, "Scheduler should only compute urgencies for planned ghosts."
+    finally:
+        globals()["maze_distance"] = measured
+
+    # Removed ghosts are dropped from the queue; added ghosts are queued.
+    removed = crowd.pop()
+    newcomer = game_objects.Pinky(position=(2, 3))
+    crowd.append(newcomer)
+    scheduler.sync(crowd, pacman)
+    assert removed not in scheduler.queued and newcomer in scheduler.queued, "Scheduler should track the current ghosts."
+    assert all(entry[2] is not removed for entry in scheduler.queue), "Removed ghosts should leave the queue."
+    del crowd[:150]
+    scheduler.run(crowd, pacman)
+    assert len(scheduler.queued) == len(crowd) == len(scheduler.queue), "Shrinking the swarm should prune the queue."
+    initialize_ai()
+
+    # Test junction-triggered decisions: AI runs only when a ghost enters a junction.
+    initialize_ai(level=level)
+    pacman.position = (8, 7)
+    walker = game_objects.Blinky(position=(2, 3))
+    walker.speed = 0.25
+    decisions = 0
+    expected = 0
+    moves = 0
+    previous_tile = None
+    while position_to_tile(walker.position) != (7, 8) and moves < 400:
+        tile = position_to_tile(walker.position)
+        if tile != previous_tile:
+            # A decision is due on the first call and on every junction or tunnel entered.
+            if previous_tile is None or level.exit_count(*tile) >= 3 or level.is_tunnel(*tile):
+                expected += 1
+            previous_tile = tile
+        decisions += update_ghosts_on_tile_entry([walker], pacman)
+        walker.speed = 0.25
+        walker.move()
+        moves += 1
+        row, col = position_to_tile(walker.position)
+        assert not level.is_wall(row, col), "Ghost walked into a wall."
+    assert position_to_tile(walker.position) == (7, 8), "Ghost should still reach its target."
+    assert expected > 1, "The test route should cross junctions."
+    assert decisions == expected, f"Expected {expected} decisions on junction and tunnel tiles, got {decisions}."
+    update_ghosts_on_tile_entry([walker], pacman)
+    assert tuple(walker.direction) == (0, 0), "Ghost on its target tile should stop."
+    pacman.position = (1, 1)
+    assert update_ghosts_on_tile_entry([walker], pacman) == 1, "A stopped ghost should re-plan when its target moves."
+    assert tuple(walker.direction) != (0, 0), "The re-planned ghost should move again."
+    assert update_ghosts_on_tile_entry([walker], pacman) == 0, "A moving ghost on the same tile needs no decision."
+
+    # A frightened flip re-plans a ghost mid-corridor, so it can turn around.
+    runner = game_objects.Blinky(position=(4, 1))  # corridor tile (1, 4), next to Pac-Man's target
+    pacman.position = (1, 1)
+    runner.speed = 0.25
+    update_ghosts_on_tile_entry([runner], pacman)
+    chasing = tuple(runner.direction)
+    assert update_ghosts_on_tile_entry([runner], pacman) == 0, "No decision without a new tile or a mode flip."
+    assert update_ghosts_on_tile_entry([runner], pacman, power_pellet_active=True) == 1, "A frightened flip should re-plan the ghost."
+    assert tuple(runner.direction) == (-chasing[0], -chasing[1]), "A frightened ghost should turn away from Pac-Man."
+    assert update_ghosts_on_tile_entry([runner], pacman, power_pellet_active=True) == 0, "The flip should only re-plan once."
+    runner.state = "vulnerable"
+    assert update_ghosts_on_tile_entry([runner], pacman, power_pellet_active=True) == 1, "A state change should re-plan the ghost."
+    initialize_ai()
+
     print("All tests passed successfully.")
 
 if __name__ == "__main__":
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+try:
+    import config
+    LEVELS_DIR = config.LEVELS_DIR
+    LEVEL_CACHE_DIR = config.LEVEL_CACHE_DIR
+except Exception:
+    LEVELS_DIR = "assets/levels"
+    LEVEL_CACHE_DIR = "assets/levels/.cache"
+
+from maze import Maze, CELL_TO_TILE
+
+# Compiled level layout (all integers little-endian):
+#   header   magic, version, rows, cols, pellet count, tunnel pair count, junction count
+#   tiles    rows * cols bytes, padded to a multiple of 4
+#   pellets  uint32 flat tile indices
+#   tunnels  uint32 flat tile index pairs
+#   junction uint32 flat tile indices
+CACHE_MAGIC = b"PMZC"
+CACHE_VERSION = 1
+CACHE_SUFFIX = ".mzc"
+HEADER = struct.Struct("<4sHHIIIII")
+COMMENT_PREFIX = "#"
+
+class CompiledLevel:
+    """A loaded level: the Maze plus the navigation data stored in the compiled cache.
+       When loaded from a cache file, tunnel_pairs and junctions are read-only views
+       over the memory-mapped file."""
+    def __init__(self, maze, tunnel_pairs, junctions, content_hash, from_cache):
+        self.maze = maze
+        self.tunnel_pairs = tunnel_pairs
+        self.junctions = junctions
+        self.content_hash = content_hash
+        self.from_cache = from_cache
+
+def parse_level_text(text):
+    """Return the maze rows of a level file's text.
+       Lines starting with '#' are comments; trailing newlines are ignored."""
+    rows = []
+    for line in text.splitlines():
+        if line.startswith(COMMENT_PREFIX):
+            continue
+        rows.append(line)
+    while rows and rows[-1] == "":
+        rows.pop()
+    if not rows:
+        raise ValueError("Level file contains no maze rows.")
+    return rows
+
+def content_hash(data):
+    """Return the cache key for the raw bytes of a level file."""
+    return hashlib.sha256(data).hexdigest()
+
+def cache_path_for(digest, cache_dir=None):
+    """Return the compiled cache file path for a level content hash."""
+    return os.path.join(cache_dir or LEVEL_CACHE_DIR, digest + CACHE_SUFFIX)
+
+def _as_uint32(values):
+    data = array("I", values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+def compile_level(maze, path):
+    """Write the compiled form of a maze to path. The file is written to a temporary
+       name first and renamed into place, so readers never see a partial cache."""
+    cols = maze.cols
+    pellets = maze.pellet_indices()
+    tunnels = []
+    for (row_a, col_a), (row_b, col_b) in maze.tunnel_pairs():
+        tunnels.extend((row_a * cols + col_a, row_b * cols + col_b))
+    junctions = [row * cols + col for row, col in maze.junctions()]
+    tile_bytes = bytes(maze.tiles)
+    padding = b"\0" * (-len(tile_bytes) % 4)
+    header = HEADER.pack(CACHE_MAGIC, CACHE_VERSION, 0, maze.rows, cols,
+                         len(pellets), len(tunnels) // 2, len(junctions))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(header)
+        handle.write(tile_bytes)
+        handle.write(padding)
+        handle.write(_as_uint32(pellets))
+        handle.write(_as_uint32(tunnels))
+        handle.write(_as_uint32(junctions))
+    os.replace(temp_path, path)
+
+def read_compiled_level(path, maze_class=Maze):
+    """Memory-map a compiled level and return (maze, tunnel_pairs, junctions).
+       Returns None if the file is missing, truncated or from another format version."""
+    try:
+        handle = open(path, "rb")
+    except OSError:
+        return None
+    with handle:
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
+    view = memoryview(mapped)
+    level = None
+    try:
+        level = _unpack_compiled_level(view, maze_class)
+    finally:
+        if level is None:
+            # Nothing refers to an invalid cache's mapping, so unmap it right away.
+            view.release()
+            mapped.close()
+    return level
+
+def _unpack_compiled_level(view, maze_class):
+    if len(view) < HEADER.size:
+        return None
+    magic, version, _, rows, cols, pellet_count, tunnel_count, junction_count = HEADER.unpack_from(view)
+    tile_count = rows * cols
+    tiles_end = HEADER.size + tile_count
+    arrays_start = tiles_end + (-tile_count % 4)
+    expected_size = arrays_start + 4 * (pellet_count + 2 * tunnel_count + junction_count)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or len(view) != expected_size:
+        return None
+    if sys.byteorder != "little":
+        # The uint32 views below assume native little-endian order; recompile instead.
+        return None
+    indices = view[arrays_start:].cast("I")
+    pellets = indices[:pellet_count]
+    tunnel_indices = indices[pellet_count:pellet_count + 2 * tunnel_count]
+    junctions = indices[pellet_count + 2 * tunnel_count:]
+    tunnel_pairs = [(divmod(tunnel_indices[i], cols), divmod(tunnel_indices[i + 1], cols))
+                    for i in range(0, len(tunnel_indices), 2)]
+    maze = maze_class.from_tiles(rows, cols, view[HEADER.size:tiles_end], pellets, tunnel_pairs)
+    return maze, tunnel_pairs, junctions
+
+def load_level(path, cache_dir=None, maze_class=Maze):
+    """Load a text level file, using the compiled cache when one exists for its contents.
+       On a cache miss the level is parsed, compiled and cached for the next launch."""
+    with open(path, "rb") as handle:
+        data = handle.read()
+    digest = content_hash(data)
+    compiled_path = cache_path_for(digest, cache_dir)
+    cached = read_compiled_level(compiled_path, maze_class)
+    if cached is not None:
+        maze, tunnel_pairs, junctions = cached
+        return CompiledLevel(maze, tunnel_pairs, junctions, digest, from_cache=True)
+    maze = maze_class(parse_level_text(data.decode("utf-8")))
+    try:
+        compile_level(maze, compiled_path)
+    except OSError as e:
+        print("Warning: Could not write compiled level cache:", e)
+    junctions = [maze.index(row, col) for row, col in maze.junctions()]
+    return CompiledLevel(maze, maze.tunnel_pairs(), junctions, digest, from_cache=False)
+
+def list_levels(levels_dir=None):
+    """Return the level file paths in the levels directory, sorted by name."""
+    levels_dir = levels_dir or LEVELS_DIR
+    return [os.path.join(levels_dir, name)
+            for name in sorted(os.listdir(levels_dir))
+            if name.endswith(".txt")]
+
+def main():
+    import tempfile
+
+    # Test parsing level text with comments and a trailing newline.
+    rows = parse_level_text("# comment\nWWW\nTPT\nWWW\n")
+    assert rows == ["WWW", "TPT", "WWW"], "Level text parsing mismatch."
+    try:
+        parse_level_text("# only a comment\n")
+        assert False, "Empty level files should be rejected."
+    except ValueError:
+        pass
+
+    # Test that every cell character in the shipped levels is known.
+    levels = list_levels()
+    assert levels, "At least one level file should be shipped."
+    for level_path in levels:
+        with open(level_path, encoding="utf-8") as handle:
+            for line in parse_level_text(handle.read()):
+                assert all(cell in CELL_TO_TILE for cell in line), f"Unknown cell in {level_path}."
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # First load parses the text file and writes the compiled cache.
+        first = load_level(levels[0], cache_dir)
+        assert not first.from_cache, "First load should miss the cache."
+        assert os.path.exists(cache_path_for(first.content_hash, cache_dir)), "Compiled cache file was not written."
+
+        # Second load reads the memory-mapped cache.
+        second = load_level(levels[0], cache_dir)
+        assert second.from_cache, "Second load should hit the cache."
+        assert second.maze.layout == first.maze.layout, "Cached tiles mismatch."
+        assert second.maze.pellet_count() == first.maze.pellet_count(), "Cached pellet count mismatch."
+        assert second.tunnel_pairs == first.tunnel_pairs, "Cached tunnel pairs mismatch."
+        assert list(second.junctions) == list(first.junctions), "Cached junctions mismatch."
+
+        # The cached maze must be mutable and independent of the mapped file.
+        row, col = next(second.maze.remaining_pellets())
+        assert second.maze.consume_pellet(row, col), "Cached maze should allow pellet consumption."
+        third = load_level(levels[0], cache_dir)
+        assert third.maze.is_pellet(row, col), "Consuming a pellet must not modify the cache file."
+
+        # A corrupt cache file is ignored, unmapped and rebuilt.
+        with open(cache_path_for(first.content_hash, cache_dir), "wb") as handle:
+            handle.write(b"garbage")
+        mapped = []
+        class TrackedMap(mmap.mmap):
+            def __new__(cls, *args, **kwargs):
+                mapping = super().__new__(cls, *args, **kwargs)
+                mapped.append(mapping)
+                return mapping
+        original_mmap = mmap.mmap
+        mmap.mmap = TrackedMap
+        try:
+            assert read_compiled_level(cache_path_for(first.content_hash, cache_dir)) is None, "Corrupt cache should be rejected."
+        finally:
+            mmap.mmap = original_mmap
+        assert mapped and all(mapping.closed for mapping in mapped), "Rejected cache should be unmapped."
+        rebuilt = load_level(levels[0], cache_dir)
+        assert not rebuilt.from_cache, "Corrupt cache should be rebuilt."
+        assert load_level(levels[0], cache_dir).from_cache, "Rebuilt cache should be used on the next load."
+
+    print("All level loader tests passed.")
+
+if __name__ == "__main__":
+    main()
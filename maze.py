@@ -7,62 +7,302 @@ except Exception:
     TILE_SIZE = 20
     MAZE_OFFSET = (0, 0)
 
+# Tile type codes stored in the low bits of each byte of Maze.tiles.
+TILE_EMPTY = 0
+TILE_WALL = 1
+TILE_PELLET = 2
+TILE_TUNNEL = 3
+TILE_TYPE_MASK = 0x0F
+
+# Flag bits stored next to the type code, so a property can be tested
+# with a single mask instead of a comparison per tile type.
+FLAG_BLOCKED = 0x10
+FLAG_PELLET = 0x20
+FLAG_TUNNEL = 0x40
+
+# Exit bits of Maze.exit_mask(): which directions a walkable tile can be left in.
+# A tunnel's wrap-around counts as an exit off the edge it is on.
+EXIT_UP = 0x1
+EXIT_DOWN = 0x2
+EXIT_LEFT = 0x4
+EXIT_RIGHT = 0x8
+# (exit bit, (d_row, d_col)) for each direction.
+EXIT_STEPS = ((EXIT_UP, (-1, 0)), (EXIT_DOWN, (1, 0)), (EXIT_LEFT, (0, -1)), (EXIT_RIGHT, (0, 1)))
+# Number of exits for each 4-bit exit mask.
+EXIT_COUNTS = bytes(bin(mask).count("1") for mask in range(16))
+
+# Steps charged for walking through a tunnel wrap onto its partner cell. maze_graph,
+# distance_table and pathfinding all use it, so their distances agree; it must be 0 or 1.
+TUNNEL_WRAP_COST = 0
+
+# Mapping between layout characters and encoded tile bytes.
+CELL_TO_TILE = {
+    ' ': TILE_EMPTY,
+    'W': TILE_WALL | FLAG_BLOCKED,
+    'P': TILE_PELLET | FLAG_PELLET,
+    'T': TILE_TUNNEL | FLAG_TUNNEL,
+}
+TILE_TO_CELL = (' ', 'W', 'P', 'T')
+
+# Hard-coded maze layout where:
+# 'W' represents a wall,
+# 'P' represents a pellet,
+# ' ' represents an empty space,
+# 'T' represents a tunnel (wrap-around cell).
+DEFAULT_LAYOUT = (
+    "WWWWWWWWWW",
+    "T P    P T",
+    "W WWWW W W",
+    "W        W",
+    "WPWWWWWWPW",
+    "W        W",
+    "W WWWW W W",
+    "T P    P T",
+    "WWWWWWWWWW",
+)
+
 class Maze:
-    def __init__(self):
-        self.initialize_maze()
-
-    def initialize_maze(self):
-        # Hard-coded maze layout where:
-        # 'W' represents a wall,
-        # 'P' represents a pellet,
-        # ' ' represents an empty space,
-        # 'T' represents a tunnel (wrap-around cell).
-        self.layout = [
-            list("WWWWWWWWWW"),
-            list("T P    P T"),
-            list("W WWWW W W"),
-            list("W        W"),
-            list("WPWWWWWWPW"),
-            list("W        W"),
-            list("W WWWW W W"),
-            list("T P    P T"),
-            list("WWWWWWWWWW")
-        ]
-        self.rows = len(self.layout)
-        self.cols = len(self.layout[0])
+    # Colors used when rendering the maze. A tunnel border color of None skips the border.
+    WALL_COLOR = (0, 0, 255)
+    PELLET_COLOR = (255, 255, 255)
+    TUNNEL_COLOR = (128, 128, 128)
+    TUNNEL_BORDER_COLOR = (0, 0, 0)
+    BACKGROUND_COLOR = (0, 0, 0)
+    # Optional texture_atlas.TextureAtlas holding ("tile", tile type) images; None draws shapes.
+    atlas = None
+
+    def __init__(self, layout=None):
+        self.initialize_maze(layout)
+
+    def initialize_maze(self, layout=None):
+        """Encode the layout (a sequence of equal-length strings) into the tile store.
+           The tiles are kept row-major in a bytearray, one byte per cell."""
+        if layout is None:
+            layout = DEFAULT_LAYOUT
+        self.rows = len(layout)
+        self.cols = len(layout[0]) if self.rows else 0
+        tiles = bytearray(self.rows * self.cols)
+        for row, line in enumerate(layout):
+            if len(line) != self.cols:
+                raise ValueError(f"Maze row {row} has length {len(line)}, expected {self.cols}.")
+            base = row * self.cols
+            for col, cell in enumerate(line):
+                try:
+                    tiles[base + col] = CELL_TO_TILE[cell]
+                except KeyError:
+                    raise ValueError(f"Unknown maze cell {cell!r} at ({row}, {col}).") from None
+        self.load_tiles(self.rows, self.cols, tiles)
+
+    @classmethod
+    def from_tiles(cls, rows, cols, tiles, pellets=None, tunnel_pairs=None):
+        """Create a maze directly from an encoded tile store, skipping layout parsing.
+           pellets (flat indices) and tunnel_pairs may be passed in when they are already known."""
+        maze = cls.__new__(cls)
+        maze.load_tiles(rows, cols, tiles, pellets, tunnel_pairs)
+        return maze
+
+    def load_tiles(self, rows, cols, tiles, pellets=None, tunnel_pairs=None):
+        """Replace the maze contents with an encoded tile store of rows * cols bytes."""
+        if len(tiles) != rows * cols:
+            raise ValueError(f"Tile store has {len(tiles)} bytes, expected {rows * cols}.")
+        self.rows = rows
+        self.cols = cols
+        self.tiles = bytearray(tiles)
+        if pellets is None:
+            self._index_pellets()
+        else:
+            self._pellets = set(pellets)
+        self._tunnel_pairs = None if tunnel_pairs is None else list(tunnel_pairs)
+        self._tunnel_partners = None
+        self._exits = None
+        self.invalidate_surface()
+
+    def _index_pellets(self):
+        """Build the live pellet index from the tile store.
+           After this, consume_pellet keeps the index up to date, so no query has to rescan the grid."""
+        self._pellets = {i for i, tile in enumerate(self.tiles) if tile & FLAG_PELLET}
+
+    def pellet_indices(self):
+        """Return the flat indices of the remaining pellets in ascending order."""
+        return sorted(self._pellets)
+
+    def tunnel_pairs(self):
+        """Return the list of ((row, col), (row, col)) tunnel cells that wrap onto each other.
+           Tunnels on the left and right edge of the same row pair up, as do tunnels on the top
+           and bottom edge of the same column."""
+        if self._tunnel_pairs is None:
+            pairs = []
+            last_col = self.cols - 1
+            last_row = self.rows - 1
+            for row in range(self.rows):
+                if last_col > 0 and self.is_tunnel(row, 0) and self.is_tunnel(row, last_col):
+                    pairs.append(((row, 0), (row, last_col)))
+            for col in range(self.cols):
+                if last_row > 0 and self.is_tunnel(0, col) and self.is_tunnel(last_row, col):
+                    pairs.append(((0, col), (last_row, col)))
+            self._tunnel_pairs = pairs
+        return self._tunnel_pairs
+
+    def tunnel_partner(self, row, col):
+        """Return the cell a tunnel at (row, col) wraps onto, or None."""
+        if self._tunnel_partners is None:
+            partners = {}
+            for first, second in self.tunnel_pairs():
+                partners[first] = second
+                partners[second] = first
+            self._tunnel_partners = partners
+        return self._tunnel_partners.get((row, col))
+
+    def open_neighbors(self, row, col):
+        """Return the walkable cells reachable in one step from (row, col), including a tunnel wrap."""
+        neighbors = []
+        for next_row, next_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= next_row < self.rows and 0 <= next_col < self.cols and not self.tile_at(next_row, next_col) & FLAG_BLOCKED:
+                neighbors.append((next_row, next_col))
+        if self.tile_at(row, col) & FLAG_TUNNEL:
+            partner = self.tunnel_partner(row, col)
+            if partner is not None and partner not in neighbors:
+                neighbors.append(partner)
+        return neighbors
+
+    def _index_exits(self):
+        """Build the per-tile exit masks from the walls and tunnel pairs."""
+        rows, cols = self.rows, self.cols
+        tiles = self.tiles
+        exits = bytearray(rows * cols)
+        for index, tile in enumerate(tiles):
+            if tile & FLAG_BLOCKED:
+                continue
+            row, col = divmod(index, cols)
+            mask = 0
+            for bit, (d_row, d_col) in EXIT_STEPS:
+                next_row = row + d_row
+                next_col = col + d_col
+                if 0 <= next_row < rows and 0 <= next_col < cols and not tiles[next_row * cols + next_col] & FLAG_BLOCKED:
+                    mask |= bit
+            if tile & FLAG_TUNNEL:
+                partner = self.tunnel_partner(row, col)
+                if partner is not None:
+                    if partner[1] != col:
+                        mask |= EXIT_LEFT if col == 0 else EXIT_RIGHT
+                    else:
+                        mask |= EXIT_UP if row == 0 else EXIT_DOWN
+            exits[index] = mask
+        self._exits = exits
+
+    def exit_mask(self, row, col):
+        """Return the EXIT_* bits of the directions (row, col) can be left in; 0 for walls.
+           No bounds checking, like tile_at."""
+        if self._exits is None:
+            self._index_exits()
+        return self._exits[row * self.cols + col]
+
+    def exit_count(self, row, col):
+        """Return the number of directions (row, col) can be left in."""
+        return EXIT_COUNTS[self.exit_mask(row, col)]
+
+    def junctions(self):
+        """Return the walkable cells with three or more exits, in row-major order."""
+        if self._exits is None:
+            self._index_exits()
+        cols = self.cols
+        return [divmod(index, cols) for index, mask in enumerate(self._exits) if EXIT_COUNTS[mask] >= 3]
+
+    @property
+    def layout(self):
+        """Return the maze as a list of lists of cell characters.
+           This is a decoded copy; modify the maze through its methods instead."""
+        cols = self.cols
+        return [[TILE_TO_CELL[tile & TILE_TYPE_MASK] for tile in self.tiles[start:start + cols]]
+                for start in range(0, self.rows * cols, cols)]
+
+    def index(self, row, col):
+        """Return the flat index of (row, col) in the tile store."""
+        return row * self.cols + col
+
+    def tile_at(self, row, col):
+        """Return the encoded tile byte at (row, col) without bounds checking.
+           Intended for hot loops that already know the coordinates are valid."""
+        return self.tiles[row * self.cols + col]
 
     def get_cell(self, row, col):
         """Return the content of the cell at the given row and column."""
         if 0 <= row < self.rows and 0 <= col < self.cols:
-            return self.layout[row][col]
+            return TILE_TO_CELL[self.tiles[row * self.cols + col] & TILE_TYPE_MASK]
         return None
 
     def is_wall(self, row, col):
         """Return True if the cell is a wall."""
-        return self.get_cell(row, col) == 'W'
+        return (0 <= row < self.rows and 0 <= col < self.cols
+                and bool(self.tiles[row * self.cols + col] & FLAG_BLOCKED))
 
     def is_pellet(self, row, col):
         """Return True if the cell is a pellet."""
-        return self.get_cell(row, col) == 'P'
+        return (0 <= row < self.rows and 0 <= col < self.cols
+                and bool(self.tiles[row * self.cols + col] & FLAG_PELLET))
 
     def is_tunnel(self, row, col):
         """Return True if the cell is a tunnel."""
-        return self.get_cell(row, col) == 'T'
+        return (0 <= row < self.rows and 0 <= col < self.cols
+                and bool(self.tiles[row * self.cols + col] & FLAG_TUNNEL))
 
     def consume_pellet(self, row, col):
         """If the cell contains a pellet, remove it (set to empty) and return True.
            Otherwise, return False."""
         if self.is_pellet(row, col):
-            self.layout[row][col] = ' '
+            index = row * self.cols + col
+            self.tiles[index] = TILE_EMPTY
+            self._pellets.discard(index)
+            self._dirty_tiles.append(index)
             return True
         return False
 
     def pellet_count(self):
         """Return the total number of pellets remaining in the maze."""
-        count = 0
-        for row in self.layout:
-            count += row.count('P')
-        return count
+        return len(self._pellets)
+
+    def remaining_pellets(self):
+        """Yield the (row, col) of every remaining pellet, in no particular order."""
+        cols = self.cols
+        for index in self._pellets:
+            yield divmod(index, cols)
+
+    def nearest_pellet(self, row, col):
+        """Return the (row, col) of the remaining pellet closest to (row, col) by Manhattan distance,
+           or None if no pellets remain. Runs in O(k) for k remaining pellets."""
+        cols = self.cols
+        best = None
+        best_distance = None
+        for index in self._pellets:
+            pellet_row, pellet_col = divmod(index, cols)
+            distance = abs(pellet_row - row) + abs(pellet_col - col)
+            if best_distance is None or distance < best_distance:
+                best = (pellet_row, pellet_col)
+                best_distance = distance
+        return best
+
+    def pellets_in_region(self, top, left, bottom, right):
+        """Return the (row, col) of remaining pellets with top <= row <= bottom and left <= col <= right.
+           Scans whichever is smaller: the region's tiles or the pellet index."""
+        top = max(top, 0)
+        left = max(left, 0)
+        bottom = min(bottom, self.rows - 1)
+        right = min(right, self.cols - 1)
+        if top > bottom or left > right:
+            return []
+        cols = self.cols
+        if (bottom - top + 1) * (right - left + 1) < len(self._pellets):
+            pellets = self._pellets
+            return [(row, col)
+                    for row in range(top, bottom + 1)
+                    for col in range(left, right + 1)
+                    if row * cols + col in pellets]
+        region = []
+        for index in self._pellets:
+            row, col = divmod(index, cols)
+            if top <= row <= bottom and left <= col <= right:
+                region.append((row, col))
+        return region
 
     def grid_to_screen(self, row, col):
         """Convert a grid coordinate (row, col) to screen coordinate (x, y).
@@ -78,28 +318,89 @@ class Maze:
         for row in self.layout:
             print("".join(row))
 
-    def draw(self, surface):
-        """Draws the maze on the given Pygame surface using Pygame drawing functions."""
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell = self.layout[row][col]
-                x, y = self.grid_to_screen(row, col)
-                rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-                if cell == 'W':
-                    # Draw wall as blue rectangle
-                    pygame.draw.rect(surface, (0, 0, 255), rect)
-                elif cell == 'P':
-                    # Draw pellet as small white circle
-                    center = (x + TILE_SIZE // 2, y + TILE_SIZE // 2)
-                    radius = TILE_SIZE // 6
-                    pygame.draw.circle(surface, (255, 255, 255), center, radius)
-                elif cell == 'T':
-                    # Draw tunnel cell as gray rectangle with a border
-                    pygame.draw.rect(surface, (128, 128, 128), rect)
-                    pygame.draw.rect(surface, (0, 0, 0), rect, 1)
-                else:
-                    # For empty space, optionally draw a background rectangle
-                    pygame.draw.rect(surface, (0, 0, 0), rect)
+    def invalidate_surface(self):
+        """Drop the cached maze surface so the next draw call rebuilds it from the tile store."""
+        self._surface = None
+        self._dirty_tiles = []
+
+    @classmethod
+    def paint_tile(cls, surface, tile, x, y):
+        """Draw a single encoded tile as shapes in the class colors, top-left corner at (x, y)."""
+        rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+        surface.fill(cls.BACKGROUND_COLOR, rect)
+        tile_type = tile & TILE_TYPE_MASK
+        if tile_type == TILE_WALL:
+            # Draw wall as a filled rectangle
+            pygame.draw.rect(surface, cls.WALL_COLOR, rect)
+        elif tile_type == TILE_PELLET:
+            # Draw pellet as a small circle
+            center = (x + TILE_SIZE // 2, y + TILE_SIZE // 2)
+            radius = TILE_SIZE // 6
+            pygame.draw.circle(surface, cls.PELLET_COLOR, center, radius)
+        elif tile_type == TILE_TUNNEL:
+            # Draw tunnel cell as a rectangle, optionally with a border
+            pygame.draw.rect(surface, cls.TUNNEL_COLOR, rect)
+            if cls.TUNNEL_BORDER_COLOR is not None:
+                pygame.draw.rect(surface, cls.TUNNEL_BORDER_COLOR, rect, 1)
+
+    def draw_tile(self, surface, tile, x, y):
+        """Draw a single encoded tile with its top-left corner at (x, y) on the surface.
+           Uses the tile image from self.atlas when one is set."""
+        if self.atlas is not None:
+            surface.blit(self.atlas.surface, (x, y), self.atlas.rects[("tile", tile & TILE_TYPE_MASK)])
+        else:
+            self.paint_tile(surface, tile, x, y)
+
+    def build_surface(self):
+        """Pre-render every tile into an off-screen surface and cache it.
+           Walls and tunnels never change, so this only has to happen once per layout."""
+        surface = pygame.Surface((self.cols * TILE_SIZE, self.rows * TILE_SIZE))
+        tiles = self.tiles
+        cols = self.cols
+        if self.atlas is not None:
+            # One batched blit of atlas regions instead of a draw call per tile.
+            source = self.atlas.surface
+            areas = [self.atlas.rects[("tile", tile_type)] for tile_type in range(TILE_TUNNEL + 1)]
+            surface.blits([(source, ((index % cols) * TILE_SIZE, (index // cols) * TILE_SIZE), areas[tile & TILE_TYPE_MASK])
+                           for index, tile in enumerate(tiles)], doreturn=False)
+        else:
+            for row in range(self.rows):
+                base = row * cols
+                for col in range(cols):
+                    self.paint_tile(surface, tiles[base + col], col * TILE_SIZE, row * TILE_SIZE)
+        self._surface = surface
+        self._dirty_tiles = []
+        return surface
+
+    def pop_dirty_tiles(self):
+        """Return the flat indices of tiles changed since the last call and clear the list."""
+        dirty = self._dirty_tiles
+        self._dirty_tiles = []
+        return dirty
+
+    def draw(self, surface, full=True):
+        """Draws the maze on the given Pygame surface from the cached maze surface.
+           Tiles changed since the last draw (eaten pellets) are patched into the cache first.
+           With full=True the whole cache is blitted in one call; with full=False only the
+           changed tiles are blitted, for callers that keep the previous frame on screen.
+           Returns the list of screen rectangles that changed."""
+        if self._surface is None:
+            self.build_surface()
+            full = True
+        cache = self._surface
+        offset_x, offset_y = MAZE_OFFSET
+        dirty_rects = []
+        for index in self.pop_dirty_tiles():
+            row, col = divmod(index, self.cols)
+            x = col * TILE_SIZE
+            y = row * TILE_SIZE
+            self.draw_tile(cache, self.tiles[index], x, y)
+            dirty_rects.append(pygame.Rect(offset_x + x, offset_y + y, TILE_SIZE, TILE_SIZE))
+        if full:
+            surface.blit(cache, MAZE_OFFSET)
+        elif dirty_rects:
+            surface.blits([(cache, rect, rect.move(-offset_x, -offset_y)) for rect in dirty_rects], doreturn=False)
+        return dirty_rects
 
 def initialize_maze():
     """Initialize and return a Maze instance."""
@@ -147,6 +448,60 @@ def main():
     for row, col in tunnel_positions:
         assert maze.is_tunnel(row, col), f"Cell at ({row}, {col}) should be a tunnel."
     
+    # Test the encoded tile store and the unchecked accessor.
+    assert len(maze.tiles) == maze.rows * maze.cols, "Tile store should hold one byte per cell."
+    assert maze.tile_at(0, 0) & FLAG_BLOCKED, "Wall tile should carry the blocked flag."
+    assert maze.tile_at(1, 0) & TILE_TYPE_MASK == TILE_TUNNEL, "Tunnel tile should carry the tunnel type code."
+    assert maze.tile_at(1, 2) == TILE_EMPTY, "Consumed pellet tile should be empty."
+    assert maze.tile_at(1, 7) & FLAG_PELLET, "Pellet tile should carry the pellet flag."
+    assert maze.layout[1] == list("T      P T"), "Decoded layout should reflect the consumed pellet."
+    assert not maze.is_wall(-1, 0) and not maze.is_pellet(0, 10), "Out-of-bound cells should not match any type."
+
+    # Test the pellet index queries.
+    assert sorted(maze.remaining_pellets()) == [(1, 7), (4, 1), (4, 8), (7, 2), (7, 7)], "Remaining pellets mismatch."
+    assert maze.nearest_pellet(1, 3) == (1, 7), "Nearest pellet to (1, 3) should be (1, 7)."
+    assert maze.nearest_pellet(6, 2) == (7, 2), "Nearest pellet to (6, 2) should be (7, 2)."
+    assert sorted(maze.pellets_in_region(4, 0, 7, 4)) == [(4, 1), (7, 2)], "Pellets in region mismatch."
+    assert sorted(maze.pellets_in_region(-5, -5, 50, 50)) == sorted(maze.remaining_pellets()), "Clamped region should cover the whole maze."
+    assert maze.pellets_in_region(2, 2, 3, 3) == [], "Region without pellets should be empty."
+    assert not maze.consume_pellet(1, 2), "Consuming an already eaten pellet should fail."
+    assert maze.pellet_count() == expected_initial_pellet_count - 1, "Failed consumption should not change the count."
+
+    # Test tunnel pairing, neighbors and junctions.
+    assert maze.tunnel_pairs() == [((1, 0), (1, 9)), ((7, 0), (7, 9))], "Tunnel pairs mismatch."
+    assert maze.tunnel_partner(1, 9) == (1, 0), "Tunnel partner lookup failed."
+    assert maze.tunnel_partner(3, 3) is None, "Non-tunnel cells should have no partner."
+    assert sorted(maze.open_neighbors(1, 0)) == [(1, 1), (1, 9)], "Tunnel neighbors should include the wrap cell."
+    assert sorted(maze.open_neighbors(3, 2)) == [(3, 1), (3, 3)], "Corridor neighbors mismatch."
+    assert (3, 6) in maze.junctions() and (3, 7) not in maze.junctions(), "Junction detection mismatch."
+    assert len(maze.junctions()) == 12, "Default maze should have 12 junctions."
+
+    # Test the per-tile exit masks.
+    assert maze.exit_mask(0, 0) == 0, "Walls should have no exits."
+    assert maze.exit_mask(3, 2) == EXIT_LEFT | EXIT_RIGHT, "Corridor exits mismatch."
+    assert maze.exit_mask(1, 0) == EXIT_LEFT | EXIT_RIGHT, "Tunnel wrap should count as an exit off the edge."
+    assert maze.exit_count(3, 6) == 3, "Junction exit count mismatch."
+    for row in range(maze.rows):
+        for col in range(maze.cols):
+            if not maze.is_wall(row, col):
+                assert maze.exit_count(row, col) == len(maze.open_neighbors(row, col)), f"Exit count mismatch at ({row}, {col})."
+
+    # Test rebuilding a maze from its encoded tile store.
+    copy = Maze.from_tiles(maze.rows, maze.cols, maze.tiles)
+    assert copy.layout == maze.layout and copy.pellet_count() == maze.pellet_count(), "from_tiles copy mismatch."
+    copy.consume_pellet(4, 1)
+    assert maze.is_pellet(4, 1), "from_tiles should copy the tile store."
+
+    # Test building a maze from a custom layout.
+    custom = Maze(["WPW", "T T"])
+    assert (custom.rows, custom.cols) == (2, 3), "Custom maze dimensions mismatch."
+    assert custom.pellet_count() == 1, "Custom maze pellet count mismatch."
+    try:
+        Maze(["WX"])
+        assert False, "Unknown cell characters should be rejected."
+    except ValueError:
+        pass
+
     # Test grid_to_screen coordinate transformation.
     screen_coord = maze.grid_to_screen(0, 0)
     assert screen_coord == MAZE_OFFSET, "Grid to screen conversion failed for cell (0, 0)."
@@ -156,6 +511,23 @@ def main():
     
     print("\nMaze Layout after consuming one pellet at (1,2):")
     maze.render()
+
+    # Test drawing through the cached surface and dirty-tile patching.
+    screen = pygame.Surface((MAZE_OFFSET[0] + maze.cols * TILE_SIZE, MAZE_OFFSET[1] + maze.rows * TILE_SIZE))
+    assert maze.draw(screen) == [], "First draw should rebuild the cache and report no patched tiles."
+    pellet_x, pellet_y = maze.grid_to_screen(1, 7)
+    pellet_center = (pellet_x + TILE_SIZE // 2, pellet_y + TILE_SIZE // 2)
+    assert tuple(screen.get_at(pellet_center))[:3] == Maze.PELLET_COLOR, "Pellet should be drawn from the cache."
+    maze.consume_pellet(1, 7)
+    screen.fill((255, 0, 0))
+    dirty = maze.draw(screen, full=False)
+    assert dirty == [pygame.Rect(pellet_x, pellet_y, TILE_SIZE, TILE_SIZE)], "Only the eaten pellet tile should be dirty."
+    assert tuple(screen.get_at(pellet_center))[:3] == Maze.BACKGROUND_COLOR, "Eaten pellet should be erased from the screen."
+    wall_x, wall_y = maze.grid_to_screen(0, 0)
+    assert tuple(screen.get_at((wall_x, wall_y)))[:3] == (255, 0, 0), "Partial draw should leave untouched tiles alone."
+    maze.draw(screen)
+    assert tuple(screen.get_at((wall_x, wall_y)))[:3] == Maze.WALL_COLOR, "Full draw should blit the whole cached maze."
+    assert maze.draw(screen) == [], "No tiles should be dirty without further changes."
     
     print("\nAll tests passed successfully.")
 
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+import random
+import time
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from maze import Maze, CELL_TO_TILE, FLAG_BLOCKED, FLAG_TUNNEL
+
+WALL = CELL_TO_TILE['W']
+EMPTY = CELL_TO_TILE[' ']
+PELLET = CELL_TO_TILE['P']
+TUNNEL = CELL_TO_TILE['T']
+
+MIN_ROWS = 5
+MIN_COLS = 5
+
+def _find(parents, cell):
+    while parents[cell] != cell:
+        # Path halving keeps the union-find trees shallow.
+        parents[cell] = cell = parents[parents[cell]]
+    return cell
+
+def _carve(rows, cols, rng, corridor_density):
+    """Open the corridors of a maze with a randomized Kruskal spanning tree over the lattice.
+       Returns the tiles as a bytearray."""
+    tiles = bytearray([WALL]) * (rows * cols)
+
+    # Open every corridor tile with one slice assignment per lattice row.
+    lattice_rows = range(1, rows - 1, 2)
+    lattice_cols = range(1, cols - 1, 2)
+    width = len(lattice_cols)
+    for row in lattice_rows:
+        start = row * cols + 1
+        tiles[start:start + 2 * width - 1:2] = bytes([EMPTY]) * width
+
+    # Candidate walls between neighboring lattice tiles, as (tile a, wall tile, tile b).
+    walls = []
+    for row in lattice_rows:
+        base = row * cols
+        for col in lattice_cols:
+            cell = base + col
+            if col + 2 < cols - 1:
+                walls.append((cell, cell + 1, cell + 2))
+            if row + 2 < rows - 1:
+                walls.append((cell, cell + cols, cell + 2 * cols))
+    rng.shuffle(walls)
+
+    # Randomized Kruskal: carve each wall that joins two separate regions.
+    parents = list(range(rows * cols))
+    degree = bytearray(rows * cols)
+    remaining = []
+    for cell_a, wall, cell_b in walls:
+        root_a = _find(parents, cell_a)
+        root_b = _find(parents, cell_b)
+        if root_a == root_b:
+            remaining.append((cell_a, wall, cell_b))
+            continue
+        parents[root_a] = root_b
+        tiles[wall] = EMPTY
+        degree[cell_a] += 1
+        degree[cell_b] += 1
+
+    # Pac-Man mazes have no dead ends; open one extra wall at each, then add random loops.
+    for cell_a, wall, cell_b in remaining:
+        if degree[cell_a] == 1 or degree[cell_b] == 1 or rng.random() < corridor_density:
+            tiles[wall] = EMPTY
+            degree[cell_a] += 1
+            degree[cell_b] += 1
+    return tiles
+
+def _carve_numpy(rows, cols, rng, corridor_density):
+    """
+    NumPy version of _carve. Kruskal's edge-by-edge loop cannot be vectorized, so the
+    spanning tree is built with Boruvka's algorithm instead: every round, each region
+    opens its lowest-weight wall to another region, which at least halves the number of
+    regions. With distinct random weights both algorithms build the minimum spanning tree
+    for those weights, so the result is the same kind of uniformly shuffled tree.
+    """
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    tiles = np.full(rows * cols, WALL, dtype=np.uint8)
+    grid = tiles.reshape(rows, cols)
+    grid[1:rows - 1:2, 1:cols - 1:2] = EMPTY
+
+    # Lattice tiles are numbered 0..count-1; walls join two of them.
+    lattice = np.arange(rows * cols).reshape(rows, cols)[1:rows - 1:2, 1:cols - 1:2]
+    nodes = np.arange(lattice.size).reshape(lattice.shape)
+    node_a = np.concatenate([nodes[:, :-1].ravel(), nodes[:-1, :].ravel()])
+    node_b = np.concatenate([nodes[:, 1:].ravel(), nodes[1:, :].ravel()])
+    wall_tiles = np.concatenate([lattice[:, :-1].ravel() + 1, lattice[:-1, :].ravel() + cols])
+    weights = np_rng.permutation(len(wall_tiles))
+    wall_by_weight = np.argsort(weights)
+    count = lattice.size
+
+    # Boruvka: regions are labeled by a representative node until a single one remains.
+    region = np.arange(count)
+    in_tree = np.zeros(len(wall_tiles), dtype=bool)
+    no_wall = len(wall_tiles)
+    while True:
+        region_a = region[node_a]
+        region_b = region[node_b]
+        crossing = np.nonzero(region_a != region_b)[0]
+        if not len(crossing):
+            break
+        lightest = np.full(count, no_wall)
+        np.minimum.at(lightest, region_a[crossing], weights[crossing])
+        np.minimum.at(lightest, region_b[crossing], weights[crossing])
+        merging = np.nonzero(lightest < no_wall)[0]
+        chosen = wall_by_weight[lightest[merging]]
+        in_tree[chosen] = True
+        parent = np.arange(count)
+        parent[merging] = np.where(region_a[chosen] == merging, region_b[chosen], region_a[chosen])
+        # Two regions that chose the same wall point at each other; the smaller one becomes the root.
+        mutual = (parent[parent] == np.arange(count)) & (np.arange(count) < parent)
+        parent[mutual] = np.nonzero(mutual)[0]
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        region = parent[region]
+    tiles[wall_tiles[in_tree]] = EMPTY
+
+    # Random loops, then one extra wall for every dead end that is left.
+    opened = in_tree | (np_rng.random(len(wall_tiles)) < corridor_density)
+    degree = np.bincount(node_a[opened], minlength=count) + np.bincount(node_b[opened], minlength=count)
+    dead_end = degree == 1
+    candidates = np.nonzero(~opened & (dead_end[node_a] | dead_end[node_b]))[0]
+    lightest = np.full(count, no_wall)
+    for nodes_of_wall in (node_a, node_b):
+        ends = dead_end[nodes_of_wall[candidates]]
+        np.minimum.at(lightest, nodes_of_wall[candidates][ends], weights[candidates][ends])
+    lightest = lightest[dead_end]
+    opened[wall_by_weight[lightest[lightest < no_wall]]] = True
+    tiles[wall_tiles[opened]] = EMPTY
+    return bytearray(tiles.tobytes())
+
+def generate_maze(rows, cols, seed=None, corridor_density=0.2, pellet_density=1.0, tunnel_pairs=1, maze_class=Maze):
+    """
+    Generate a random Pac-Man style maze of the given size.
+
+    Corridors run between the tiles at odd (row, col) positions. A random spanning tree
+    connects all of them, so every walkable tile is reachable; dead ends are then opened
+    up, and corridor_density is the chance that each remaining wall between two corridor
+    tiles is removed to add loops. pellet_density is the chance that a walkable tile holds
+    a pellet. tunnel_pairs rows get wrap-around tunnels on the left and right edges.
+    The same seed always produces the same maze; with NumPy installed the corridors are
+    carved by _carve_numpy, so the maze for a seed differs from a pure-Python install.
+    """
+    if rows < MIN_ROWS or cols < MIN_COLS:
+        raise ValueError(f"Maze must be at least {MIN_ROWS}x{MIN_COLS}, got {rows}x{cols}.")
+    if not 0.0 <= corridor_density <= 1.0 or not 0.0 <= pellet_density <= 1.0:
+        raise ValueError("corridor_density and pellet_density must be between 0 and 1.")
+    rng = random.Random(seed)
+    if np is not None:
+        tiles = _carve_numpy(rows, cols, rng, corridor_density)
+    else:
+        tiles = _carve(rows, cols, rng, corridor_density)
+
+    # Tunnels on the left and right edge of randomly chosen corridor rows.
+    tunnel_rows = list(range(1, rows - 1, 2))
+    rng.shuffle(tunnel_rows)
+    for row in tunnel_rows[:tunnel_pairs]:
+        base = row * cols
+        tiles[base] = TUNNEL
+        tiles[base + cols - 1] = TUNNEL
+        # With an even width the column next to the right edge is not a corridor yet.
+        tiles[base + cols - 2] = EMPTY
+
+    if pellet_density >= 1.0:
+        tiles = tiles.replace(bytes([EMPTY]), bytes([PELLET]))
+    elif pellet_density > 0.0 and np is not None:
+        grid = np.frombuffer(bytes(tiles), dtype=np.uint8).copy()
+        chances = np.random.default_rng(rng.getrandbits(64)).random(grid.size)
+        grid[(grid == EMPTY) & (chances < pellet_density)] = PELLET
+        tiles = bytearray(grid.tobytes())
+    elif pellet_density > 0.0:
+        random_value = rng.random
+        for index, tile in enumerate(tiles):
+            if tile == EMPTY and random_value() < pellet_density:
+                tiles[index] = PELLET
+
+    return maze_class.from_tiles(rows, cols, tiles)
+
+def is_valid_maze(maze):
+    """
+    Return True if the maze is playable: the border is made of walls and tunnels only,
+    there is at least one walkable tile, and every walkable tile is reachable from every other.
+    """
+    rows, cols = maze.rows, maze.cols
+    for row in range(rows):
+        for col in (0, cols - 1):
+            if not maze.tile_at(row, col) & (FLAG_BLOCKED | FLAG_TUNNEL):
+                return False
+    for col in range(cols):
+        for row in (0, rows - 1):
+            if not maze.tile_at(row, col) & (FLAG_BLOCKED | FLAG_TUNNEL):
+                return False
+    walkable = [index for index, tile in enumerate(maze.tiles) if not tile & FLAG_BLOCKED]
+    if not walkable:
+        return False
+    start = divmod(walkable[0], cols)
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for neighbor in maze.open_neighbors(*queue.popleft()):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return len(seen) == len(walkable)
+
+def main():
+    # Test the smallest supported size and the default maze size.
+    for rows, cols in ((MIN_ROWS, MIN_COLS), (9, 10), (21, 28), (30, 41)):
+        maze = generate_maze(rows, cols, seed=rows * cols)
+        assert (maze.rows, maze.cols) == (rows, cols), "Generated maze has the wrong size."
+        assert is_valid_maze(maze), f"Generated {rows}x{cols} maze is not valid."
+
+    # The same seed produces the same maze; a different seed a different one.
+    first = generate_maze(31, 31, seed=7)
+    second = generate_maze(31, 31, seed=7)
+    other = generate_maze(31, 31, seed=8)
+    assert first.tiles == second.tiles, "Generation should be deterministic for a seed."
+    assert first.tiles != other.tiles, "Different seeds should produce different mazes."
+
+    # No dead ends away from the border.
+    for index, tile in enumerate(first.tiles):
+        if not tile & FLAG_BLOCKED:
+            assert len(first.open_neighbors(*divmod(index, first.cols))) >= 2, "Generated maze has a dead end."
+
+    # Tunnels come in pairs on the left and right edges.
+    tunnel_maze = generate_maze(21, 20, seed=3, tunnel_pairs=3)
+    assert len(tunnel_maze.tunnel_pairs()) == 3, "Generated maze should have three tunnel pairs."
+    assert is_valid_maze(tunnel_maze), "Maze with tunnels is not valid."
+
+    # Pellet and corridor density are respected.
+    empty = generate_maze(21, 21, seed=1, pellet_density=0.0)
+    full = generate_maze(21, 21, seed=1, pellet_density=1.0)
+    assert empty.pellet_count() == 0, "Zero pellet density should produce no pellets."
+    walkable = sum(1 for tile in full.tiles if not tile & (FLAG_BLOCKED | FLAG_TUNNEL))
+    assert full.pellet_count() == walkable, "Full pellet density should fill every walkable tile."
+    sparse = generate_maze(41, 41, seed=2, corridor_density=0.0)
+    dense = generate_maze(41, 41, seed=2, corridor_density=1.0)
+    count_open = lambda maze: sum(1 for tile in maze.tiles if not tile & FLAG_BLOCKED)
+    assert count_open(dense) > count_open(sparse), "Higher corridor density should open more walls."
+
+    for bad_size in ((4, 10), (10, 4)):
+        try:
+            generate_maze(*bad_size)
+            assert False, "Too small mazes should be rejected."
+        except ValueError:
+            pass
+
+    # Both carving paths give valid mazes.
+    for carve in (_carve, _carve_numpy) if np is not None else (_carve,):
+        for rows, cols in ((MIN_ROWS, MIN_COLS), (9, 10), (41, 60)):
+            for density in (0.0, 0.2):
+                maze = Maze.from_tiles(rows, cols, carve(rows, cols, random.Random(rows + cols), density))
+                assert is_valid_maze(maze), f"{carve.__name__} built an invalid {rows}x{cols} maze."
+                for index, tile in enumerate(maze.tiles):
+                    if not tile & FLAG_BLOCKED:
+                        assert len(maze.open_neighbors(*divmod(index, cols))) >= 2, f"{carve.__name__} left a dead end."
+
+    # Report generation time for a large maze.
+    started = time.perf_counter()
+    large = generate_maze(1000, 1000, seed=11)
+    elapsed = time.perf_counter() - started
+    print(f"Generated 1000x1000 maze with {large.pellet_count()} pellets in {elapsed:.2f} s.")
+
+    print("All maze generator tests passed.")
+
+if __name__ == "__main__":
+    main()
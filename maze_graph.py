@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+import heapq
+
+from maze import Maze, FLAG_BLOCKED, FLAG_TUNNEL, TUNNEL_WRAP_COST
+
+class MazeGraph:
+    """Navigation graph over a Maze.
+
+    Nodes are intersections, dead ends and tunnel cells. Every corridor between two
+    nodes collapses into one edge weighted by its length in tiles, and each pair of
+    tunnel cells is joined by a wrap-around edge of TUNNEL_WRAP_COST. Corridor tiles remember
+    which edge they lie on, so queries can start or end anywhere in the maze.
+    """
+    def __init__(self, maze):
+        self.maze = maze
+        self.nodes = []         # node id -> (row, col)
+        self.node_index = {}    # (row, col) -> node id
+        self.edges = []         # node id -> list of (neighbor id, weight, first step (row, col))
+        self.corridors = {}     # (row, col) -> (edge id, node a, distance to a, node b, distance to b)
+        self.edge_count = 0
+        self.build()
+
+    def _step_neighbors(self, row, col):
+        """Walkable cells one tile away from (row, col), excluding tunnel wrap-around."""
+        maze = self.maze
+        neighbors = []
+        for next_row, next_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= next_row < maze.rows and 0 <= next_col < maze.cols and not maze.tile_at(next_row, next_col) & FLAG_BLOCKED:
+                neighbors.append((next_row, next_col))
+        return neighbors
+
+    def _add_node(self, cell):
+        node = len(self.nodes)
+        self.nodes.append(cell)
+        self.node_index[cell] = node
+        self.edges.append([])
+        return node
+
+    def _add_edge(self, node_a, node_b, weight, step_from_a, step_from_b):
+        self.edges[node_a].append((node_b, weight, step_from_a))
+        self.edges[node_b].append((node_a, weight, step_from_b))
+        self.edge_count += 1
+        return self.edge_count - 1
+
+    def _walk_edges(self, node):
+        """Follow every corridor leaving node until it reaches another node."""
+        start = self.nodes[node]
+        for first in self._step_neighbors(*start):
+            if first in self.node_index:
+                other = self.node_index[first]
+                # Adjacent nodes are seen from both sides; record the edge once.
+                if node < other:
+                    self._add_edge(node, other, 1, first, start)
+                continue
+            if first in self.corridors:
+                continue
+            path = [first]
+            previous, current = start, first
+            while current not in self.node_index:
+                following = [cell for cell in self._step_neighbors(*current) if cell != previous]
+                if not following:
+                    break
+                previous, current = current, following[0]
+                if current not in self.node_index:
+                    path.append(current)
+            end = self.node_index[current]
+            length = len(path) + 1
+            edge = self._add_edge(node, end, length, first, path[-1] if path else start)
+            for distance, cell in enumerate(path, 1):
+                self.corridors[cell] = (edge, node, distance, end, length - distance)
+
+    def build(self):
+        """Build the nodes and edges from the maze's current walls and tunnels."""
+        maze = self.maze
+        cols = maze.cols
+        for index, tile in enumerate(maze.tiles):
+            if tile & FLAG_BLOCKED:
+                continue
+            cell = divmod(index, cols)
+            if tile & FLAG_TUNNEL or len(self._step_neighbors(*cell)) != 2:
+                self._add_node(cell)
+        for node in range(len(self.nodes)):
+            self._walk_edges(node)
+        # Corridors that form a closed loop have no node yet; promote one of their cells.
+        for index, tile in enumerate(maze.tiles):
+            cell = divmod(index, cols)
+            if not tile & FLAG_BLOCKED and cell not in self.node_index and cell not in self.corridors:
+                self._walk_edges(self._add_node(cell))
+        for first, second in maze.tunnel_pairs():
+            self._add_edge(self.node_index[first], self.node_index[second], TUNNEL_WRAP_COST, second, first)
+
+    def node_count(self):
+        """Return the number of nodes in the graph."""
+        return len(self.nodes)
+
+    def _anchors(self, cell):
+        """Return [(node, distance)] for the graph nodes a cell is attached to."""
+        if cell in self.node_index:
+            return [(self.node_index[cell], 0)]
+        info = self.corridors.get(cell)
+        if info is None:
+            return []
+        _, node_a, distance_a, node_b, distance_b = info
+        return [(node_a, distance_a), (node_b, distance_b)]
+
+    def shortest_path(self, start, goal):
+        """Return (distance, [node cells]) for the shortest route between two walkable cells,
+           or (None, []) if goal cannot be reached. Runs Dijkstra over the graph nodes only."""
+        if start == goal:
+            return 0, []
+        goal_anchors = self._anchors(goal)
+        if not goal_anchors:
+            return None, []
+        best_direct = None
+        start_info = self.corridors.get(start)
+        goal_info = self.corridors.get(goal)
+        if start_info is not None and goal_info is not None and start_info[0] == goal_info[0]:
+            best_direct = abs(start_info[2] - goal_info[2])
+        goal_costs = dict()
+        for node, distance in goal_anchors:
+            if node not in goal_costs or distance < goal_costs[node]:
+                goal_costs[node] = distance
+        distances = {}
+        previous = {}
+        queue = []
+        for node, distance in self._anchors(start):
+            if node not in distances or distance < distances[node]:
+                distances[node] = distance
+                heapq.heappush(queue, (distance, node))
+        best = best_direct
+        best_node = None
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance > distances[node] or (best is not None and distance >= best):
+                continue
+            if node in goal_costs and (best is None or distance + goal_costs[node] < best):
+                best = distance + goal_costs[node]
+                best_node = node
+            for neighbor, weight, _ in self.edges[node]:
+                candidate = distance + weight
+                if neighbor not in distances or candidate < distances[neighbor]:
+                    distances[neighbor] = candidate
+                    previous[neighbor] = node
+                    heapq.heappush(queue, (candidate, neighbor))
+        if best is None:
+            return None, []
+        path = []
+        node = best_node
+        while node is not None:
+            path.append(self.nodes[node])
+            node = previous.get(node)
+        path.reverse()
+        return best, path
+
+def build_graph(maze):
+    """Build and return the navigation graph for a maze."""
+    return MazeGraph(maze)
+
+def main():
+    maze = Maze()
+    graph = build_graph(maze)
+    walkable = sum(1 for tile in maze.tiles if not tile & FLAG_BLOCKED)
+    print(f"Graph: {graph.node_count()} nodes, {graph.edge_count} edges for {walkable} walkable tiles.")
+
+    # Every walkable tile is either a node or on a corridor.
+    assert graph.node_count() < walkable, "The graph should have fewer nodes than walkable tiles."
+    assert graph.node_count() + len(graph.corridors) == walkable, "Every walkable tile should map onto the graph."
+
+    # Tunnel cells are nodes joined by wrap-around edges.
+    for first, second in maze.tunnel_pairs():
+        node = graph.node_index[first]
+        assert (graph.node_index[second], TUNNEL_WRAP_COST, second) in graph.edges[node], "Tunnel pair should have a wrap-around edge."
+
+    # Junctions from the maze are nodes.
+    for cell in maze.junctions():
+        assert cell in graph.node_index, f"Junction {cell} should be a graph node."
+
+    # Shortest paths match a plain breadth-first search where the tunnel wrap costs TUNNEL_WRAP_COST.
+    def reference_distance(start, goal):
+        from collections import deque
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            for neighbor in maze.open_neighbors(*cell):
+                cost = TUNNEL_WRAP_COST if neighbor == maze.tunnel_partner(*cell) else 1
+                if neighbor not in distances or distances[cell] + cost < distances[neighbor]:
+                    distances[neighbor] = distances[cell] + cost
+                    if cost:
+                        queue.append(neighbor)
+                    else:
+                        queue.appendleft(neighbor)
+        return distances.get(goal)
+
+    cells = [divmod(i, maze.cols) for i, tile in enumerate(maze.tiles) if not tile & FLAG_BLOCKED]
+    for start in cells:
+        for goal in cells:
+            distance, _ = graph.shortest_path(start, goal)
+            assert distance == reference_distance(start, goal), f"Distance mismatch from {start} to {goal}."
+
+    distance, path = graph.shortest_path((1, 2), (7, 2))
+    assert path and path[0] in graph.node_index and path[-1] in graph.node_index, "Path should list graph nodes."
+
+    # A closed loop without junctions still gets a node.
+    loop = Maze(["WWWWW", "W   W", "W W W", "W   W", "WWWWW"])
+    loop_graph = build_graph(loop)
+    assert loop_graph.node_count() == 1, "A pure loop should be represented by a single node."
+    assert loop_graph.shortest_path((1, 1), (3, 3))[0] == 4, "Loop distance mismatch."
+
+    print("All maze graph tests passed.")
+
+if __name__ == "__main__":
+    main()
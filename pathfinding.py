@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+from array import array
+from collections import OrderedDict, deque
+
+from maze import Maze, FLAG_BLOCKED, TUNNEL_WRAP_COST
+
+def is_walkable(maze, tile):
+    """Return True if the (row, col) tile is inside the maze and not a wall."""
+    row, col = tile
+    return 0 <= row < maze.rows and 0 <= col < maze.cols and not maze.tile_at(row, col) & FLAG_BLOCKED
+
+def nearest_walkable(maze, tile):
+    """
+    Return the walkable tile closest to a (row, col) that may be on a wall or outside
+    the maze, such as a scatter corner or a target ahead of Pac-Man. Searches outward
+    from the tile clamped into the maze; returns None if the maze has no walkable tile.
+    """
+    row = min(max(tile[0], 0), maze.rows - 1)
+    col = min(max(tile[1], 0), maze.cols - 1)
+    start = (row, col)
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        if is_walkable(maze, current):
+            return current
+        row, col = current
+        for neighbor in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if neighbor not in seen and 0 <= neighbor[0] < maze.rows and 0 <= neighbor[1] < maze.cols:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return None
+
+def step_cost(maze, tile, next_tile):
+    """Return the cost of one move between neighboring tiles: TUNNEL_WRAP_COST through a
+       tunnel wrap, 1 otherwise."""
+    return TUNNEL_WRAP_COST if next_tile == maze.tunnel_partner(*tile) else 1
+
+def _search(maze, start, goal=None):
+    """
+    0-1 breadth-first search from start: ordinary steps cost 1 and tunnel wraps cost
+    TUNNEL_WRAP_COST, so zero-cost moves go to the front of the queue. Stops once goal is
+    settled. Returns (distances, previous) dicts keyed by tile.
+    """
+    distances = {start: 0}
+    previous = {start: None}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        if current == goal:
+            break
+        distance = distances[current]
+        for neighbor in maze.open_neighbors(*current):
+            cost = step_cost(maze, current, neighbor)
+            if neighbor not in distances or distance + cost < distances[neighbor]:
+                distances[neighbor] = distance + cost
+                previous[neighbor] = current
+                if cost:
+                    queue.append(neighbor)
+                else:
+                    queue.appendleft(neighbor)
+    return distances, previous
+
+def find_path(maze, start, goal):
+    """
+    Return the cheapest list of tiles leading from start (excluded) to goal (included),
+    stepping through tunnel wraps at TUNNEL_WRAP_COST, the same cost maze_graph and
+    distance_table use. Returns [] if start is goal and None if goal cannot be reached.
+    """
+    if start == goal:
+        return []
+    _, previous = _search(maze, start, goal)
+    if goal not in previous:
+        return None
+    path = []
+    step = goal
+    while step != start:
+        path.append(step)
+        step = previous[step]
+    path.reverse()
+    return path
+
+def path_cost(maze, start, path):
+    """Return the total cost of following path (as returned by find_path) from start."""
+    cost = 0
+    tile = start
+    for step in path:
+        cost += step_cost(maze, tile, step)
+        tile = step
+    return cost
+
+def step_direction(tile, next_tile):
+    """Return the (dx, dy) of one move between neighboring tiles, treating a tunnel wrap
+       as a step off the edge it leaves from."""
+    d_row = next_tile[0] - tile[0]
+    d_col = next_tile[1] - tile[1]
+    if abs(d_col) > 1:
+        d_col = -1 if d_col > 0 else 1
+    if abs(d_row) > 1:
+        d_row = -1 if d_row > 0 else 1
+    return (d_col, d_row)
+
+class PathCache:
+    """
+    Shortest-path lookups over a maze, cached by (start tile, target tile).
+
+    A search from start to target also yields the shortest path from every tile along
+    the way, so the next step for each of those (tile, target) pairs is cached at once.
+    A ghost following its path then costs one lookup per tile, and a new search only
+    runs when its target moves to another tile. Entries are evicted least recently
+    used first once there are more than max_entries. Walls never change during a
+    level, so entries never go stale; call clear() after loading a new layout.
+    """
+    def __init__(self, maze, max_entries=4096):
+        self.maze = maze
+        self.max_entries = max_entries
+        self.next_steps = OrderedDict()  # (tile, target) -> next tile, or None if unreachable
+        self.searches = 0
+
+    def clear(self):
+        """Drop every cached step."""
+        self.next_steps.clear()
+
+    def _store(self, key, next_tile):
+        next_steps = self.next_steps
+        next_steps[key] = next_tile
+        next_steps.move_to_end(key)
+        if len(next_steps) > self.max_entries:
+            next_steps.popitem(last=False)
+
+    def next_tile(self, start, target):
+        """Return the tile to move to from start towards target, start itself once it is
+           reached, or None if target cannot be reached. target is snapped to the nearest
+           walkable tile first. A start on a wall or outside the maze gives the nearest
+           walkable tile, so whatever stands there is moved back onto the maze."""
+        if not is_walkable(self.maze, start):
+            return nearest_walkable(self.maze, start)
+        goal = target if is_walkable(self.maze, target) else nearest_walkable(self.maze, target)
+        if goal is None or start == goal:
+            return start if goal is not None else None
+        key = (start, goal)
+        if key in self.next_steps:
+            self.next_steps.move_to_end(key)
+            return self.next_steps[key]
+        self.searches += 1
+        path = find_path(self.maze, start, goal)
+        if path is None:
+            self._store(key, None)
+            return None
+        tile = start
+        for step in path:
+            self._store((tile, goal), step)
+            tile = step
+        return path[0]
+
+    def next_direction(self, start, target):
+        """Return the (dx, dy) of the first move from start towards target, or (0, 0) if
+           start is already there or target cannot be reached."""
+        step = self.next_tile(start, target)
+        if step is None or step == start:
+            return (0, 0)
+        return step_direction(start, step)
+
+    def path(self, start, target):
+        """Return the cached route from start to target as a list of tiles (start excluded)."""
+        route = []
+        tile = start
+        while True:
+            step = self.next_tile(tile, target)
+            if step is None:
+                return None
+            if step == tile:
+                return route
+            route.append(step)
+            tile = step
+
+class FlowField:
+    """
+    Next steps towards one goal tile from every tile of the maze at once.
+
+    A single 0-1 breadth-first search outward from the goal records, for each tile it
+    reaches, the neighbor it was reached from; that neighbor is the next step on a
+    cheapest path back to the goal. Any number of ghosts chasing the same goal then
+    read their move in O(1), and the search only reruns when the goal changes tile.
+    A goal on a wall or outside the maze is searched from the nearest walkable tile,
+    as PathCache does; goal keeps the tile asked for.
+    """
+    NO_STEP = -1
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.goal = None
+        self.next_steps = self._blank()  # flat index -> flat index of the next step
+        self.distances = self._blank()
+        self.searches = 0
+
+    def _blank(self):
+        return array("i", [self.NO_STEP]) * (self.maze.rows * self.maze.cols)
+
+    def update(self, goal):
+        """Point the field at a (row, col) goal. Does nothing if it already points there.
+           Returns True if the field was recomputed."""
+        if goal == self.goal:
+            return False
+        self.goal = goal
+        maze = self.maze
+        cols = maze.cols
+        self.next_steps = next_steps = self._blank()
+        self.distances = distances = self._blank()
+        self.searches += 1
+        seed = goal if is_walkable(maze, goal) else nearest_walkable(maze, goal)
+        if seed is None:
+            return True
+        start = seed[0] * cols + seed[1]
+        next_steps[start] = start
+        distances[start] = 0
+        queue = deque([seed])
+        while queue:
+            current = queue.popleft()
+            current_index = current[0] * cols + current[1]
+            distance = distances[current_index]
+            for row, col in maze.open_neighbors(*current):
+                index = row * cols + col
+                # Moves are symmetric, so the cost from the neighbor back to current is the same.
+                cost = step_cost(maze, current, (row, col))
+                if distances[index] == self.NO_STEP or distance + cost < distances[index]:
+                    distances[index] = distance + cost
+                    next_steps[index] = current_index
+                    if cost:
+                        queue.append((row, col))
+                    else:
+                        queue.appendleft((row, col))
+        return True
+
+    def next_tile(self, tile):
+        """Return the tile to move to from tile towards the goal, the goal itself once it
+           is reached, or None if the goal cannot be reached from tile."""
+        if not is_walkable(self.maze, tile):
+            return None
+        step = self.next_steps[tile[0] * self.maze.cols + tile[1]]
+        if step == self.NO_STEP:
+            return None
+        return divmod(step, self.maze.cols)
+
+    def distance(self, tile):
+        """Return the cost of the cheapest path from tile to the goal, or None if it cannot be reached."""
+        if not is_walkable(self.maze, tile):
+            return None
+        distance = self.distances[tile[0] * self.maze.cols + tile[1]]
+        return None if distance == self.NO_STEP else distance
+
+def main():
+    maze = Maze()
+
+    # Breadth-first paths are shortest and respect walls.
+    path = find_path(maze, (1, 1), (3, 1))
+    assert path == [(2, 1), (3, 1)], "Path down the left corridor mismatch."
+    assert find_path(maze, (1, 1), (1, 1)) == [], "Path to the start tile should be empty."
+    for tile in path:
+        assert is_walkable(maze, tile), "Path crosses a wall."
+
+    # Tunnel wraps are taken when they are shorter.
+    path = find_path(maze, (1, 1), (1, 8))
+    assert path == [(1, 0), (1, 9), (1, 8)], "Path should wrap through the tunnel."
+    assert step_direction((1, 0), (1, 9)) == (-1, 0), "Wrapping left should keep moving left."
+    assert step_direction((1, 9), (1, 0)) == (1, 0), "Wrapping right should keep moving right."
+
+    # Unreachable goals and targets on walls.
+    split = Maze(["WWWWW", "W W W", "WWWWW"])
+    assert find_path(split, (1, 1), (1, 3)) is None, "Disconnected tiles should have no path."
+    assert nearest_walkable(maze, (0, 0)) in ((1, 0), (0, 1), (1, 1)), "Nearest walkable tile to a corner mismatch."
+    assert nearest_walkable(maze, (-5, 50)) is not None, "Targets outside the maze should be clamped."
+
+    # The cache answers every tile along a path with one search.
+    cache = PathCache(maze)
+    assert cache.next_direction((3, 1), (7, 8)) != (0, 0), "Direction towards a reachable target expected."
+    assert cache.searches == 1, "First lookup should run one search."
+    route = cache.path((3, 1), (7, 8))
+    assert route == find_path(maze, (3, 1), (7, 8)), "Cached route should match the direct search."
+    assert cache.searches == 1, "Following the cached path should not search again."
+    assert cache.next_direction((7, 8), (7, 8)) == (0, 0), "At the target there is no move."
+    assert cache.next_direction((1, 1), (0, 0)) in ((-1, 0), (0, 0)), "Wall targets should be snapped to a walkable tile."
+    assert PathCache(split).next_direction((1, 1), (1, 3)) == (0, 0), "Unreachable targets should give no move."
+    for start in ((1, 10), (-1, 3), (0, 0)):
+        step = cache.next_tile(start, (7, 8))
+        assert step == nearest_walkable(maze, start) and is_walkable(maze, step), \
+            f"A start off the maze or on a wall at {start} should give the nearest walkable tile."
+
+    # A new target tile triggers a new search; the cache stays bounded.
+    searches = cache.searches
+    cache.next_direction((3, 1), (5, 8))
+    assert cache.searches == searches + 1, "A new target tile should run a new search."
+    small = PathCache(maze, max_entries=5)
+    for goal in ((7, 8), (5, 8), (1, 8), (3, 5)):
+        small.next_direction((3, 1), goal)
+        assert len(small.next_steps) <= 5, "Path cache exceeded its limit."
+
+    # The flow field agrees with per-ghost searches from every tile.
+    field = FlowField(maze)
+    assert field.update((7, 8)) and not field.update((7, 8)), "The field should only be recomputed for a new goal."
+    assert field.searches == 1, "Repeated updates for the same goal should not search."
+    for index, tile in enumerate(maze.tiles):
+        start = divmod(index, maze.cols)
+        if tile & FLAG_BLOCKED:
+            assert field.next_tile(start) is None, "Walls should have no next step."
+            continue
+        path = find_path(maze, start, (7, 8))
+        cost = path_cost(maze, start, path)
+        assert field.distance(start) == cost, f"Flow field distance mismatch at {start}."
+        step = field.next_tile(start)
+        if path:
+            assert step in maze.open_neighbors(*start) and field.distance(step) == cost - step_cost(maze, start, step), f"Flow field step mismatch at {start}."
+        else:
+            assert step == start, "The goal's next step should be itself."
+    field.update((1, 3))
+    assert field.searches == 2 and field.distance((1, 3)) == 0, "A new goal should recompute the field."
+    split_field = FlowField(split)
+    split_field.update((1, 1))
+    assert split_field.next_tile((1, 3)) is None, "Unreachable tiles should have no next step."
+
+    # Goals on a wall or outside the maze are snapped like PathCache targets.
+    for goal in ((1, -1), (0, 0), (-5, 50)):
+        field.update(goal)
+        assert field.goal == goal, "The field should keep the goal it was pointed at."
+        for start in ((3, 1), (7, 8)):
+            assert field.next_tile(start) is not None, f"A goal at {goal} should still give moves."
+            assert field.next_tile(start) == cache.next_tile(start, goal), \
+                f"Flow field and path cache disagree on a snapped goal at {goal}."
+
+    # Path costs agree with the distance table and the junction graph, tunnel wraps included.
+    import distance_table
+    import maze_graph
+    table = distance_table.DistanceTable.build(maze)
+    graph = maze_graph.build_graph(maze)
+    cells = [divmod(index, maze.cols) for index, tile in enumerate(maze.tiles) if not tile & FLAG_BLOCKED]
+    for start in cells:
+        field.update(start)
+        for goal in cells:
+            cost = path_cost(maze, start, find_path(maze, start, goal))
+            assert cost == table.distance(start, goal), f"Path cost from {start} to {goal} disagrees with the distance table."
+            assert cost == graph.shortest_path(start, goal)[0], f"Path cost from {start} to {goal} disagrees with the maze graph."
+            assert cost == field.distance(goal), f"Flow field cost from {goal} to {start} disagrees with find_path."
+
+    print("All pathfinding tests passed.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+import pygame
+
+try:
+    from config import SPRITE_WIDTH, SPRITE_HEIGHT
+except Exception:
+    SPRITE_WIDTH = 32
+    SPRITE_HEIGHT = 32
+
+try:
+    from config import HUD_FONT, HUD_FONT_SIZE, HUD_COLOR
+except Exception:
+    HUD_FONT = None  # Use default system font if not provided
+    HUD_FONT_SIZE = 24
+    HUD_COLOR = (255, 255, 255)
+
+from maze import Maze, TILE_SIZE, TILE_EMPTY, TILE_WALL, TILE_PELLET, TILE_TUNNEL
+from asset_manager import FACING_ANGLES
+from ui import HUD_GLYPHS
+
+# Characters pre-rendered into the atlas for HUD text: every character the HUD lines use.
+GLYPHS = HUD_GLYPHS
+
+class TextureAtlas:
+    """
+    Packs many small images into one surface and remembers where each one went.
+    Everything drawn from the atlas uses the same source surface, so a whole frame of
+    sprites can be submitted to pygame with a single Surface.blits() call.
+    """
+    def __init__(self, padding=1):
+        self.padding = padding
+        self.images = {}
+        self.rects = {}
+        self.surface = None
+
+    def add(self, name, image):
+        """Queue an image to be packed under name. Call pack() once all images are added."""
+        self.images[name] = image
+
+    def pack(self, max_width=1024):
+        """
+        Place every queued image with a shelf packer and render the atlas surface.
+        Images are sorted tallest first and laid out left to right in rows ("shelves")
+        no wider than max_width. Returns the atlas surface.
+        """
+        padding = self.padding
+        order = sorted(self.images, key=lambda name: self.images[name].get_height(), reverse=True)
+        x = y = shelf_height = width = 0
+        rects = {}
+        for name in order:
+            image_width, image_height = self.images[name].get_size()
+            if x and x + image_width > max_width:
+                y += shelf_height + padding
+                x = shelf_height = 0
+            rects[name] = pygame.Rect(x, y, image_width, image_height)
+            x += image_width + padding
+            shelf_height = max(shelf_height, image_height)
+            width = max(width, x)
+        surface = pygame.Surface((max(width, 1), max(y + shelf_height, 1)), pygame.SRCALPHA)
+        surface.blits([(self.images[name], rect) for name, rect in rects.items()], doreturn=False)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self.rects = rects
+        self.surface = surface
+        return surface
+
+    def __contains__(self, name):
+        return name in self.rects
+
+    def blit_sequence(self, items):
+        """Turn (name, destination) pairs into the (source, destination, area) triples Surface.blits() takes."""
+        source = self.surface
+        rects = self.rects
+        return [(source, destination, rects[name]) for name, destination in items]
+
+    def draw(self, surface, items):
+        """Blit every (name, destination) pair onto surface in one batch."""
+        surface.blits(self.blit_sequence(items), doreturn=False)
+
+def tile_image(maze_class, tile_type):
+    """Render one maze tile type with the colors of maze_class."""
+    image = pygame.Surface((TILE_SIZE, TILE_SIZE))
+    maze_class.paint_tile(image, tile_type, 0, 0)
+    return image
+
+def pellet_image():
+    image = pygame.Surface((7, 7), pygame.SRCALPHA)
+    pygame.draw.circle(image, (255, 255, 255), (3, 3), 3)
+    return image
+
+def bonus_image():
+    image = pygame.Surface((SPRITE_WIDTH, SPRITE_HEIGHT), pygame.SRCALPHA)
+    image.fill((0, 255, 0))
+    return image
+
+def build_sprite_atlas(asset_manager, maze_class=Maze, font=None, glyphs=GLYPHS):
+    """
+    Build the game's atlas. Names are:
+      ("player", direction)    player sprite for each facing direction
+      ("ghost", vulnerable)    ghost sprite, normal and vulnerable
+      ("tile", tile_type)      maze tile of each type, drawn with maze_class's colors
+      "pellet", "bonus"        pickup sprites
+      ("glyph", character)     HUD characters rendered with font, if one is available
+    """
+    atlas = TextureAtlas()
+    for direction in FACING_ANGLES:
+        atlas.add(("player", direction), asset_manager.player_sprite(direction))
+    for vulnerable in (False, True):
+        atlas.add(("ghost", vulnerable), asset_manager.ghost_sprite(vulnerable))
+    for tile_type in (TILE_EMPTY, TILE_WALL, TILE_PELLET, TILE_TUNNEL):
+        atlas.add(("tile", tile_type), tile_image(maze_class, tile_type))
+    atlas.add("pellet", pellet_image())
+    atlas.add("bonus", bonus_image())
+    if font is None and pygame.font.get_init():
+        if HUD_FONT:
+            font = pygame.font.Font(HUD_FONT, HUD_FONT_SIZE)
+        else:
+            font = pygame.font.SysFont(None, HUD_FONT_SIZE)
+    if font is not None:
+        for character in glyphs:
+            atlas.add(("glyph", character), font.render(character, True, HUD_COLOR))
+    atlas.pack()
+    return atlas
+
+def main():
+    import asset_manager as asset_module
+    import maze as maze_module
+
+    pygame.init()
+
+    # Test shelf packing: every image gets its own non-overlapping rect inside the atlas.
+    atlas = TextureAtlas(padding=1)
+    for i in range(40):
+        image = pygame.Surface((10 + i % 7 * 5, 8 + i % 5 * 6), pygame.SRCALPHA)
+        image.fill((i * 6, 255 - i * 6, 100, 255))
+        atlas.add(i, image)
+    surface = atlas.pack(max_width=128)
+    assert surface.get_width() <= 128, "Atlas should respect the maximum width."
+    bounds = surface.get_rect()
+    rects = list(atlas.rects.values())
+    for index, rect in enumerate(rects):
+        assert bounds.contains(rect), "Packed image lies outside the atlas."
+        assert rect.collidelist(rects[index + 1:]) == -1, "Packed images overlap."
+    for name, rect in atlas.rects.items():
+        assert surface.get_at(rect.topleft) == atlas.images[name].get_at((0, 0)), "Packed pixels mismatch."
+
+    # Test the game atlas and batched drawing.
+    manager = asset_module.AssetManager()
+    game_atlas = build_sprite_atlas(manager)
+    for name in (("player", (1, 0)), ("ghost", True), ("tile", TILE_WALL), "pellet", "bonus"):
+        assert name in game_atlas, f"Atlas is missing {name}."
+    if pygame.font.get_init():
+        for character in "Score: Lives: Level: 0123456789":
+            assert ("glyph", character) in game_atlas, f"Atlas is missing the HUD glyph {character!r}."
+        assert len(GLYPHS) == len(set(GLYPHS)), "HUD glyphs should be packed once each."
+
+        # The HUD draws its lines from the atlas glyphs instead of rendering them with the font.
+        import ui
+        class NoFont:
+            def render(self, *args):
+                raise AssertionError("HUD lines should be drawn from the atlas, not rendered.")
+        hud = ui.UIManager(score=120, lives=2, level=3)
+        hud.font = NoFont()
+        hud.atlas = game_atlas
+        hud_screen = pygame.Surface((300, 120))
+        hud.draw(hud_screen)
+        left, top = ui.SCORE_POS
+        lit = [hud_screen.get_at((x, y)) for x in range(left, left + 60) for y in range(top, top + HUD_FONT_SIZE)]
+        assert any(tuple(color)[:3] != (0, 0, 0) for color in lit), "HUD text should be drawn from the atlas."
+    screen = pygame.Surface((200, 200))
+    game_atlas.draw(screen, [(("tile", TILE_WALL), (0, 0)), ("bonus", (100, 100))])
+    assert tuple(screen.get_at((0, 0)))[:3] == Maze.WALL_COLOR, "Wall tile should be drawn from the atlas."
+    assert tuple(screen.get_at((110, 110)))[:3] == (0, 255, 0), "Bonus sprite should be drawn from the atlas."
+
+    # A maze drawn through the atlas matches one drawn tile by tile.
+    plain = maze_module.Maze()
+    batched = maze_module.Maze()
+    batched.atlas = game_atlas
+    expected = plain.build_surface()
+    actual = batched.build_surface()
+    for row in range(plain.rows):
+        for col in range(plain.cols):
+            for dx, dy in ((1, 1), (TILE_SIZE // 2, TILE_SIZE // 2)):
+                point = (col * TILE_SIZE + dx, row * TILE_SIZE + dy)
+                assert expected.get_at(point) == actual.get_at(point), f"Atlas maze tile ({row}, {col}) mismatch."
+
+    print("All texture atlas tests passed.")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
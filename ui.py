@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import pygame
+from maze import Maze as BaseMaze
 
 try:
     from config import TILE_SIZE, MAZE_OFFSET, HUD_FONT, HUD_FONT_SIZE, HUD_COLOR, SCORE_POS, LIVES_POS, LEVEL_POS, MENU_POS
@@ -14,96 +15,21 @@ except Exception:
     LEVEL_POS = (10, 70)
     MENU_POS = (200, 200)
 
-class Maze:
-    def __init__(self):
-        self.initialize_maze()
+class Maze(BaseMaze):
+    """Maze variant drawn with the HUD palette: yellow pellets and borderless light gray tunnels."""
+    PELLET_COLOR = (255, 255, 0)   # Yellow pellets
+    TUNNEL_COLOR = (192, 192, 192) # Gray tunnels
+    TUNNEL_BORDER_COLOR = None
 
-    def initialize_maze(self):
-        # Hard-coded maze layout where:
-        # 'W' represents a wall,
-        # 'P' represents a pellet,
-        # ' ' represents an empty space,
-        # 'T' represents a tunnel (wrap-around cell).
-        self.layout = [
-            list("WWWWWWWWWW"),
-            list("T P    P T"),
-            list("W WWWW W W"),
-            list("W        W"),
-            list("WPWWWWWWPW"),
-            list("W        W"),
-            list("W WWWW W W"),
-            list("T P    P T"),
-            list("WWWWWWWWWW")
-        ]
-        self.rows = len(self.layout)
-        self.cols = len(self.layout[0])
-
-    def get_cell(self, row, col):
-        """Return the content of the cell at the given row and column."""
-        if 0 <= row < self.rows and 0 <= col < self.cols:
-            return self.layout[row][col]
-        return None
-
-    def is_wall(self, row, col):
-        """Return True if the cell is a wall."""
-        return self.get_cell(row, col) == 'W'
-
-    def is_pellet(self, row, col):
-        """Return True if the cell is a pellet."""
-        return self.get_cell(row, col) == 'P'
-
-    def is_tunnel(self, row, col):
-        """Return True if the cell is a tunnel."""
-        return self.get_cell(row, col) == 'T'
-
-    def consume_pellet(self, row, col):
-        """If the cell contains a pellet, remove it (set to empty) and return True.
-           Otherwise, return False."""
-        if self.is_pellet(row, col):
-            self.layout[row][col] = ' '
-            return True
-        return False
-
-    def pellet_count(self):
-        """Return the total number of pellets remaining in the maze."""
-        count = 0
-        for row in self.layout:
-            count += row.count('P')
-        return count
-
-    def grid_to_screen(self, row, col):
-        """Convert a grid coordinate (row, col) to screen coordinate (x, y).
-           Assumes TILE_SIZE is the size of a cell in pixels and MAZE_OFFSET is a tuple (offset_x, offset_y)."""
-        offset_x, offset_y = MAZE_OFFSET
-        screen_x = offset_x + col * TILE_SIZE
-        screen_y = offset_y + row * TILE_SIZE
-        return (screen_x, screen_y)
-    
-    def draw(self, screen):
-        """Draw the maze layout on the given screen (pygame surface)."""
-        wall_color = (0, 0, 255)       # Blue walls
-        pellet_color = (255, 255, 0)   # Yellow pellets
-        tunnel_color = (192, 192, 192) # Gray tunnels
-        for row_idx, row in enumerate(self.layout):
-            for col_idx, cell in enumerate(row):
-                x, y = self.grid_to_screen(row_idx, col_idx)
-                rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
-                if cell == 'W':
-                    pygame.draw.rect(screen, wall_color, rect)
-                elif cell == 'P':
-                    center = (x + TILE_SIZE // 2, y + TILE_SIZE // 2)
-                    radius = TILE_SIZE // 6
-                    pygame.draw.circle(screen, pellet_color, center, radius)
-                elif cell == 'T':
-                    pygame.draw.rect(screen, tunnel_color, rect)
-
-    def render(self):
-        """Renders the maze layout onto the screen.
-           For this implementation, it prints a textual representation to the console."""
-        for row in self.layout:
-            print("".join(row))
+# HUD lines drawn every frame. Their labels and the digits are the only characters the
+# HUD needs, so HUD_GLYPHS is the set texture_atlas pre-renders.
+HUD_FORMATS = ("Score: {}", "Lives: {}", "Level: {}")
+HUD_GLYPHS = "".join(sorted(set("".join(HUD_FORMATS).replace("{}", "") + "0123456789-")))
 
 class UIManager:
+    # TextureAtlas holding ("glyph", character) images; when None, text is rendered with the font.
+    atlas = None
+
     def __init__(self, score=0, lives=3, level=1, menu_text=""):
         self.score = score
         self.lives = lives
@@ -119,21 +45,24 @@ class UIManager:
     def draw(self, screen):
         """Draw all user interface components (HUD elements, score, lives counter, level indicator, and menus)
            on the given screen. These elements are layered on top of the gameplay graphics."""
-        score_text = f"Score: {self.score}"
-        lives_text = f"Lives: {self.lives}"
-        level_text = f"Level: {self.level}"
-
-        score_surface = self.font.render(score_text, True, HUD_COLOR)
-        lives_surface = self.font.render(lives_text, True, HUD_COLOR)
-        level_surface = self.font.render(level_text, True, HUD_COLOR)
-
-        screen.blit(score_surface, SCORE_POS)
-        screen.blit(lives_surface, LIVES_POS)
-        screen.blit(level_surface, LEVEL_POS)
-
+        lines = zip(HUD_FORMATS, (self.score, self.lives, self.level), (SCORE_POS, LIVES_POS, LEVEL_POS))
+        texts = [(text_format.format(value), position) for text_format, value, position in lines]
         if self.menu_text:
-            menu_surface = self.font.render(self.menu_text, True, HUD_COLOR)
-            screen.blit(menu_surface, MENU_POS)
+            texts.append((self.menu_text, MENU_POS))
+
+        atlas = self.atlas
+        items = []
+        for text, position in texts:
+            if atlas is not None and all(("glyph", character) in atlas for character in text):
+                # Lay the pre-rendered glyphs out side by side; every HUD line goes into one blits batch.
+                x, y = position
+                for character in text:
+                    items.append((("glyph", character), (x, y)))
+                    x += atlas.rects[("glyph", character)].width
+            else:
+                screen.blit(self.font.render(text, True, HUD_COLOR), position)
+        if items:
+            atlas.draw(screen, items)
 
 def initialize_maze():
     """Initialize and return a Maze instance."""